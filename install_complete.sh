@@ -37,7 +37,7 @@ apt-get update
 log "Installiere benötigte Pakete..."
 apt-get install -y hostapd dnsmasq iptables-persistent netfilter-persistent \
                    iw iproute2 curl bc python3-flask python3-yaml network-manager \
-                   python3-pip python3-venv python3-psutil
+                   python3-pip python3-venv python3-psutil python3-pydbus
 
 # ---- Eingaben ----
 log "Konfiguriere Pi-Repeater..."
@@ -362,7 +362,7 @@ mkdir -p /opt/pi-config
 
 # Install additional Python packages
 log "Installiere Python-Abhängigkeiten..."
-pip3 install psutil flask-socketio python-dotenv --break-system-packages 2>/dev/null || true
+pip3 install psutil flask-socketio python-dotenv orjson eventlet msgpack segno flask-compress pyroute2 --break-system-packages 2>/dev/null || true
 
 # Copy modern dashboard from same directory
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
-import subprocess, yaml, os, json, urllib.request, time, io, threading
+# Green threads for WebSocket clients (optional, must patch before other imports)
+try:
+    import eventlet
+    eventlet.monkey_patch()
+except ImportError:
+    eventlet = None
+    print("Warning: eventlet not installed, using threading mode for WebSockets")
+
+import subprocess, yaml, os, json, urllib.request, urllib.parse, time, io, threading, shutil, logging
+import hashlib, hmac, base64, types, sqlite3, gzip, shlex, socket
 from datetime import datetime, timedelta
 import psutil
 import re
 import functools
+import concurrent.futures
+import collections
 from pathlib import Path
-from flask import Flask, render_template_string, request, redirect, url_for, send_file, jsonify, session, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask import Flask, render_template, request, redirect, url_for, send_file, jsonify, session, send_from_directory, g
+from flask_socketio import SocketIO, emit, join_room
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FunctionLoader, FileSystemBytecodeCache, TemplateNotFound
+from markupsafe import Markup, escape
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 
 # Import theme manager
 try:
@@ -16,6 +31,55 @@ except ImportError:
     theme_manager = None
     print("Warning: theme_manager not found, theme features will be disabled")
 
+# NetworkManager D-Bus access (optional, falls back to nmcli)
+try:
+    import pydbus
+except ImportError:
+    pydbus = None
+    print("Warning: pydbus not installed, falling back to nmcli for WiFi status")
+
+# Fast JSON encoding for API responses and WebSocket payloads (optional, falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    print("Warning: orjson not installed, using standard json for API and WebSocket payloads")
+
+# MessagePack encoding for the binary dashboard tick (optional, JSON ticks otherwise)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    print("Warning: msgpack not installed, dashboard updates are sent as JSON")
+
+# Local QR code rendering (optional, falls back to api.qrserver.com in the browser)
+try:
+    import segno
+except ImportError:
+    segno = None
+    print("Warning: segno not installed, QR codes are rendered by api.qrserver.com")
+
+# Station info and link/address changes straight over netlink (optional, falls back to 'iw' and 'ip')
+try:
+    from pyroute2 import IW, IPRoute
+except ImportError:
+    IW = IPRoute = None
+    print("Warning: pyroute2 not installed, reading AP stations via iw and changing links via ip")
+
+# Brotli/gzip compression of HTTP responses (optional, falls back to a built-in gzip hook)
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+    print("Warning: flask-compress not installed, compressing responses with gzip only")
+
+# libyaml-backed YAML loader/dumper (optional, falls back to the pure-Python ones)
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+    print("Warning: libyaml not available, using the pure-Python YAML parser")
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -33,100 +97,433 @@ DASHBOARD_PASSWORD = os.getenv('DASHBOARD_PASSWORD', 'admin')
 PIHOLE_PASSWORD = os.getenv('PIHOLE_PASSWORD', 'admin')
 WEB_PORT = int(os.getenv('WEB_PORT', '8080'))
 
+def password_digest(password):
+    """SHA-256 digest of a password, compared instead of the plain text"""
+    return hashlib.sha256(password.encode()).digest()
+
+def password_matches(password, digest):
+    """Check a submitted password in constant time (digests, so the length doesn't leak either)"""
+    return isinstance(password, str) and hmac.compare_digest(password_digest(password), digest)
+
+DASHBOARD_PASSWORD_DIGEST = password_digest(DASHBOARD_PASSWORD)
+PIHOLE_PASSWORD_DIGEST = password_digest(PIHOLE_PASSWORD)
+
+# Logger for the background loops (LOG_LEVEL=DEBUG shows every update tick)
+logger = logging.getLogger('openpirouter')
+logger.setLevel(os.getenv('LOG_LEVEL', 'WARNING').upper())
+logger.addHandler(logging.StreamHandler())
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson, stdlib json for anything orjson rejects"""
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'openpirouter-secret-key-2024')
-socketio = SocketIO(app, cors_allowed_origins="*")
+app.config['TEMPLATES_AUTO_RELOAD'] = True  # Recompile theme templates when their file changes
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)  # Login cookie lifetime
+app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # Cap theme and config uploads at 10 MB
+
+# Pages, API JSON and assets are compressed; event streams are left alone so events arrive at once
+COMPRESS_MIMETYPES = ['text/html', 'application/json', 'text/css', 'application/javascript']
+COMPRESS_MIN_SIZE = 512
+
+if Compress:
+    app.config.update(COMPRESS_MIMETYPES=COMPRESS_MIMETYPES, COMPRESS_MIN_SIZE=COMPRESS_MIN_SIZE,
+                      COMPRESS_ALGORITHM=['br', 'gzip'], COMPRESS_STREAMS=False)
+    Compress(app)
+else:
+    @app.after_request
+    def gzip_response(response):
+        """Gzip compressible responses for clients that accept it"""
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESS_MIMETYPES or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE or 'gzip' not in request.headers.get('Accept-Encoding', ''):
+            return response
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+def orjson_dumps(obj, **kwargs):
+    """Encode a Socket.IO packet with orjson, falling back to json for unsupported types"""
+    try:
+        return orjson.dumps(obj).decode('utf-8')
+    except TypeError:
+        return json.dumps(obj, **kwargs)
+
+# Both the eventlet and simple-websocket servers negotiate permessage-deflate
+# on their own; also compress long-polling responses of client_list size
+SOCKET_COMPRESSION_THRESHOLD = 256
+
+socketio_options = {
+    'async_mode': 'eventlet' if eventlet else 'threading',
+    'http_compression': True,
+    'compression_threshold': SOCKET_COMPRESSION_THRESHOLD,
+}
+if orjson:
+    socketio_options['json'] = types.SimpleNamespace(dumps=orjson_dumps, loads=orjson.loads)
+socketio = SocketIO(app, cors_allowed_origins="*", **socketio_options)
 
 # Caching system
-cache = {}
 cache_timeout = 10  # seconds - increased for better performance
 
+def single_flight(func):
+    """Decorator letting concurrent callers share one in-flight call (results are shared, do not modify)"""
+    lock = threading.Lock()
+    in_flight = {}
+    
+    @functools.wraps(func)
+    def wrapper(*args):
+        with lock:
+            call = in_flight.get(args)
+            leader = call is None
+            if leader:
+                call = in_flight[args] = {'done': threading.Event()}
+        
+        if leader:
+            try:
+                call['result'] = func(*args)
+            except Exception as e:
+                call['error'] = e
+            finally:
+                with lock:
+                    del in_flight[args]
+                call['done'].set()
+        else:
+            call['done'].wait()
+        
+        if 'error' in call:
+            raise call['error']
+        return call['result']
+    
+    return wrapper
+
 def cached_function(func):
-    """Decorator for caching function results"""
+    """Decorator for caching function results per cache_timeout time bucket"""
+    cache = {}
+    lock = threading.Lock()
+    
+    # Concurrent misses on the same key share one call instead of racing
+    @single_flight
+    def load(args, kwargs_items):
+        return func(*args, **dict(kwargs_items))
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        cache_key = f"{func.__name__}_{hash(str(args) + str(kwargs))}"
-        now = time.time()
-        
-        # Check if cache is valid
-        if cache_key in cache:
-            cached_data, timestamp = cache[cache_key]
-            if now - timestamp < cache_timeout:
-                return cached_data
-        
-        # Execute function and cache result
-        result = func(*args, **kwargs)
-        cache[cache_key] = (result, now)
+        # Results expire when the monotonic clock enters the next bucket
+        bucket = int(time.monotonic() // cache_timeout)
+        key = (args, tuple(sorted(kwargs.items())))
+        # The lock only guards the dict, never the call itself
+        with lock:
+            entry = cache.get(key)
+        if entry is not None and entry[0] == bucket:
+            return entry[1]
+        result = load(*key)
+        with lock:
+            for stale in [k for k, (b, _) in cache.items() if b < bucket]:
+                del cache[stale]
+            cache.setdefault(key, (bucket, result))
         return result
     
+    def cache_clear():
+        with lock:
+            cache.clear()
+    
+    wrapper.cache_clear = cache_clear
     return wrapper
 
+# Connected WebSocket clients (sids) and the last payload sent per event
+connected_clients = set()
+last_payloads = {}
+
+# Clients using the batched 'dashboard_tick' event; all others get the individual events
+TICK_ROOM = 'dashboard_tick'
+BINARY_TICK_ROOM = 'dashboard_tick_bin'
+LEGACY_ROOM = 'legacy_events'
+tick_clients = set()
+binary_clients = set()  # Subset of tick_clients receiving MessagePack-encoded ticks
+
 # WebSocket event handlers
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
     print(f"Client connected: {request.sid}")
+    connected_clients.add(request.sid)
     emit('status', {'message': 'Connected to OpenPiRouter Dashboard'})
+    
+    # Unchanged payloads are not re-broadcast, so replay the latest state
+    if request.args.get('tick') == '1' and request.args.get('binary') == '1' and msgpack:
+        tick_clients.add(request.sid)
+        binary_clients.add(request.sid)
+        join_room(BINARY_TICK_ROOM)
+        if last_payloads:
+            emit('dashboard_tick_bin', msgpack.packb(dict(last_payloads)))
+    elif request.args.get('tick') == '1':
+        tick_clients.add(request.sid)
+        join_room(TICK_ROOM)
+        if last_payloads:
+            emit('dashboard_tick', dict(last_payloads))
+    else:
+        join_room(LEGACY_ROOM)
+        for event, payload in list(last_payloads.items()):
+            emit(event, payload)
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print(f"Client disconnected: {request.sid}")
+    connected_clients.discard(request.sid)
+    tick_clients.discard(request.sid)
+    binary_clients.discard(request.sid)
+
+def emit_changes(payloads):
+    """Broadcast the payloads that changed since the last update as one batched tick"""
+    changed = {event: payload for event, payload in payloads.items() if last_payloads.get(event) != payload}
+    if not changed:
+        return
+    last_payloads.update(changed)
+    
+    if binary_clients:
+        socketio.emit('dashboard_tick_bin', msgpack.packb(changed), to=BINARY_TICK_ROOM)
+    if len(tick_clients) > len(binary_clients):
+        socketio.emit('dashboard_tick', changed, to=TICK_ROOM)
+    # Themes with their own JavaScript still listen for the individual events
+    if len(connected_clients) > len(tick_clients):
+        for event, payload in changed.items():
+            socketio.emit(event, payload, to=LEGACY_ROOM)
+
+# Interval between WebSocket updates (seconds)
+UPDATE_INTERVAL = 5
+
+# Workers gathering one update concurrently (green threads when eventlet is patched in)
+update_pool = concurrent.futures.ThreadPoolExecutor(max_workers=5, thread_name_prefix='update')
+
+# Payload sent when a source fails; sources without one are skipped for that update
+UPDATE_FALLBACKS = {
+    'wifi_status': {'connected': False},
+    'client_list': {'clients': [], 'count': 0},
+}
+
+# Speed counters are sampled every update and sent as one batch every SPEED_BATCH_SIZE updates
+SPEED_BATCH_SIZE = 5
+speed_samples = collections.deque(maxlen=SPEED_BATCH_SIZE)
+
+def sample_speed_data():
+    """Record the current WAN/AP byte counters as [timestamp, wan_rx, ap_tx]"""
+    speed_data = get_internet_speed_data()
+    if speed_data.get('success'):
+        speed_samples.append([speed_data['timestamp'], speed_data['wan_rx'], speed_data['ap_tx']])
+    return speed_data
+
+def get_client_list():
+    """Get connected AP clients as sent to the dashboard"""
+    clients = get_ap_info().get('clients', [])
+    return {'clients': clients, 'count': len(clients)}
+
+def gather_payloads(sources, timeout):
+    """Run the data sources concurrently so their subprocess waits overlap"""
+    futures = {event: update_pool.submit(source) for event, source in sources.items()}
+    concurrent.futures.wait(futures.values(), timeout=timeout)
+    
+    payloads = {}
+    for event, future in futures.items():
+        try:
+            # Sources still running after the timeout keep their last sent payload
+            if future.done():
+                payloads[event] = future.result()
+        except Exception:
+            if event in UPDATE_FALLBACKS:
+                payloads[event] = UPDATE_FALLBACKS[event]
+    return payloads
 
 def background_update_task():
     """Background task to send real-time updates"""
-    print("🔄 Background update thread started")
+    logger.info("🔄 Background update thread started")
     update_count = 0
+    next_deadline = time.monotonic()
     
     while True:
-        try:
-            update_count += 1
-            print(f"📡 Sending update #{update_count}")
-            
-            # Get cached data (faster) instead of bypassing cache
-            status_data = get_system_status()
-            stats_data = get_system_stats()
-            
-            # Get WiFi info with timeout protection
+        next_deadline += UPDATE_INTERVAL
+        
+        # Skip gathering entirely while no dashboard is connected
+        if connected_clients:
             try:
-                wifi_data = get_current_wifi_data()
-            except:
-                wifi_data = {'connected': False}
-            
-            # Skip speed data on every update (expensive)
-            if update_count % 5 == 0:  # Only every 5th update
+                update_count += 1
+                logger.debug("📡 Sending update #%d", update_count)
+                
+                # Get cached data (faster) instead of bypassing cache
+                sources = {
+                    'system_status': get_system_status,
+                    'system_stats': get_system_stats,
+                    'wifi_status': get_current_wifi_data,
+                    'client_list': get_client_list,
+                }
+                
+                payloads = gather_payloads(sources, UPDATE_INTERVAL)
+                
+                # Sample speed every update (one /proc read) but only send the batch every 5th update
                 try:
-                    speed_data = get_internet_speed_data()
-                    socketio.emit('speed_data', speed_data)
-                except:
+                    speed_data = sample_speed_data()
+                    if update_count % SPEED_BATCH_SIZE == 0 and speed_samples:
+                        payloads['speed_data'] = dict(speed_data, samples=list(speed_samples))
+                        speed_samples.clear()
+                except Exception:
                     pass
-            
-            # Get connected clients with timeout
-            try:
-                ap_info = get_ap_info()
-                socketio.emit('client_list', {'clients': ap_info.get('clients', []),'count': len(ap_info.get('clients', []))})
-            except:
-                socketio.emit('client_list', {'clients': [], 'count': 0})
-            
-            # Send core updates
-            socketio.emit('system_status', status_data)
-            socketio.emit('system_stats', stats_data)
-            socketio.emit('wifi_status', wifi_data)
-            
-            if update_count % 10 == 0:  # Log every 10th update
-                print(f"✅ Update #{update_count} sent successfully")
-            
-        except Exception as e:
-            print(f"❌ Error in background update #{update_count}: {e}")
+                
+                # Send all changed updates in a single message
+                emit_changes(payloads)
+                
+                if update_count % 10 == 0:  # Log every 10th update
+                    logger.debug("✅ Update #%d sent successfully", update_count)
+                
+            except Exception as e:
+                logger.error("❌ Error in background update #%d: %s", update_count, e)
         
-        time.sleep(5)  # Update every 5 seconds instead of 3
+        # Sleep until the next deadline so slow updates don't accumulate drift
+        socketio.sleep(max(0, next_deadline - time.monotonic()))
+        if time.monotonic() - next_deadline > UPDATE_INTERVAL:
+            next_deadline = time.monotonic()  # Fell behind, don't burst to catch up
+
+# Lease and hostapd changes are pushed when seen instead of with the next update
+# (a stat() per file and second; the mtime-keyed parse caches refresh on their own)
+AP_FILES_POLL_INTERVAL = 1
+
+def ap_files_watch_task():
+    """Background task pushing the client list as soon as the DHCP leases or hostapd config change"""
+    versions = None
+    while True:
+        socketio.sleep(AP_FILES_POLL_INTERVAL)
+        if not connected_clients:
+            continue
+        current = []
+        for path in (LEASES, HOSTAPD):
+            try:
+                current.append(file_version(path))
+            except OSError:
+                current.append(None)
+        if versions is not None and current != versions:
+            try:
+                emit_changes({'client_list': get_client_list()})
+            except Exception as e:
+                logger.warning("Client list push failed: %s", e)
+        versions = current
+
+# NetworkManager device state for a fully activated connection
+NM_DEVICE_STATE_ACTIVATED = 100
+
+# Cached D-Bus handles (bus, wlan0 device proxy), opened on first use
+_nm_wlan0 = None
+
+def get_nm_wlan0():
+    """Get the cached NetworkManager D-Bus proxy for wlan0"""
+    global _nm_wlan0
+    if _nm_wlan0 is None:
+        bus = pydbus.SystemBus()
+        nm = bus.get('.NetworkManager')
+        _nm_wlan0 = (bus, bus.get('.NetworkManager', nm.GetDeviceByIpIface('wlan0')))
+    return _nm_wlan0
+
+# Signal quality tiers as (minimum signal %, tier), same thresholds as the dashboard's getSignalQuality
+SIGNAL_TIERS = ((95, 'excellent'), (80, 'good'), (60, 'fair'), (30, 'poor'))
+
+def get_signal_tier(signal):
+    """Get the quality tier for a signal strength in percent"""
+    try:
+        signal = int(signal)
+    except (TypeError, ValueError):
+        return 'weak'
+    for minimum, tier in SIGNAL_TIERS:
+        if signal >= minimum:
+            return tier
+    return 'weak'
+
+def get_current_wifi_data_dbus():
+    """Get current WiFi connection data directly from NetworkManager via D-Bus"""
+    bus, device = get_nm_wlan0()
+    
+    if device.State != NM_DEVICE_STATE_ACTIVATED or device.ActiveConnection == '/':
+        return {'connected': False}
+    
+    connection_name = bus.get('.NetworkManager', device.ActiveConnection).Id
+    
+    signal = 0
+    if device.ActiveAccessPoint != '/':
+        signal = int(bus.get('.NetworkManager', device.ActiveAccessPoint).Strength)
+    
+    return {
+        'connected': True,
+        'ssid': connection_name,
+        'signal': signal,
+        'signal_tier': get_signal_tier(signal)
+    }
+
+# Last wlan0 signal reading for the nmcli fallback, refreshed by wifi_signal_task
+WIFI_SIGNAL_INTERVAL = 30  # seconds
+wifi_signal = {'connection': '', 'signal': 0}
+wifi_signal_lock = threading.Lock()
+wifi_signal_refresh = threading.Event()
+
+def scan_wifi_signal():
+    """Get the signal strength (percent) of the active wlan0 network from nmcli (slow)"""
+    result = run_cmd(["nmcli", "-t", "-f", "active,signal", "dev", "wifi", "list", "ifname", "wlan0"],
+                     timeout=10, text=True)
+    for line in result.stdout.splitlines():
+        active, _, signal = line.partition(":")
+        if active == "yes":
+            try:
+                return int(signal)
+            except ValueError:
+                return 0
+    return 0
+
+def wifi_signal_task():
+    """Background task refreshing the wlan0 signal strength off the update path"""
+    while True:
+        # D-Bus reports the signal directly, only scan while dashboards use the nmcli fallback
+        if connected_clients and _nm_wlan0 is None:
+            try:
+                signal = scan_wifi_signal()
+                with wifi_signal_lock:
+                    wifi_signal['signal'] = signal
+            except Exception as e:
+                logger.warning("WiFi signal scan failed: %s", e)
+        wifi_signal_refresh.wait(WIFI_SIGNAL_INTERVAL)
+        wifi_signal_refresh.clear()
+
+# Active connection on wlan0 in 'nmcli -t -f name,device,state' output (names may contain escaped colons)
+WLAN0_CONNECTION_RE = re.compile(rb'^((?:[^:\\\n]|\\.)*):wlan0:([^:\n]*)', re.M)
+NMCLI_ESCAPE_RE = re.compile(rb'\\(.)')
+NMCLI_TEXT_ESCAPE_RE = re.compile(r'\\(.)')
+# Exact connection state tokens for an up connection (substring tests matched e.g. 'deactivated')
+WLAN0_CONNECTED_STATES = {b'activated'}
+# Exact device state tokens for a connected device in 'nmcli -t -f device,state dev status'
+WLAN0_DEVICE_CONNECTED_STATES = {b'connected'}
 
 def get_current_wifi_data():
     """Get current WiFi connection data with smart timeout handling"""
+    global _nm_wlan0
+    if pydbus:
+        try:
+            return get_current_wifi_data_dbus()
+        except Exception:
+            # Drop the (possibly stale) proxy and fall back to nmcli
+            _nm_wlan0 = None
+    
     try:
         # First check if we have an active connection (fast check)
-        result = subprocess.run(["nmcli", "-t", "-f", "name,device,state", "con", "show", "--active"], 
-                              capture_output=True, text=True, timeout=5)
+        result = run_cmd(["nmcli", "-t", "-f", "name,device,state", "con", "show", "--active"])
         
         if result.returncode != 0:
             return {'connected': False}
@@ -134,91 +531,122 @@ def get_current_wifi_data():
         wifi_connected = False
         connection_name = ""
         
-        for line in result.stdout.splitlines():
-            if "wlan0" in line:
-                parts = line.split(":")
-                if len(parts) >= 3:
-                    name = parts[0]
-                    device = parts[1]
-                    state = parts[2]
-                    if device == "wlan0" and ("activated" in state or "connected" in state):
-                        wifi_connected = True
-                        connection_name = name
-                        break
+        for match in WLAN0_CONNECTION_RE.finditer(result.stdout):
+            if match.group(2) in WLAN0_CONNECTED_STATES:
+                wifi_connected = True
+                connection_name = NMCLI_ESCAPE_RE.sub(rb'\1', match.group(1)).decode('utf-8', 'replace')
+                break
         
         if not wifi_connected:
             return {'connected': False}
         
-        # If connected, try to get signal strength with smart timeout
-        # Use a shorter timeout and fallback to previous signal if it fails
-        try:
-            signal_result = subprocess.run(["nmcli", "-t", "-f", "ssid,signal", "dev", "wifi", "list", "ifname", "wlan0"], 
-                                         capture_output=True, text=True, timeout=3)
-            signal = "0"
-            if signal_result.returncode == 0:
-                for signal_line in signal_result.stdout.splitlines():
-                    if connection_name in signal_line:
-                        parts = signal_line.split(":")
-                        if len(parts) >= 2:
-                            signal = parts[1].strip()
-                            break
-        except subprocess.TimeoutExpired:
-            # If signal scan times out, but we know we're connected, use last known signal
-            signal = "0"  # Fallback to 0 if we can't get signal
+        # Signal strength comes from wifi_signal_task, the slow WiFi scan never runs here
+        with wifi_signal_lock:
+            if wifi_signal['connection'] != connection_name:
+                # Connected network changed, the cached signal belongs to the old one
+                wifi_signal.update(connection=connection_name, signal=0)
+                wifi_signal_refresh.set()
+            signal = wifi_signal['signal']
         
         return {
             'connected': True,
             'ssid': connection_name,
-            'signal': signal
+            'signal': signal,
+            'signal_tier': get_signal_tier(signal)
         }
         
     except Exception as e:
         return {'connected': False, 'error': str(e)}
 
+# /proc/net/dev interfaces: WAN (Internet-Eingang) and AP (zu Clients)
+WAN_INTERFACES = (b'wlan0', b'eth0')
+AP_INTERFACES = (b'wlan1', b'br0')
+
+# One pass over /proc/net/dev: interface, rx_bytes and tx_bytes (9th counter)
+PROC_NET_DEV_RE = re.compile(rb'^\s*(' + b'|'.join(WAN_INTERFACES + AP_INTERFACES) +
+                             rb'):\s*(\d+)(?:\s+\d+){7}\s+(\d+)', re.M)
+
+def now_ms():
+    """Current wall-clock time in integer milliseconds"""
+    return time.time_ns() // 1_000_000
+
+# Persistent /proc handles (path -> file), re-read from offset 0 on every call
+_proc_files = {}
+_proc_files_lock = threading.Lock()
+
+def read_proc_file(path):
+    """Read a /proc file through a persistent file handle"""
+    with _proc_files_lock:
+        proc_file = _proc_files.get(path)
+        if proc_file is None:
+            proc_file = _proc_files[path] = open(path, 'rb', buffering=0)
+        proc_file.seek(0)
+        return proc_file.readall()
+
+def read_proc_net_dev():
+    """Read /proc/net/dev through a persistent file handle"""
+    return read_proc_file('/proc/net/dev')
+
+MEMINFO_RE = re.compile(rb'^(MemTotal|MemAvailable):\s+(\d+)', re.M)
+
+def get_memory_percent():
+    """Memory usage in percent from /proc/meminfo (same formula as psutil)"""
+    meminfo = dict(MEMINFO_RE.findall(read_proc_file('/proc/meminfo')))
+    total = int(meminfo[b'MemTotal'])
+    return (total - int(meminfo[b'MemAvailable'])) * 100 / total
+
+# (idle, total) jiffies from the previous /proc/stat sample
+_last_cpu_times = None
+
+def get_cpu_percent():
+    """CPU usage in percent since the previous call, from /proc/stat"""
+    global _last_cpu_times
+    # user nice system idle iowait irq softirq steal (guest time is already in user)
+    times = [int(v) for v in read_proc_file('/proc/stat').split(b'\n', 1)[0].split()[1:9]]
+    idle, total = times[3] + times[4], sum(times)
+    last, _last_cpu_times = _last_cpu_times, (idle, total)
+    if last is None or total <= last[1]:
+        return 0.0
+    return 100 - (idle - last[0]) * 100 / (total - last[1])
+
+# Latest CPU usage, sampled on a fixed interval so concurrent readers don't
+# shorten each other's /proc/stat delta
+CPU_SAMPLE_INTERVAL = 1
+cpu_percent = 0.0
+
+def cpu_sampler_task():
+    """Background task refreshing cpu_percent once per interval"""
+    global cpu_percent
+    while True:
+        try:
+            cpu_percent = get_cpu_percent()
+        except OSError:
+            pass
+        socketio.sleep(CPU_SAMPLE_INTERVAL)
+
 def get_internet_speed_data():
     """Get internet speed data - WAN input and AP output"""
     try:
-        result = subprocess.run(["cat", "/proc/net/dev"], capture_output=True, text=True, timeout=5)
-        
-        if result.returncode != 0:
-            return {'success': False, 'error': result.stderr}
-        
-        lines = result.stdout.splitlines()
-        
         # WAN interfaces (Internet-Eingang)
         wan_rx = 0  # Download from Internet
-        wan_tx = 0  # Upload to Internet
         
         # AP interfaces (zu Clients)
-        ap_rx = 0   # von Clients empfangen
         ap_tx = 0   # zu Clients gesendet
         
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 10:
-                try:
-                    interface = parts[0].rstrip(':')
-                    rx_bytes = int(parts[1])
-                    tx_bytes = int(parts[9])
-                    
-                    # WAN interfaces: wlan0 (WiFi WAN) and eth0 (Ethernet WAN)
-                    if interface in ['wlan0', 'eth0']:
-                        wan_rx += rx_bytes
-                        wan_tx += tx_bytes
-                    
-                    # AP interfaces: wlan1 (AP) and br0 (bridge with eth0)
-                    elif interface in ['wlan1', 'br0']:
-                        ap_rx += rx_bytes
-                        ap_tx += tx_bytes
-                        
-                except (ValueError, IndexError):
-                    continue
+        for interface, rx_bytes, tx_bytes in PROC_NET_DEV_RE.findall(read_proc_net_dev()):
+            # WAN interfaces: wlan0 (WiFi WAN) and eth0 (Ethernet WAN)
+            if interface in WAN_INTERFACES:
+                wan_rx += int(rx_bytes)
+            
+            # AP interfaces: wlan1 (AP) and br0 (bridge with eth0)
+            else:
+                ap_tx += int(tx_bytes)
         
         return {
             'success': True,
             'wan_rx': wan_rx,      # Internet download (↓)
             'ap_tx': ap_tx,        # zu Clients (↑)
-            'timestamp': int(time.time() * 1000)
+            'timestamp': now_ms()
         }
         
     except Exception as e:
@@ -227,17 +655,33 @@ def get_internet_speed_data():
 CONF_FILE = "/etc/pi-repeater.yaml"
 HOSTAPD = "/etc/hostapd/hostapd.conf"
 LEASES = "/var/lib/misc/dnsmasq.leases"
+DNSMASQ_CONF = "/etc/dnsmasq.d/pi-repeater.conf"
 
-# Modern Dashboard Template
-# Theme Base HTML - Only structure and CSS, NO JavaScript
-# This is what gets stored in theme templates
-THEME_BASE_HTML = """<html lang="de">
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>OpenPiRouter Dashboard</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
+# DHCP/DNS settings for the AP network, served on wlan1 alone or on the br0 bridge
+DNSMASQ_TEMPLATE = """interface={interface}
+bind-interfaces
+dhcp-range=192.168.50.10,192.168.50.200,12h
+dhcp-option=3,192.168.50.1
+dhcp-option=6,8.8.8.8,8.8.4.4
+port=0
+domain=lan
+expand-hosts
+"""
+
+def write_if_changed(path, content):
+    """Write a text file unless it already holds exactly this content; returns whether it was written"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+# Dashboard CSS - shared by the default theme and served as a cacheable asset
+DASHBOARD_CSS = """        * { margin: 0; padding: 0; box-sizing: border-box; }
         body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -963,9 +1407,50 @@ THEME_BASE_HTML = """<html lang="de">
             border-radius: 5px;
             width: 150px;
         }
-    </style>
+        /* Scan results are virtualized: rows must keep one fixed height */
+        .network-list {
+            max-height: 400px;
+            overflow-y: auto;
+        }
+        .network-list .network-item {
+            margin: 0 0 10px;
+        }
+        .network-list .network-info {
+            min-width: 0;
+        }
+        .network-list .network-details {
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+"""
+
+# Modern Dashboard Template
+# Theme Base HTML - Only structure and CSS, NO JavaScript
+# This is what gets stored in theme templates
+THEME_BASE_HTML = """<html lang="de">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>OpenPiRouter Dashboard</title>
+    <style>
+""" + DASHBOARD_CSS + """    </style>
 </head>
 <body>
+    {%- macro status(id, online, label, online_text='Online', offline_text='Offline') %}
+                <div class="status-item {{ 'status-online' if online else 'status-offline' }}" id="{{ id }}">
+                    {{ label }}: {{ online_text if online else offline_text }}
+                </div>
+    {%- endmacro %}
+    {%- macro stat(value, label, subtitle=None, id=None) %}
+                    <div class="stat-item">
+                        <div class="stat-value"{% if id %} id="{{ id }}"{% endif %}>{{ value }}</div>
+                        <div class="stat-label">{{ label }}</div>
+                        {%- if subtitle %}
+                        <div class="stat-subtitle">{{ subtitle }}</div>
+                        {%- endif %}
+                    </div>
+    {%- endmacro %}
     <div class="container">
         <div class="header">
             <div style="display: flex; justify-content: space-between; align-items: center; width: 100%;">
@@ -978,24 +1463,16 @@ THEME_BASE_HTML = """<html lang="de">
                 </div>
             </div>
             <div class="status-bar">
-                <div class="status-item {{ 'status-online' if system_status.wifi else 'status-offline' }}" id="wifi-status">
-                    📶 WLAN (wlan0): {{ 'Online' if system_status.wifi else 'Offline' }}
-                </div>
-                <div class="status-item {{ 'status-online' if system_status.internet else 'status-offline' }}" id="internet-status">
-                    🌐 Internet: {{ 'Verbunden' if system_status.internet else 'Getrennt' }}
-                </div>
+                {{- status('wifi-status', system_status.wifi, '📶 WLAN (wlan0)') }}
+                {{- status('internet-status', system_status.internet, '🌐 Internet', 'Verbunden', 'Getrennt') }}
                 <div class="status-item status-online" id="public-ip-status" style="cursor: pointer;" onclick="copyPublicIP()" title="Klicken zum Kopieren">
                     🌍 <span id="public-ip">Lade...</span>
                 </div>
                 <div class="status-item status-online" id="speed-status" style="min-width: 195px;">
                     📊 <span id="download-speed">0.0</span> ↓ <span id="upload-speed">0.0</span> ↑ Mbit/s
                 </div>
-                <div class="status-item {{ 'status-online' if system_status.ap else 'status-offline' }}" id="ap-status">
-                    📡 AP (wlan1): {{ 'Online' if system_status.ap else 'Offline' }}
-                </div>
-                <div class="status-item {{ 'status-online' if system_status.pihole else 'status-offline' }}" id="pihole-status">
-                    🛡️ Pi-hole: {{ 'Online' if system_status.pihole else 'Offline' }}
-                </div>
+                {{- status('ap-status', system_status.ap, '📡 AP (wlan1)') }}
+                {{- status('pihole-status', system_status.pihole, '🛡️ Pi-hole') }}
                 <div class="status-item status-warning" id="websocket-status">
                     🔗 WS: Verbinde...
                 </div>
@@ -1013,27 +1490,11 @@ THEME_BASE_HTML = """<html lang="de">
             <div class="card">
                 <h2><span class="icon">📊</span>System Status</h2>
                 <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-value">{{ system_stats.cpu }}%</div>
-                        <div class="stat-label">CPU</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{{ system_stats.memory }}%</div>
-                        <div class="stat-label">RAM</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{{ "%.0f"|format((system_stats.disk_used / system_stats.disk_total) * 100) }}%</div>
-                        <div class="stat-label">Speicher</div>
-                        <div class="stat-subtitle">Belegt</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{{ system_stats.temperature }}°C</div>
-                        <div class="stat-label">Temp</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{{ system_stats.clients }}</div>
-                        <div class="stat-label">Clients</div>
-                    </div>
+                    {{- stat(system_stats.cpu ~ '%', 'CPU') }}
+                    {{- stat(system_stats.memory ~ '%', 'RAM') }}
+                    {{- stat(system_stats.disk_percent ~ '%', 'Speicher', 'Belegt') }}
+                    {{- stat(system_stats.temperature ~ '°C', 'Temp') }}
+                    {{- stat(system_stats.clients, 'Clients') }}
                 </div>
             </div>
 
@@ -1096,9 +1557,7 @@ THEME_BASE_HTML = """<html lang="de">
                 <div class="form-group">
                     <label>Kanal:</label>
                     <select id="ap_channel">
-                        {% for ch in available_channels %}
-                        <option value="{{ ch }}" {{ 'selected' if ch|string == ap.channel|string else '' }}>{{ ch }}</option>
-                        {% endfor %}
+                        {{ channel_options_html }}
                     </select>
                 </div>
                 
@@ -1142,18 +1601,9 @@ THEME_BASE_HTML = """<html lang="de">
             <div class="card">
                 <h2><span class="icon">🛡️</span>Pi-hole DNS Filter</h2>
                 <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-value" id="pihole-queries">{{ system_stats.pihole_queries }}</div>
-                        <div class="stat-label">DNS Anfragen</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value" id="pihole-blocked">{{ system_stats.pihole_blocked }}</div>
-                        <div class="stat-label">Geblockt</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value" id="pihole-percent">{{ system_stats.pihole_blocked_percent }}%</div>
-                        <div class="stat-label">Block Rate</div>
-                    </div>
+                    {{- stat(system_stats.pihole_queries, 'DNS Anfragen', id='pihole-queries') }}
+                    {{- stat(system_stats.pihole_blocked, 'Geblockt', id='pihole-blocked') }}
+                    {{- stat(system_stats.pihole_blocked_percent ~ '%', 'Block Rate', id='pihole-percent') }}
                 </div>
                 <div style="margin: 15px 0;">
                     <label class="toggle-switch">
@@ -1303,8 +1753,9 @@ THEME_BASE_HTML = """<html lang="de">
 
     <!-- Socket.IO Client Library -->
     <script src="https://cdn.socket.io/4.7.2/socket.io.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/sweetalert2@11"></script>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
+    <!-- Icons are not needed for first paint; SweetAlert2 is loaded on the first dialog -->
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" media="print" onload="this.media='all'">
+    <noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css"></noscript>
     
     <!-- SYSTEM_JAVASCRIPT_PLACEHOLDER -->
 </body>
@@ -1312,226 +1763,418 @@ THEME_BASE_HTML = """<html lang="de">
 
 
 # System JavaScript - Central logic, always loaded
-# This is injected into every theme automatically
-SYSTEM_JAVASCRIPT = """
-    <script>
+# Served as a cached asset; themes get the loader tags below injected automatically
+DASHBOARD_JS = """
         // Speed monitoring variables
         let lastSpeedData = null;
         let speedCheckCount = 0;
         
+        // Debug logging is off unless enabled via ?debug or localStorage.openpirouter_debug = '1'
+        window.__DBG = window.__DBG || new URLSearchParams(location.search).has('debug') ||
+            localStorage.getItem('openpirouter_debug') === '1';
+        
+        // SweetAlert2 is fetched on the first dialog; until then Swal is a stand-in that loads it
+        const SWAL_URL = 'https://cdn.jsdelivr.net/npm/sweetalert2@11';
+        let swalLoading = null;
+        
+        function loadSwal() {
+            if (!swalLoading) {
+                swalLoading = new Promise((resolve, reject) => {
+                    const script = document.createElement('script');
+                    script.src = SWAL_URL;
+                    script.onload = () => resolve(window.Sweetalert2 || window.Swal);
+                    script.onerror = () => {
+                        swalLoading = null;
+                        script.remove();
+                        reject(new Error('SweetAlert2 konnte nicht geladen werden'));
+                    };
+                    document.head.appendChild(script);
+                });
+            }
+            return swalLoading;
+        }
+        
+        // Themes that still include the script tag keep the real Swal
+        if (!window.Swal) {
+            window.Swal = {
+                fire: (...args) => loadSwal().then(swal => swal.fire(...args)),
+                showLoading: () => {},
+                close: () => {}
+            };
+        }
+        
         // WebSocket connection
-        const socket = io();
+        // The server answers with MessagePack ticks if it can, JSON ticks otherwise
+        const socket = io({ query: { tick: '1', binary: '1' } });
         
         // WebSocket event handlers
         socket.on('connect', function() {
-            console.log('✅ Connected to OpenPiRouter Dashboard via WebSocket');
+            if (window.__DBG) console.log('✅ Connected to OpenPiRouter Dashboard via WebSocket');
             
             // Update WebSocket status in header
-            const wsStatus = document.getElementById('websocket-status');
-            if (wsStatus) {
-                wsStatus.textContent = '🔗 WS: Verbunden';
-                wsStatus.className = 'status-item status-online';
-            }
+            const wsStatus = getDom().wsStatus;
+            setText(wsStatus, '🔗 WS: Verbunden');
+            setClass(wsStatus, 'status-item status-online');
         });
         
         socket.on('disconnect', function() {
-            console.log('❌ Disconnected from dashboard');
+            if (window.__DBG) console.log('❌ Disconnected from dashboard');
             
             // Update WebSocket status in header
-            const wsStatus = document.getElementById('websocket-status');
-            if (wsStatus) {
-                wsStatus.textContent = '🔗 WS: Getrennt';
-                wsStatus.className = 'status-item status-offline';
-            }
+            const wsStatus = getDom().wsStatus;
+            setText(wsStatus, '🔗 WS: Getrennt');
+            setClass(wsStatus, 'status-item status-offline');
         });
         
-        socket.on('system_status', function(data) {
-            console.log('📊 Received system status:', data);
-            updateSystemStatus(data);
-        });
+        // Batched update: only the parts that changed since the last tick are included.
+        // Ticks are merged and written to the DOM once per animation frame.
+        let pendingTick = null;
         
-        socket.on('system_stats', function(data) {
-            console.log('📈 Received system stats:', data);
-            updateSystemStats(data);
-        });
+        function speedSamples(data) {
+            return Array.isArray(data.samples) ? data.samples : [[data.timestamp, data.wan_rx, data.ap_tx]];
+        }
         
-        socket.on('wifi_status', function(data) {
-            console.log('📶 Received WiFi status:', data);
-            updateWiFiStatus(data);
-        });
+        function applyDashboardTick(data) {
+            if (window.__DBG) console.log('📡 Received dashboard tick:', data);
+            if (!pendingTick) {
+                pendingTick = {};
+                requestAnimationFrame(flushDashboardTick);
+            }
+            for (const key in data) {
+                const previous = pendingTick[key];
+                if (key === 'speed_data' && previous && previous.success && data.speed_data.success) {
+                    // Keep every counter sample so the rate calculation stays correct
+                    pendingTick.speed_data = Object.assign({}, data.speed_data, {
+                        samples: speedSamples(previous).concat(speedSamples(data.speed_data))
+                    });
+                } else {
+                    pendingTick[key] = data[key];
+                }
+            }
+        }
         
-        socket.on('speed_data', function(data) {
-            console.log('⚡ Received speed data:', data);
-            updateSpeedData(data);
-        });
+        function flushDashboardTick() {
+            const data = pendingTick;
+            pendingTick = null;
+            if (data.system_status) updateSystemStatus(data.system_status);
+            if (data.system_stats) updateSystemStats(data.system_stats);
+            if (data.wifi_status) updateWiFiStatus(data.wifi_status);
+            if (data.speed_data) updateSpeedData(data.speed_data);
+            if (data.client_list) updateClientList(data.client_list);
+        }
         
-        socket.on('client_list', function(data) {
-            console.log('👥 Received client list:', data);
-            updateClientList(data);
+        socket.on('dashboard_tick', applyDashboardTick);
+        socket.on('dashboard_tick_bin', function(buffer) {
+            applyDashboardTick(decodeMsgpack(new Uint8Array(buffer)));
         });
         
-        // Update functions
-        function updateClientList(data) {
-            if (!data || !data.clients) return;
+        // Minimal MessagePack decoder for the binary tick (nil, bool, numbers, strings, arrays, maps)
+        const utf8Decoder = new TextDecoder();
+        function decodeMsgpack(bytes) {
+            const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+            let pos = 0;
             
-            // Update client count in stats
-            const statsGrid = document.querySelector('.stats-grid');
-            if (statsGrid) {
-                const statItems = statsGrid.querySelectorAll('.stat-item');
-                if (statItems[4]) {
-                    statItems[4].querySelector('.stat-value').textContent = data.count;
+            function str(length) {
+                const value = utf8Decoder.decode(bytes.subarray(pos, pos + length));
+                pos += length;
+                return value;
+            }
+            function arr(length) {
+                const value = new Array(length);
+                for (let i = 0; i < length; i++) value[i] = read();
+                return value;
+            }
+            function map(length) {
+                const value = {};
+                for (let i = 0; i < length; i++) {
+                    const key = read();
+                    value[key] = read();
                 }
+                return value;
             }
-            
-            // Update client table
-            const tbody = document.querySelector('.table tbody');
-            if (tbody) {
-                tbody.innerHTML = '';
-                data.clients.forEach(client => {
-                    const row = document.createElement('tr');
-                    row.innerHTML = `
-                        <td>${client.ip}</td>
-                        <td>${client.mac}</td>
-                        <td>${client.hostname || '-'}</td>
-                        <td>${client.signal || '-'}${client.interface == 'br0' ? ' (LAN)' : ''}</td>
-                        <td><span class="client-speed" data-mac="${client.mac}" data-type="download">0.0</span> Mbit/s</td>
-                        <td><span class="client-speed" data-mac="${client.mac}" data-type="upload">0.0</span> Mbit/s</td>
-                    `;
-                    tbody.appendChild(row);
-                });
-                
-                // Show/hide "No clients" message
-                const noClients = document.querySelector('.table-container + p');
-                if (noClients) {
-                    noClients.style.display = data.count > 0 ? 'none' : 'block';
+            function read() {
+                const type = bytes[pos++];
+                let value;
+                if (type <= 0x7f) return type;
+                if (type >= 0xe0) return type - 0x100;
+                if ((type & 0xf0) === 0x80) return map(type & 0x0f);
+                if ((type & 0xf0) === 0x90) return arr(type & 0x0f);
+                if ((type & 0xe0) === 0xa0) return str(type & 0x1f);
+                switch (type) {
+                    case 0xc0: return null;
+                    case 0xc2: return false;
+                    case 0xc3: return true;
+                    case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+                    case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+                    case 0xcc: return bytes[pos++];
+                    case 0xcd: value = view.getUint16(pos); pos += 2; return value;
+                    case 0xce: value = view.getUint32(pos); pos += 4; return value;
+                    case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value;
+                    case 0xd0: return view.getInt8(pos++);
+                    case 0xd1: value = view.getInt16(pos); pos += 2; return value;
+                    case 0xd2: value = view.getInt32(pos); pos += 4; return value;
+                    case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value;
+                    case 0xd9: return str(bytes[pos++]);
+                    case 0xda: value = view.getUint16(pos); pos += 2; return str(value);
+                    case 0xdb: value = view.getUint32(pos); pos += 4; return str(value);
+                    case 0xdc: value = view.getUint16(pos); pos += 2; return arr(value);
+                    case 0xdd: value = view.getUint32(pos); pos += 4; return arr(value);
+                    case 0xde: value = view.getUint16(pos); pos += 2; return map(value);
+                    case 0xdf: value = view.getUint32(pos); pos += 4; return map(value);
                 }
+                throw new Error('Unsupported MessagePack type 0x' + type.toString(16));
             }
+            return read();
         }
         
-        function updateSystemStatus(status) {
-            // Update status indicators using IDs instead of nth-child
-            const wifiStatus = document.getElementById('wifi-status');
-            const internetStatus = document.getElementById('internet-status');
-            const apStatus = document.getElementById('ap-status');
-            const piholeStatus = document.getElementById('pihole-status');
-            
-            if (wifiStatus) {
-                wifiStatus.textContent = `📶 WLAN (wlan0): ${status.wifi ? 'Online' : 'Offline'}`;
-                wifiStatus.className = `status-item ${status.wifi ? 'status-online' : 'status-offline'}`;
-            }
-            
-            if (internetStatus) {
-                internetStatus.textContent = `🌐 Internet: ${status.internet ? 'Verbunden' : 'Getrennt'}`;
-                internetStatus.className = `status-item ${status.internet ? 'status-online' : 'status-offline'}`;
-            }
-            
-            if (apStatus) {
-                apStatus.textContent = `📡 AP (wlan1): ${status.ap ? 'Online' : 'Offline'}`;
-                apStatus.className = `status-item ${status.ap ? 'status-online' : 'status-offline'}`;
+        // Write DOM text/classes only when the value changed (no needless layout invalidation)
+        function setText(el, text) {
+            text = String(text);
+            if (el && el.textContent !== text) el.textContent = text;
+        }
+        
+        function setClass(el, className) {
+            if (el && el.className !== className) el.className = className;
+        }
+        
+        // Client table rows keyed by MAC, updated in place instead of rebuilt on every update
+        const clientRows = new Map();
+        
+        function createClientRow(client) {
+            const row = document.createElement('tr');
+            for (let i = 0; i < 4; i++) {
+                row.appendChild(document.createElement('td'));
             }
+            ['download', 'upload'].forEach(type => {
+                const cell = document.createElement('td');
+                const speed = document.createElement('span');
+                speed.className = 'client-speed';
+                speed.dataset.mac = client.mac;
+                speed.dataset.type = type;
+                speed.textContent = '0.0';
+                cell.append(speed, ' Mbit/s');
+                row.appendChild(cell);
+            });
+            return row;
+        }
+        
+        // DOM references, resolved once on first use instead of on every update
+        let DOM = null;
+        
+        function getDom() {
+            if (DOM) return DOM;
+            // Not cached while the document is still parsing (script placed in <head> by a theme)
+            const parsing = document.readyState === 'loading';
+            const statItems = document.querySelectorAll('.stats-grid .stat-item');
+            const dom = {
+                statValues: Array.from(statItems, item => item.querySelector('.stat-value')),
+                diskSubtitle: statItems[2] ? statItems[2].querySelector('.stat-subtitle') : null,
+                wsStatus: document.getElementById('websocket-status'),
+                wifiStatus: document.getElementById('wifi-status'),
+                internetStatus: document.getElementById('internet-status'),
+                apStatus: document.getElementById('ap-status'),
+                piholeStatus: document.getElementById('pihole-status'),
+                uptimeDisplay: document.getElementById('uptime-display'),
+                uptime: document.getElementById('uptime'),
+                piholeQueries: document.getElementById('pihole-queries'),
+                piholeBlocked: document.getElementById('pihole-blocked'),
+                piholePercent: document.getElementById('pihole-percent'),
+                currentSsid: document.getElementById('current_ssid'),
+                signalValue: document.getElementById('signal-value'),
+                currentWifiSection: document.getElementById('current-wifi-section'),
+                signalBars: document.getElementById('signal-bars'),
+                signalStatus: document.getElementById('signal-status-text'),
+                download: document.getElementById('download-speed'),
+                upload: document.getElementById('upload-speed'),
+                clientTable: document.querySelector('.table tbody'),
+                noClients: document.querySelector('.table-container + p'),
+                // Forms and modals used by the action handlers
+                apSsid: document.getElementById('ap_ssid'),
+                apPass: document.getElementById('ap_pass'),
+                apBand: document.getElementById('ap_band'),
+                apChannel: document.getElementById('ap_channel'),
+                apVisibility: document.getElementById('ap_visibility_toggle'),
+                wanSsid: document.getElementById('wan_ssid'),
+                wanPass: document.getElementById('wan_pass'),
+                wifiNetworks: document.getElementById('wifiNetworks'),
+                wifiModal: document.getElementById('wifiModal'),
+                systemModal: document.getElementById('systemModal'),
+                themeModal: document.getElementById('themeModal'),
+                themesGrid: document.getElementById('themesGrid'),
+                publicIp: document.getElementById('public-ip'),
+                publicIpStatus: document.getElementById('public-ip-status')
+            };
+            if (!parsing) DOM = dom;
+            return dom;
+        }
+        
+        // Update functions
+        function updateClientList(data) {
+            if (!data || !data.clients) return;
             
-            if (piholeStatus) {
-                piholeStatus.textContent = `🛡️ Pi-hole: ${status.pihole ? 'Online' : 'Offline'}`;
-                piholeStatus.className = `status-item ${status.pihole ? 'status-online' : 'status-offline'}`;
+            const dom = getDom();
+            
+            // Update client count in stats
+            setText(dom.statValues[4], data.count);
+            
+            // Update client table
+            const tbody = dom.clientTable;
+            if (tbody) {
+                // Replace the server-rendered rows once, afterwards only diff by MAC
+                if (!tbody.dataset.keyed) {
+                    tbody.dataset.keyed = '1';
+                    tbody.textContent = '';
+                }
+                
+                const seen = new Set();
+                const fragment = document.createDocumentFragment();
+                data.clients.forEach(client => {
+                    seen.add(client.mac);
+                    let row = clientRows.get(client.mac);
+                    if (!row) {
+                        row = createClientRow(client);
+                        clientRows.set(client.mac, row);
+                        fragment.appendChild(row);
+                    }
+                    setText(row.cells[0], client.ip);
+                    setText(row.cells[1], client.mac);
+                    setText(row.cells[2], client.hostname || '-');
+                    setText(row.cells[3], `${client.signal || '-'}${client.interface == 'br0' ? ' (LAN)' : ''}`);
+                });
+                
+                clientRows.forEach((row, mac) => {
+                    if (!seen.has(mac)) {
+                        row.remove();
+                        clientRows.delete(mac);
+                    }
+                });
+                tbody.appendChild(fragment);
+                
+                // Show/hide "No clients" message
+                if (dom.noClients) {
+                    dom.noClients.style.display = data.count > 0 ? 'none' : 'block';
+                }
             }
+        }
+        
+        function updateSystemStatus(status) {
+            // Update status indicators using IDs instead of nth-child
+            const { wifiStatus, internetStatus, apStatus, piholeStatus, uptimeDisplay } = getDom();
+            
+            setText(wifiStatus, `📶 WLAN (wlan0): ${status.wifi ? 'Online' : 'Offline'}`);
+            setClass(wifiStatus, `status-item ${status.wifi ? 'status-online' : 'status-offline'}`);
+            
+            setText(internetStatus, `🌐 Internet: ${status.internet ? 'Verbunden' : 'Getrennt'}`);
+            setClass(internetStatus, `status-item ${status.internet ? 'status-online' : 'status-offline'}`);
+            
+            setText(apStatus, `📡 AP (wlan1): ${status.ap ? 'Online' : 'Offline'}`);
+            setClass(apStatus, `status-item ${status.ap ? 'status-online' : 'status-offline'}`);
+            
+            setText(piholeStatus, `🛡️ Pi-hole: ${status.pihole ? 'Online' : 'Offline'}`);
+            setClass(piholeStatus, `status-item ${status.pihole ? 'status-online' : 'status-offline'}`);
             
             // Update uptime in header
-            const uptimeDisplay = document.getElementById('uptime-display');
-            if (uptimeDisplay && status.uptime) {
-                uptimeDisplay.textContent = `⏱️ ${status.uptime}`;
+            if (status.uptime) {
+                setText(uptimeDisplay, `⏱️ ${status.uptime}`);
             }
         }
         
         function updateSystemStats(stats) {
+            const dom = getDom();
+            
             // Update stats grid elements
-            const statsGrid = document.querySelector('.stats-grid');
-            if (statsGrid) {
-                const statItems = statsGrid.querySelectorAll('.stat-item');
-                if (statItems.length >= 4) {
-                    // CPU
-                    statItems[0].querySelector('.stat-value').textContent = `${stats.cpu}%`;
-                    // RAM
-                    statItems[1].querySelector('.stat-value').textContent = `${stats.memory}%`;
-                    // Speicher (Disk)
-                    const diskPercent = Math.round((stats.disk_used / stats.disk_total) * 100);
-                    statItems[2].querySelector('.stat-value').textContent = `${diskPercent}%`;
-                    const subtitle = statItems[2].querySelector('.stat-subtitle');
-                    if (subtitle) {
-                        subtitle.textContent = 'Belegt';
-                    }
-                    // Temperatur
-                    statItems[3].querySelector('.stat-value').textContent = `${stats.temperature}°C`;
-                    // Clients
-                    if (statItems[4]) {
-                        statItems[4].querySelector('.stat-value').textContent = stats.clients;
-                    }
-                }
+            const statValues = dom.statValues;
+            if (statValues.length >= 4) {
+                // CPU
+                setText(statValues[0], `${stats.cpu}%`);
+                // RAM
+                setText(statValues[1], `${stats.memory}%`);
+                // Speicher (Disk)
+                setText(statValues[2], `${stats.disk_percent}%`);
+                setText(dom.diskSubtitle, 'Belegt');
+                // Temperatur
+                setText(statValues[3], `${stats.temperature}°C`);
+                // Clients
+                setText(statValues[4], stats.clients);
             }
             
             // Update uptime if element exists
-            const uptimeEl = document.getElementById('uptime');
-            if (uptimeEl && stats.uptime) {
-                uptimeEl.textContent = stats.uptime;
+            if (stats.uptime) {
+                setText(dom.uptime, stats.uptime);
             }
             
             // Update Pi-hole statistics
-            const piholeQueries = document.getElementById('pihole-queries');
-            const piholeBlocked = document.getElementById('pihole-blocked');
-            const piholePercent = document.getElementById('pihole-percent');
-            
-            if (piholeQueries) piholeQueries.textContent = stats.pihole_queries || 0;
-            if (piholeBlocked) piholeBlocked.textContent = stats.pihole_blocked || 0;
-            if (piholePercent) piholePercent.textContent = (stats.pihole_blocked_percent || 0) + '%';
+            setText(dom.piholeQueries, stats.pihole_queries || 0);
+            setText(dom.piholeBlocked, stats.pihole_blocked || 0);
+            setText(dom.piholePercent, (stats.pihole_blocked_percent || 0) + '%');
         }
         
         function updateWiFiStatus(wifiData) {
+            const dom = getDom();
             if (wifiData.connected) {
-                document.getElementById('current_ssid').value = wifiData.ssid;
-                document.getElementById('signal-value').textContent = wifiData.signal + '%';
-                document.getElementById('current-wifi-section').style.display = 'block';
+                dom.currentSsid.value = wifiData.ssid;
+                setText(dom.signalValue, wifiData.signal + '%');
+                dom.currentWifiSection.style.display = 'block';
                 
-                // Update signal bars
-                const signalBarsContainer = document.getElementById('signal-bars');
-                signalBarsContainer.innerHTML = '';
-                signalBarsContainer.appendChild(createSignalBars(wifiData.signal));
+                // Update signal bars (only rebuilt when the bar level changed)
+                const signalBarsContainer = dom.signalBars;
+                const barKey = signalBarKey(wifiData.signal);
+                if (signalBarsContainer.dataset.bars !== barKey) {
+                    signalBarsContainer.dataset.bars = barKey;
+                    signalBarsContainer.innerHTML = '';
+                    signalBarsContainer.appendChild(createSignalBars(wifiData.signal));
+                }
                 
                 // Update signal status display
-                const quality = getSignalQuality(wifiData.signal);
-                const statusElement = document.getElementById('signal-status-text');
-                statusElement.textContent = quality.text;
-                statusElement.className = quality.class;
+                const quality = SIGNAL_QUALITY[wifiData.signal_tier] || getSignalQuality(wifiData.signal);
+                const statusElement = dom.signalStatus;
+                setText(statusElement, quality.text);
+                setClass(statusElement, quality.class);
             } else {
-                document.getElementById('current-wifi-section').style.display = 'none';
+                dom.currentWifiSection.style.display = 'none';
                 
                 // Show no connection status
-                const statusElement = document.getElementById('signal-status-text');
-                statusElement.textContent = 'Keine WLAN-Verbindung';
-                statusElement.className = 'signal-none';
+                const statusElement = dom.signalStatus;
+                setText(statusElement, 'Keine WLAN-Verbindung');
+                setClass(statusElement, 'signal-none');
             }
         }
         
-        // Moving average for smoother speed display
-        let speedHistory = {
-            download: [],
-            upload: []
+        // Display for the signal tiers computed by the server
+        const SIGNAL_QUALITY = {
+            excellent: { text: '🏆 Ausgezeichnet', class: 'signal-excellent', color: 'excellent' },
+            good: { text: '✅ Sehr gut', class: 'signal-good', color: 'good' },
+            fair: { text: '👍 Gut', class: 'signal-fair', color: 'fair' },
+            poor: { text: '⚠️ Schwach', class: 'signal-poor', color: 'poor' },
+            weak: { text: '❌ Sehr schwach', class: 'signal-poor', color: 'poor' }
         };
+        Object.values(SIGNAL_QUALITY).forEach(Object.freeze);
+        
+        // Lookup tables indexed by signal percent (0-100), same thresholds as the server's SIGNAL_TIERS
+        const SIGNAL_QUALITY_LUT = Array.from({ length: 101 }, (_, i) =>
+            SIGNAL_QUALITY[i >= 95 ? 'excellent' : i >= 80 ? 'good' : i >= 60 ? 'fair' : i >= 30 ? 'poor' : 'weak']);
+        const SIGNAL_BARS_LUT = Array.from({ length: 101 }, (_, i) =>
+            i >= 75 ? '▂▄▆█' : i >= 50 ? '▂▄▆_' : i >= 25 ? '▂▄__' : '▂___');
+        
+        function signalIndex(signal) {
+            const value = typeof signal === 'number' ? signal : parseInt(signal);
+            return value > 0 ? Math.min(100, value | 0) : 0;
+        }
+        
+        // Moving average for smoother speed display (ring buffer with running sums)
         const HISTORY_SIZE = 3; // Average over last 3 measurements
+        const speedHistory = {
+            download: new Array(HISTORY_SIZE).fill(0),
+            upload: new Array(HISTORY_SIZE).fill(0),
+            downloadSum: 0,
+            uploadSum: 0,
+            index: 0,
+            count: 0
+        };
         
-        function updateSpeedData(data) {
-            if (!data || !data.success) {
-                return;
-            }
-            
-            const wanRx = parseInt(data.wan_rx) || 0;
-            const apTx = parseInt(data.ap_tx) || 0;
-            const currentTime = parseInt(data.timestamp) || Date.now();
-            
-            const downloadEl = document.getElementById('download-speed');
-            const uploadEl = document.getElementById('upload-speed');
-            
-            if (!downloadEl || !uploadEl) {
-                return;
-            }
+        // Fold one counter sample into the speed history, returns true if a rate was added
+        function addSpeedSample(wanRx, apTx, currentTime) {
+            let added = false;
             
             if (lastSpeedData && lastSpeedData.wan_rx !== undefined) {
                 const timeDiff = (currentTime - lastSpeedData.timestamp) / 1000;
@@ -1543,30 +2186,16 @@ SYSTEM_JAVASCRIPT = """
                     let downloadMbps = (wanDiff * 8) / (timeDiff * 1024 * 1024);
                     let uploadMbps = (apDiff * 8) / (timeDiff * 1024 * 1024);
                     
-                    // Add to history
-                    speedHistory.download.push(downloadMbps);
-                    speedHistory.upload.push(uploadMbps);
-                    
-                    // Keep only last N measurements
-                    if (speedHistory.download.length > HISTORY_SIZE) {
-                        speedHistory.download.shift();
-                        speedHistory.upload.shift();
-                    }
-                    
-                    // Calculate moving average
-                    const avgDownload = speedHistory.download.reduce((a, b) => a + b, 0) / speedHistory.download.length;
-                    const avgUpload = speedHistory.upload.reduce((a, b) => a + b, 0) / speedHistory.upload.length;
-                    
-                    // Filter very small values (< 0.1 Mbit/s)
-                    const displayDownload = avgDownload < 0.1 ? 0 : Math.round(avgDownload * 10) / 10;
-                    const displayUpload = avgUpload < 0.1 ? 0 : Math.round(avgUpload * 10) / 10;
-                    
-                    downloadEl.textContent = displayDownload.toFixed(1);
-                    uploadEl.textContent = displayUpload.toFixed(1);
+                    // Replace the oldest measurement and keep the sums in step
+                    const i = speedHistory.index;
+                    speedHistory.downloadSum += downloadMbps - speedHistory.download[i];
+                    speedHistory.uploadSum += uploadMbps - speedHistory.upload[i];
+                    speedHistory.download[i] = downloadMbps;
+                    speedHistory.upload[i] = uploadMbps;
+                    speedHistory.index = (i + 1) % HISTORY_SIZE;
+                    speedHistory.count = Math.min(speedHistory.count + 1, HISTORY_SIZE);
+                    added = true;
                 }
-            } else {
-                downloadEl.textContent = '0.0';
-                uploadEl.textContent = '0.0';
             }
             
             lastSpeedData = {
@@ -1574,167 +2203,282 @@ SYSTEM_JAVASCRIPT = """
                 ap_tx: apTx,
                 timestamp: currentTime
             };
+            return added;
+        }
+        
+        function updateSpeedData(data) {
+            if (!data || !data.success) {
+                return;
+            }
+            
+            const { download: downloadEl, upload: uploadEl } = getDom();
+            
+            if (!downloadEl || !uploadEl) {
+                return;
+            }
+            
+            // Batched payloads carry all samples since the last one as [timestamp, wan_rx, ap_tx]
+            const samples = speedSamples(data);
+            const firstSample = !lastSpeedData;
+            let added = false;
+            for (const [timestamp, wanRx, apTx] of samples) {
+                if (typeof wanRx !== 'number' || typeof apTx !== 'number') continue;
+                added = addSpeedSample(wanRx, apTx, timestamp) || added;
+            }
+            
+            // Single DOM write for the whole batch
+            if (added) {
+                // Calculate moving average
+                const avgDownload = speedHistory.downloadSum / speedHistory.count;
+                const avgUpload = speedHistory.uploadSum / speedHistory.count;
+                
+                // Filter very small values (< 0.1 Mbit/s)
+                const displayDownload = avgDownload < 0.1 ? 0 : Math.round(avgDownload * 10) / 10;
+                const displayUpload = avgUpload < 0.1 ? 0 : Math.round(avgUpload * 10) / 10;
+                
+                setText(downloadEl, displayDownload.toFixed(1));
+                setText(uploadEl, displayUpload.toFixed(1));
+            } else if (firstSample) {
+                setText(downloadEl, '0.0');
+                setText(uploadEl, '0.0');
+            }
         }
         
         // Get signal quality text and class
         function getSignalQuality(signal) {
-            const signalNum = parseInt(signal);
-            if (signalNum >= 95) {
-                return { text: '🏆 Ausgezeichnet', class: 'signal-excellent', color: 'excellent' };
-            } else if (signalNum >= 80) {
-                return { text: '✅ Sehr gut', class: 'signal-good', color: 'good' };
-            } else if (signalNum >= 60) {
-                return { text: '👍 Gut', class: 'signal-fair', color: 'fair' };
-            } else if (signalNum >= 30) {
-                return { text: '⚠️ Schwach', class: 'signal-poor', color: 'poor' };
-            } else {
-                return { text: '❌ Sehr schwach', class: 'signal-poor', color: 'poor' };
-            }
+            return SIGNAL_QUALITY_LUT[signalIndex(signal)];
+        }
+        
+        // Prebuilt signal bar elements, one per (filled bars, color) combination
+        const signalBarTemplates = new Map();
+        
+        function signalBarKey(signal) {
+            const filledBars = Math.min(4, Math.max(0, Math.ceil(signal / 25))); // 4 bars total, each represents 25%
+            return filledBars + ':' + getSignalQuality(signal).color;
         }
         
         function createSignalBars(signal) {
-            const bars = [];
-            const quality = getSignalQuality(signal);
-            const filledBars = Math.ceil(signal / 25); // 4 bars total, each represents 25%
-            
-            for (let i = 0; i < 4; i++) {
-                const bar = document.createElement('span');
-                bar.className = 'signal-bar';
-                if (i < filledBars) {
-                    bar.classList.add('filled');
-                    bar.classList.add(quality.color);
+            const key = signalBarKey(signal);
+            let template = signalBarTemplates.get(key);
+            if (!template) {
+                const [filledBars, color] = key.split(':');
+                template = document.createElement('span');
+                template.className = 'signal-bars';
+                for (let i = 0; i < 4; i++) {
+                    const bar = document.createElement('span');
+                    bar.className = i < filledBars ? 'signal-bar filled ' + color : 'signal-bar';
+                    template.appendChild(bar);
                 }
-                bars.push(bar);
+                signalBarTemplates.set(key, template);
             }
-            
-            const container = document.createElement('span');
-            container.className = 'signal-bars';
-            bars.forEach(bar => container.appendChild(bar));
-            return container;
+            return template.cloneNode(true);
         }
         
         function connectWifi() {
-            const ssid = document.getElementById('wan_ssid').value;
-            const pass = document.getElementById('wan_pass').value;
+            const dom = getDom();
+            const ssid = dom.wanSsid.value;
+            const pass = dom.wanPass.value;
             
-            fetch('/api/connect_wifi', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({ssid: ssid, password: pass})
-            }).then(response => response.json())
+            apiPost('/api/connect_wifi', {ssid: ssid, password: pass})
               .then(data => {
                   if (data.success) {
                       showToast('WLAN-Verbindung erfolgreich!', 'success');
-                      setTimeout(() => location.reload(), 2000);
+                      scheduleReload(2000);
                   } else {
                       showToast('WLAN-Verbindung fehlgeschlagen: ' + data.error, 'error');
                   }
               });
         }
 
+        // Scan results are kept for the session; a rescan only happens when they are older than this
+        const WIFI_SCAN_CACHE_KEY = 'wifi_scan_cache';
+        const WIFI_SCAN_MAX_AGE = 15000; // ms
+        
+        function readWifiScanCache() {
+            try {
+                return JSON.parse(sessionStorage.getItem(WIFI_SCAN_CACHE_KEY));
+            } catch (e) {
+                return null;
+            }
+        }
+        
+        // Only SSIDs and 10% signal steps matter for deciding whether to re-render
+        function wifiScanSignature(networks) {
+            return networks.map(n => n.ssid + ':' + Math.floor(parseInt(n.signal) / 10)).join('|');
+        }
+        
+        function isWifiModalOpen() {
+            return getDom().wifiModal.style.display !== 'none';
+        }
+        
+        function showWifiScanError(message, cache) {
+            if (!isWifiModalOpen()) {
+                return;
+            }
+            if (cache) {
+                // Keep showing the cached list
+                showToast(message, 'error');
+                return;
+            }
+            getDom().wifiNetworks.innerHTML = `
+                <div style="text-align: center; padding: 20px; color: #e53e3e;">
+                    <p>${escapeHtml(message)}</p>
+                </div>
+            `;
+        }
+        
         function showWifiModal() {
-            const modal = document.getElementById('wifiModal');
+            const modal = getDom().wifiModal;
             modal.style.display = 'block';
             
-            // Reset loading state
-            document.getElementById('wifiNetworks').innerHTML = `
-                <div style="text-align: center; padding: 20px;">
-                    <div class="loading"></div>
-                    <p>Suche nach WLAN-Netzwerken...</p>
-                </div>
-            `;
+            // Show the last results right away (stale-while-revalidate)
+            const cache = readWifiScanCache();
+            if (cache) {
+                displayWifiNetworks(cache.networks);
+            } else {
+                // Reset loading state
+                getDom().wifiNetworks.innerHTML = `
+                    <div style="text-align: center; padding: 20px;">
+                        <div class="loading"></div>
+                        <p>Suche nach WLAN-Netzwerken...</p>
+                    </div>
+                `;
+            }
             
-            // Start scan and load networks
-            fetch('/api/scan_wifi')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        loadWifiNetworks();
-                    } else {
-                        document.getElementById('wifiNetworks').innerHTML = `
-                            <div style="text-align: center; padding: 20px; color: #e53e3e;">
-                                <p>WLAN-Scan fehlgeschlagen: ${data.error || 'Unbekannter Fehler'}</p>
-                            </div>
-                        `;
-                    }
-                })
-                .catch(error => {
-                    document.getElementById('wifiNetworks').innerHTML = `
-                        <div style="text-align: center; padding: 20px; color: #e53e3e;">
-                            <p>Fehler beim Scannen: ${error.message}</p>
-                        </div>
-                    `;
-                });
+            // Recent scan: just re-read NetworkManager's list without another radio scan
+            if (cache && Date.now() - cache.ts < WIFI_SCAN_MAX_AGE) {
+                loadWifiNetworks(cache, cache.ts);
+                return;
+            }
+            
+            // Scan and load networks in one request
+            streamWifiScan(cache);
         }
         
         function closeWifiModal() {
-            document.getElementById('wifiModal').style.display = 'none';
-        }
-        
-        // Get signal quality text and class
-        function getSignalQuality(signal) {
-            const signalNum = parseInt(signal);
-            if (signalNum >= 95) {
-                return { text: '🏆 Ausgezeichnet', class: 'signal-excellent', color: 'excellent' };
-            } else if (signalNum >= 80) {
-                return { text: '✅ Sehr gut', class: 'signal-good', color: 'good' };
-            } else if (signalNum >= 60) {
-                return { text: '👍 Gut', class: 'signal-fair', color: 'fair' };
-            } else if (signalNum >= 30) {
-                return { text: '⚠️ Schwach', class: 'signal-poor', color: 'poor' };
-            } else {
-                return { text: '❌ Sehr schwach', class: 'signal-poor', color: 'poor' };
-            }
+            getDom().wifiModal.style.display = 'none';
+            closeWifiScanStream();
         }
         
-        // Load current WiFi connection on page load
+        // A scan arrives as server-sent events: the networks already known first, the fresh scan when done
+        let wifiScanStream = null;
         
-        // Disconnect WiFi
-        function disconnectWifi() {
-            if (!confirm('WLAN-Verbindung wirklich trennen?')) {
+        function streamWifiScan(cache) {
+            const scannedAt = Date.now();
+            if (!window.EventSource) {
+                loadWifiNetworks(cache, scannedAt, true);
                 return;
             }
-            
-            fetch('/api/disconnect_wifi', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
+            closeWifiScanStream();
+            const source = new EventSource(cache ? '/api/scan_wifi_stream?cached=1' : '/api/scan_wifi_stream');
+            wifiScanStream = source;
+            let shown = cache;
+            source.onmessage = event => {
+                const data = JSON.parse(event.data);
+                if (data.final) {
+                    closeWifiScanStream();
                 }
-            })
-            .then(response => response.json())
-            .then(data => {
+                showWifiNetworks(data, shown, data.final ? scannedAt : null);
                 if (data.success) {
-                    alert('WLAN-Verbindung getrennt');
-                    loadCurrentWifi(); // Refresh status
-                    location.reload(); // Reload page to update all status
-                } else {
-                    alert('Fehler beim Trennen: ' + (data.error || 'Unbekannter Fehler'));
+                    shown = data;
                 }
-            })
-            .catch(error => {
-                alert('Fehler beim Trennen: ' + error.message);
-            });
+            };
+            source.onerror = () => {
+                closeWifiScanStream();
+                showWifiScanError('Fehler beim Scannen: Verbindung unterbrochen', shown);
+            };
         }
         
-        function loadWifiNetworks() {
-            fetch('/api/get_wifi_networks')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        displayWifiNetworks(data.networks);
-                    } else {
-                        document.getElementById('wifiNetworks').innerHTML = `
-                            <div style="text-align: center; padding: 20px; color: #e53e3e;">
-                                <p>Fehler beim Laden der Netzwerke: ${data.error}</p>
-                            </div>
-                        `;
+        function closeWifiScanStream() {
+            if (wifiScanStream) {
+                wifiScanStream.close();
+                wifiScanStream = null;
+            }
+        }
+        
+        // Last network list and its ETag; an unchanged scan comes back as an empty 304
+        let wifiNetworksEtag = null;
+        let wifiNetworksData = null;
+        
+        function loadWifiNetworks(cache, scannedAt, rescan) {
+            const headers = wifiNetworksEtag ? { 'If-None-Match': wifiNetworksEtag } : {};
+            fetch(rescan ? '/api/get_wifi_networks?rescan=1' : '/api/get_wifi_networks', { headers })
+                .then(response => {
+                    if (response.status === 304 && wifiNetworksData) {
+                        return wifiNetworksData;
                     }
+                    wifiNetworksEtag = response.headers.get('ETag');
+                    return response.json().then(data => {
+                        wifiNetworksData = data.success ? data : null;
+                        return data;
+                    });
+                })
+                .then(data => showWifiNetworks(data, cache, scannedAt || Date.now()))
+                .catch(error => {
+                    showWifiScanError(`Fehler beim Scannen: ${error.message}`, cache);
+                });
+        }
+        
+        // scannedAt is null for a list that is shown but not cached as a scan result
+        function showWifiNetworks(data, cache, scannedAt) {
+            if (!data.success) {
+                showWifiScanError(`Fehler beim Laden der Netzwerke: ${data.error}`, cache);
+                return;
+            }
+            if (scannedAt) {
+                sessionStorage.setItem(WIFI_SCAN_CACHE_KEY, JSON.stringify({ ts: scannedAt, networks: data.networks }));
+            }
+            // Skip the re-render if the modal was closed meanwhile or the list shown already matches
+            if (!isWifiModalOpen()) {
+                return;
+            }
+            if (!cache || wifiScanSignature(cache.networks) !== wifiScanSignature(data.networks)) {
+                displayWifiNetworks(data.networks, true);
+            }
+        }
+        
+        // Virtualized scan result list: only the rows in view exist, and they are reused while scrolling
+        // and across scans (rows scrolled out of use wait in spareRows)
+        const WIFI_ROW_OVERSCAN = 3;
+        const WIFI_ROW_FALLBACK_HEIGHT = 80;
+        const wifiList = {
+            list: null,
+            networks: [],
+            rows: [],
+            spareRows: [],
+            passwords: new Map(), // typed passwords survive rows being rebound
+            currentSSID: '',
+            rowHeight: 0,
+            viewHeight: 0,
+            start: -1,
+            scrollScheduled: false
+        };
+        
+        function getWifiListElement() {
+            if (!wifiList.list) {
+                const list = document.createElement('div');
+                list.className = 'network-list';
+                wifiList.list = list;
+                wifiList.topSpacer = document.createElement('div');
+                wifiList.body = document.createElement('div');
+                wifiList.bottomSpacer = document.createElement('div');
+                list.append(wifiList.topSpacer, wifiList.body, wifiList.bottomSpacer);
+                list.addEventListener('scroll', function() {
+                    if (wifiList.scrollScheduled) return;
+                    wifiList.scrollScheduled = true;
+                    requestAnimationFrame(() => {
+                        wifiList.scrollScheduled = false;
+                        renderWifiRows();
+                    });
                 });
+            }
+            return wifiList.list;
         }
         
-        function displayWifiNetworks(networks) {
+        function displayWifiNetworks(networks, refresh = false) {
+            const container = getDom().wifiNetworks;
             if (networks.length === 0) {
-                document.getElementById('wifiNetworks').innerHTML = `
+                container.innerHTML = `
                     <div style="text-align: center; padding: 20px; color: #666;">
                         <p>Keine WLAN-Netzwerke gefunden</p>
                     </div>
@@ -1743,44 +2487,161 @@ SYSTEM_JAVASCRIPT = """
             }
             
             // Get current connected SSID
-            const currentSSID = document.getElementById('current_ssid')?.value || '';
+            wifiList.currentSSID = getDom().currentSsid?.value || '';
+            wifiList.networks = networks;
+            wifiList.start = -1;
             
-            let html = '';
-            networks.forEach(network => {
-                const signalBars = getSignalBars(network.signal);
-                const isConnected = network.ssid === currentSSID;
-                const itemClass = isConnected ? 'network-item connected' : 'network-item';
-                
-                html += `
-                    <div class="${itemClass}">
-                        <div class="network-info">
-                            <div class="network-name">${network.ssid || '(Versteckt)'}${isConnected ? ' ✓ Verbunden' : ''}</div>
-                            <div class="network-details">
-                                Signal: ${signalBars} (${network.signal}%) | 
-                                Frequenz: ${network.frequency} | 
-                                Sicherheit: ${network.security || 'Offen'}
-                            </div>
-                        </div>
-                        <div class="network-actions">
-                            ${isConnected ? 
-                                `<button class="btn btn-danger" onclick="disconnectWifi()">Trennen</button>` :
-                                `<input type="password" id="pass_${network.ssid}" placeholder="Passwort" style="display: ${network.security && network.security !== 'Offen' ? 'block' : 'none'}">
-                                <button class="btn" onclick="connectToNetwork('${network.ssid}', '${network.security}')">Verbinden</button>`
-                            }
-                        </div>
-                    </div>
-                `;
-            });
+            // A refresh of the list on screen keeps scroll position and typed passwords;
+            // bindWifiRow then only touches rows whose network actually changed
+            const list = getWifiListElement();
+            if (refresh && list.parentNode === container) {
+                const ssids = new Set(networks.map(network => network.ssid));
+                for (const ssid of wifiList.passwords.keys()) {
+                    if (!ssids.has(ssid)) {
+                        wifiList.passwords.delete(ssid);
+                    }
+                }
+            } else {
+                wifiList.passwords.clear();
+                wifiList.rows.forEach(row => { row.network = null; });
+                if (list.parentNode !== container) {
+                    container.replaceChildren(list);
+                }
+                list.scrollTop = 0;
+            }
+            
+            // Measure one row to size the window and the spacers (kept once the modal has been laid out)
+            if (!wifiList.rowHeight) {
+                if (!wifiList.rows.length) {
+                    const probe = wifiList.spareRows.pop() || createWifiRow();
+                    wifiList.rows.push(probe);
+                    wifiList.body.appendChild(probe);
+                }
+                const probe = wifiList.rows[0];
+                bindWifiRow(probe, networks[0]);
+                if (probe.offsetHeight) {
+                    wifiList.rowHeight = probe.offsetHeight + (parseFloat(getComputedStyle(probe).marginBottom) || 0);
+                    wifiList.viewHeight = parseFloat(getComputedStyle(list).maxHeight) || 400;
+                }
+            }
+            
+            // Rows in view first so the modal is usable at once, the overscan rows follow next frame
+            renderWifiRows(0);
+            requestAnimationFrame(() => renderWifiRows());
+        }
+        
+        function renderWifiRows(overscan = WIFI_ROW_OVERSCAN) {
+            const { list, rows, networks } = wifiList;
+            const rowHeight = wifiList.rowHeight || WIFI_ROW_FALLBACK_HEIGHT;
+            const viewHeight = wifiList.viewHeight || 400;
+            const first = Math.floor(list.scrollTop / rowHeight);
+            const windowRows = Math.ceil(viewHeight / rowHeight) + 2 * overscan;
+            // A refresh may bring fewer networks than rows above the kept scroll position
+            const start = Math.min(Math.max(0, first - overscan), Math.max(0, networks.length - windowRows));
+            const count = Math.max(0, Math.min(networks.length - start, windowRows));
+            if (start === wifiList.start && count === rows.length) {
+                return;
+            }
+            wifiList.start = start;
+            
+            if (rows.length < count) {
+                const fragment = document.createDocumentFragment();
+                while (rows.length < count) {
+                    const row = wifiList.spareRows.pop() || createWifiRow();
+                    rows.push(row);
+                    fragment.appendChild(row);
+                }
+                wifiList.body.appendChild(fragment);
+            }
+            while (rows.length > count && rows.length) {
+                const row = rows.pop();
+                row.remove();
+                row.network = null;
+                wifiList.spareRows.push(row);
+            }
+            // Rows are bound by position, so keep the focus on the network being typed into
+            const focused = rows.find(row => row.network && row.passwordInput === document.activeElement);
+            const focusedSsid = focused && focused.network.ssid;
+            rows.forEach((row, i) => bindWifiRow(row, networks[start + i]));
+            if (focused && focused.network.ssid !== focusedSsid) {
+                const row = rows.find(row => row.network.ssid === focusedSsid);
+                if (row) {
+                    row.passwordInput.focus();
+                }
+            }
+            
+            wifiList.topSpacer.style.height = (start * rowHeight) + 'px';
+            wifiList.bottomSpacer.style.height = ((networks.length - start - count) * rowHeight) + 'px';
+        }
+        
+        function createWifiRow() {
+            const row = document.createElement('div');
+            const info = document.createElement('div');
+            info.className = 'network-info';
+            row.nameEl = document.createElement('div');
+            row.nameEl.className = 'network-name';
+            row.detailsEl = document.createElement('div');
+            row.detailsEl.className = 'network-details';
+            info.append(row.nameEl, row.detailsEl);
+            
+            const actions = document.createElement('div');
+            actions.className = 'network-actions';
+            row.passwordInput = document.createElement('input');
+            row.passwordInput.type = 'password';
+            row.passwordInput.placeholder = 'Passwort';
+            row.passwordInput.addEventListener('input', () => wifiList.passwords.set(row.network.ssid, row.passwordInput.value));
+            row.connectButton = document.createElement('button');
+            row.connectButton.className = 'btn';
+            row.connectButton.textContent = 'Verbinden';
+            row.connectButton.addEventListener('click', () => connectToNetwork(row.network.ssid, row.network.security));
+            row.disconnectButton = document.createElement('button');
+            row.disconnectButton.className = 'btn btn-danger';
+            row.disconnectButton.textContent = 'Trennen';
+            row.disconnectButton.addEventListener('click', () => disconnectWifi());
+            actions.append(row.passwordInput, row.connectButton, row.disconnectButton);
+            
+            row.append(info, actions);
+            return row;
+        }
+        
+        function bindWifiRow(row, network) {
+            const previous = row.network;
+            if (previous === network) {
+                return;
+            }
+            row.network = network;
+            const isConnected = network.ssid === wifiList.currentSSID;
+            const secured = network.security && network.security !== 'Offen';
+            const signalBucket = Math.floor(signalIndex(network.signal) / 10);
+            
+            // Same network as before: rewrite the details only if the signal moved to another 10% step
+            if (previous && previous.ssid === network.ssid && previous.security === network.security && row.connected === isConnected) {
+                if (row.signalBucket !== signalBucket || previous.frequency !== network.frequency) {
+                    row.signalBucket = signalBucket;
+                    row.detailsEl.textContent = wifiRowDetails(network);
+                }
+                return;
+            }
+            row.connected = isConnected;
+            row.signalBucket = signalBucket;
+            
+            row.className = isConnected ? 'network-item connected' : 'network-item';
+            row.nameEl.textContent = (network.ssid || '(Versteckt)') + (isConnected ? ' ✓ Verbunden' : '');
+            row.detailsEl.textContent = wifiRowDetails(network);
             
-            document.getElementById('wifiNetworks').innerHTML = html;
+            row.passwordInput.id = `pass_${network.ssid}`;
+            row.passwordInput.value = wifiList.passwords.get(network.ssid) || '';
+            row.passwordInput.style.display = !isConnected && secured ? 'block' : 'none';
+            row.connectButton.style.display = isConnected ? 'none' : '';
+            row.disconnectButton.style.display = isConnected ? '' : 'none';
+        }
+        
+        function wifiRowDetails(network) {
+            return `Signal: ${getSignalBars(network.signal)} (${network.signal}%) | Frequenz: ${network.frequency} | Sicherheit: ${network.security || 'Offen'}`;
         }
         
         function getSignalBars(signal) {
-            const strength = parseInt(signal);
-            if (strength >= 75) return '▂▄▆█';
-            if (strength >= 50) return '▂▄▆_';
-            if (strength >= 25) return '▂▄__';
-            return '▂___';
+            return SIGNAL_BARS_LUT[signalIndex(signal)];
         }
         
         function disconnectWifi() {
@@ -1795,12 +2656,11 @@ SYSTEM_JAVASCRIPT = """
                 cancelButtonText: 'Abbrechen'
             }).then((result) => {
                 if (result.isConfirmed) {
-                    fetch('/api/disconnect_wifi', {method: 'POST'})
-                        .then(response => response.json())
+                    apiPost('/api/disconnect_wifi')
                         .then(data => {
                             if (data.success) {
                                 showToast('WLAN getrennt', 'success');
-                                setTimeout(() => location.reload(), 2000);
+                                scheduleReload(2000);
                             } else {
                                 showToast('Fehler beim Trennen', 'error');
                             }
@@ -1811,7 +2671,7 @@ SYSTEM_JAVASCRIPT = """
         
         function connectToNetwork(ssid, security) {
             const passwordInput = document.getElementById(`pass_${ssid}`);
-            const password = passwordInput ? passwordInput.value : '';
+            const password = passwordInput ? passwordInput.value : (wifiList.passwords.get(ssid) || '');
             
             if (security && security !== 'Offen' && !password) {
                 showToast('Passwort erforderlich für dieses Netzwerk', 'error');
@@ -1819,9 +2679,9 @@ SYSTEM_JAVASCRIPT = """
             }
             
             // Update main form
-            document.getElementById('wan_ssid').value = ssid;
+            getDom().wanSsid.value = ssid;
             if (password) {
-                document.getElementById('wan_pass').value = password;
+                getDom().wanPass.value = password;
             }
             
             // Close modal and connect
@@ -1831,29 +2691,26 @@ SYSTEM_JAVASCRIPT = """
         
         // Close modal when clicking outside
         window.onclick = function(event) {
-            const modal = document.getElementById('wifiModal');
+            const modal = getDom().wifiModal;
             if (event.target === modal) {
                 closeWifiModal();
             }
         }
 
         function updateAP() {
+            const dom = getDom();
             const data = {
-                ssid: document.getElementById('ap_ssid').value,
-                password: document.getElementById('ap_pass').value,
-                band: document.getElementById('ap_band').value,
-                channel: document.getElementById('ap_channel').value
+                ssid: dom.apSsid.value,
+                password: dom.apPass.value,
+                band: dom.apBand.value,
+                channel: dom.apChannel.value
             };
             
-            fetch('/api/update_ap', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify(data)
-            }).then(response => response.json())
+            apiPost('/api/update_ap', data)
               .then(data => {
                   if (data.success) {
                       showToast('✅ Access Point aktualisiert!', 'success');
-                      setTimeout(() => location.reload(), 2000);
+                      scheduleReload(2000);
                   } else {
                       showToast('❌ Access Point Update fehlgeschlagen', 'error');
                   }
@@ -1865,11 +2722,11 @@ SYSTEM_JAVASCRIPT = """
             fetch('/api/get_ap_qr_info')
                 .then(response => response.json())
                 .then(data => {
-                    const ssid = data.ssid || document.getElementById('ap_ssid').value;
-                    const password = data.password || document.getElementById('ap_pass').value;
+                    const ssid = data.ssid || getDom().apSsid.value;
+                    const password = data.password || getDom().apPass.value;
                     // Fix: ssid_visible is true when visible, so hidden = !ssid_visible
                     const isHidden = data.ssid_visible === false;
-                    console.log('QR Code Info:', {ssid, password: '***', isHidden, ssid_visible: data.ssid_visible});
+                    if (window.__DBG) console.log('QR Code Info:', {ssid, password: '***', isHidden, ssid_visible: data.ssid_visible});
                     generateQRCode(ssid, password, isHidden);
                 })
                 .catch(error => {
@@ -1888,10 +2745,12 @@ SYSTEM_JAVASCRIPT = """
             // Generate WIFI QR code string with correct hidden flag
             // Note: For hidden networks, H:true is required. For visible networks, omit H or use H:false
             // But many devices expect H to be omitted for visible networks
+            // Special characters in SSID and password are backslash-escaped per the WIFI: format
+            const wifiSsid = escapeWifiField(ssid);
+            const wifiPassword = escapeWifiField(password);
             const wifiString = isHidden 
-                ? `WIFI:T:WPA;S:${ssid};P:${password};H:true;;`
-                : `WIFI:T:WPA;S:${ssid};P:${password};;`;
-            console.log('QR-Code WiFi String:', wifiString, 'isHidden:', isHidden);
+                ? `WIFI:T:WPA;S:${wifiSsid};P:${wifiPassword};H:true;;`
+                : `WIFI:T:WPA;S:${wifiSsid};P:${wifiPassword};;`;
             
             // Show loading message
             Swal.fire({
@@ -1904,6 +2763,20 @@ SYSTEM_JAVASCRIPT = """
                 }
             });
             
+            const qrStyle = 'width: 256px; height: 256px; margin: 0 auto; border: 1px solid #ddd; border-radius: 8px; overflow: hidden;';
+            apiPost('/api/qr_code', {data: wifiString})
+                .then(data => {
+                    if (data.success) {
+                        showQRCodeDialog(ssid, password, isHidden, `<div style="${qrStyle}">${data.svg}</div>`);
+                    } else {
+                        loadRemoteQRCode(ssid, password, isHidden, wifiString);
+                    }
+                })
+                .catch(() => loadRemoteQRCode(ssid, password, isHidden, wifiString));
+        }
+        
+        // Fallback for routers without segno installed
+        function loadRemoteQRCode(ssid, password, isHidden, wifiString) {
             // Create QR code using a simple API service
             const qrApiUrl = `https://api.qrserver.com/v1/create-qr-code/?size=256x256&data=${encodeURIComponent(wifiString)}`;
             
@@ -1915,68 +2788,93 @@ SYSTEM_JAVASCRIPT = """
             img.style.border = '1px solid #ddd';
             img.style.borderRadius = '8px';
             
-            img.onload = () => {
-                const hiddenBadge = isHidden ? '<span style="background: #ff9800; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-left: 10px;">Versteckt</span>' : '<span style="background: #4CAF50; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-left: 10px;">Öffentlich</span>';
-                Swal.fire({
-                    title: 'WLAN QR-Code',
-                    html: `
-                        <div style="text-align: center;">
-                            <p><strong>SSID:</strong> ${ssid} ${hiddenBadge}</p>
-                            <p><strong>Passwort:</strong> ${password}</p>
-                            <div style="margin: 20px 0; padding: 20px; background: #f8f9fa; border-radius: 10px;">
-                                ${img.outerHTML}
-                            </div>
-                            <p style="font-size: 14px; color: #666;">Scanne den QR-Code mit deinem Handy zum automatischen Verbinden</p>
-                            ${isHidden ? '<p style="font-size: 13px; color: #ff9800; margin-top: 10px;"><strong>Hinweis:</strong> Versteckte SSID - Stelle sicher, dass dein Gerät versteckte Netzwerke unterstützt</p>' : ''}
-                        </div>
-                    `,
-                    width: 450,
-                    showConfirmButton: true,
-                    confirmButtonText: 'Schließen',
-                    confirmButtonColor: '#4CAF50',
-                    background: '#ffffff'
-                });
-            };
+            img.onload = () => showQRCodeDialog(ssid, password, isHidden, img.outerHTML);
             
             img.onerror = () => {
                 Swal.close();
                 showToast('QR-Code konnte nicht generiert werden', 'error');
             };
         }
+        
+        function showQRCodeDialog(ssid, password, isHidden, qrHtml) {
+            const hiddenBadge = isHidden ? '<span style="background: #ff9800; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-left: 10px;">Versteckt</span>' : '<span style="background: #4CAF50; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-left: 10px;">Öffentlich</span>';
+            Swal.fire({
+                title: 'WLAN QR-Code',
+                html: `
+                    <div style="text-align: center;">
+                        <p><strong>SSID:</strong> ${escapeHtml(ssid)} ${hiddenBadge}</p>
+                        <p><strong>Passwort:</strong> ${escapeHtml(password)}</p>
+                        <div style="margin: 20px 0; padding: 20px; background: #f8f9fa; border-radius: 10px;">
+                            ${qrHtml}
+                        </div>
+                        <p style="font-size: 14px; color: #666;">Scanne den QR-Code mit deinem Handy zum automatischen Verbinden</p>
+                        ${isHidden ? '<p style="font-size: 13px; color: #ff9800; margin-top: 10px;"><strong>Hinweis:</strong> Versteckte SSID - Stelle sicher, dass dein Gerät versteckte Netzwerke unterstützt</p>' : ''}
+                    </div>
+                `,
+                width: 450,
+                showConfirmButton: true,
+                confirmButtonText: 'Schließen',
+                confirmButtonColor: '#4CAF50',
+                background: '#ffffff'
+            });
+        }
 
         function restartAP() {
             if (confirm('Access Point wirklich neu starten?')) {
-                fetch('/api/restart_ap', {method: 'POST'})
-                    .then(response => response.json())
+                apiPost('/api/restart_ap')
                     .then(data => {
                         showToast('Access Point wird neu gestartet...', 'success');
-                        setTimeout(() => location.reload(), 3000);
+                        scheduleReload(3000);
                     });
             }
         }
         
         // Initialize band tracking with localStorage
-        const isCurrentlyHidden = {{ 'false' if ap.ssid_visible else 'true' }};
-        const currentBand = '{{ ap.band }}';
+        const isCurrentlyHidden = window.OPENPIROUTER_STATE.apHidden;
+        const currentBand = window.OPENPIROUTER_STATE.apBand;
         
         // Get or initialize the saved visible band (the band to use when SSID is visible)
+        // Read once; changes stay in memory and are written back when idle or when the page goes away
         let savedVisibleBand = localStorage.getItem('ap_visible_band');
+        let visibleBandDirty = false;
+        
+        function persistVisibleBand() {
+            if (visibleBandDirty) return;
+            visibleBandDirty = true;
+            if (window.requestIdleCallback) {
+                requestIdleCallback(flushVisibleBand);
+            } else {
+                setTimeout(flushVisibleBand, 0);
+            }
+        }
+        
+        function flushVisibleBand() {
+            if (!visibleBandDirty) return;
+            visibleBandDirty = false;
+            localStorage.setItem('ap_visible_band', savedVisibleBand);
+        }
+        
+        window.addEventListener('pagehide', flushVisibleBand);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') flushVisibleBand();
+        });
         
         if (!savedVisibleBand) {
             // First time: save current band if visible, or default to 'a' if hidden
             savedVisibleBand = isCurrentlyHidden ? 'a' : currentBand;
-            localStorage.setItem('ap_visible_band', savedVisibleBand);
+            persistVisibleBand();
         }
         
-        console.log('Initialization:', {
+        if (window.__DBG) console.log('Initialization:', {
             isCurrentlyHidden,
             currentBand,
             savedVisibleBand
         });
         
         function updateChannelOptions() {
-            const band = document.getElementById('ap_band').value;
-            const channelSelect = document.getElementById('ap_channel');
+            const dom = getDom();
+            const band = dom.apBand.value;
+            const channelSelect = dom.apChannel;
             
             // Clear existing options
             channelSelect.innerHTML = '';
@@ -1996,43 +2894,41 @@ SYSTEM_JAVASCRIPT = """
         }
         
         function toggleAPVisibility() {
-            const visible = document.getElementById('ap_visibility_toggle').checked;
-            const bandSelect = document.getElementById('ap_band');
+            const dom = getDom();
+            const visible = dom.apVisibility.checked;
+            const bandSelect = dom.apBand;
             const statusText = document.querySelector('.ssid-visibility-status');
             
-            console.log('Toggle triggered:', {
+            if (window.__DBG) console.log('Toggle triggered:', {
                 visible,
                 currentBandValue: bandSelect.value,
-                savedVisibleBand: localStorage.getItem('ap_visible_band')
+                savedVisibleBand
             });
             
             // Update band dropdown based on visibility
             if (!visible) {
                 // Switching to hidden: Save current band if it's not 'g'
                 if (bandSelect.value !== 'g') {
-                    localStorage.setItem('ap_visible_band', bandSelect.value);
-                    console.log('Saved visible band:', bandSelect.value);
+                    savedVisibleBand = bandSelect.value;
+                    persistVisibleBand();
+                    if (window.__DBG) console.log('Saved visible band:', bandSelect.value);
                 }
                 // Set to 2.4GHz
                 bandSelect.value = 'g';
                 if (statusText) statusText.textContent = 'SSID Versteckt';
             } else {
                 // Switching to visible: Restore saved band
-                const restoredBand = localStorage.getItem('ap_visible_band') || 'a';
-                console.log('Restoring band:', restoredBand);
+                const restoredBand = savedVisibleBand || 'a';
+                if (window.__DBG) console.log('Restoring band:', restoredBand);
                 bandSelect.value = restoredBand;
                 if (statusText) statusText.textContent = 'SSID Öffentlich';
             }
             
-            fetch('/api/toggle_ap_visibility', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({visible: visible})
-            }).then(response => response.json())
+            apiPost('/api/toggle_ap_visibility', {visible: visible})
               .then(data => {
                   if (data.success) {
                       showToast(`SSID ${visible ? 'sichtbar' : 'versteckt'} gemacht!`, 'success');
-                      setTimeout(() => location.reload(), 2000);
+                      scheduleReload(2000);
                   } else {
                       showToast('SSID-Sichtbarkeit konnte nicht geändert werden', 'error');
                   }
@@ -2042,11 +2938,7 @@ SYSTEM_JAVASCRIPT = """
         function toggleWlan0Internet() {
             const enabled = document.getElementById('wlan0_internet_toggle').checked;
             
-            fetch('/api/toggle_wlan0_internet', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({enabled: enabled})
-            }).then(response => response.json())
+            apiPost('/api/toggle_wlan0_internet', {enabled: enabled})
               .then(data => {
                   if (data.success) {
                       showToast(`wlan0 Internet-Eingang ${enabled ? 'aktiviert' : 'deaktiviert'}!`, 'success');
@@ -2059,16 +2951,12 @@ SYSTEM_JAVASCRIPT = """
         function updateEth0Mode() {
             const mode = document.getElementById('eth0_mode').value;
             
-            fetch('/api/update_eth0_mode', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({mode: mode})
-            }).then(response => response.json())
+            apiPost('/api/update_eth0_mode', {mode: mode})
               .then(data => {
                   if (data.success) {
                       const modeText = mode === 'receive' ? 'Internet-Empfang' : 'Internet-Ausgabe';
                       showToast(`RJ45 auf ${modeText} umgestellt!`, 'success');
-                      setTimeout(() => location.reload(), 2000);
+                      scheduleReload(2000);
                   } else {
                       showToast('RJ45 Modus-Update fehlgeschlagen', 'error');
                   }
@@ -2079,15 +2967,11 @@ SYSTEM_JAVASCRIPT = """
             const enabled = document.getElementById('pihole_toggle').checked;
             const action = enabled ? 'enable' : 'disable';
             
-            fetch('/api/toggle_pihole', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({action: action})
-            }).then(response => response.json())
+            apiPost('/api/toggle_pihole', {action: action})
               .then(data => {
                   if (data.success) {
                       showToast(`Pi-hole ${enabled ? 'aktiviert' : 'deaktiviert'}!`, 'success');
-                      setTimeout(() => location.reload(), 2000);
+                      scheduleReload(2000);
                   } else {
                       showToast('Pi-hole Toggle fehlgeschlagen', 'error');
                   }
@@ -2106,12 +2990,7 @@ SYSTEM_JAVASCRIPT = """
                 cancelButtonText: 'Abbrechen'
             }).then((result) => {
                 if (result.isConfirmed && result.value) {
-                    fetch('/api/verify_pihole_password', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({password: result.value})
-                    })
-                    .then(response => response.json())
+                    apiPost('/api/verify_pihole_password', {password: result.value})
                     .then(data => {
                         if (data.success) {
                             window.open('http://192.168.50.1/admin', '_blank');
@@ -2135,12 +3014,11 @@ SYSTEM_JAVASCRIPT = """
                 cancelButtonText: 'Abbrechen'
             }).then((result) => {
                 if (result.isConfirmed) {
-                    fetch('/api/cleanup_clients', {method: 'POST'})
-                        .then(response => response.json())
+                    apiPost('/api/cleanup_clients')
                         .then(data => {
                             if (data.success) {
                                 showToast(`${data.removed} alte Clients entfernt!`, 'success');
-                                setTimeout(() => location.reload(), 1500);
+                                scheduleReload(1500);
                             } else {
                                 showToast('Fehler beim Aufräumen', 'error');
                             }
@@ -2162,43 +3040,126 @@ SYSTEM_JAVASCRIPT = """
                 cancelButtonText: 'Abbrechen'
             }).then((result) => {
                 if (result.isConfirmed) {
-                    fetch('/api/restart_service', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({service: service})
-                    }).then(response => response.json())
+                    apiPost('/api/restart_service', {service: service})
                       .then(data => {
                           showToast(`${service} neu gestartet!`, 'success');
-                          setTimeout(() => location.reload(), 2000);
+                          scheduleReload(2000);
                       });
                 }
             });
         }
 
         function openSystemModal() {
-            document.getElementById('systemModal').style.display = 'block';
+            getDom().systemModal.style.display = 'block';
         }
         
         function closeSystemModal() {
-            document.getElementById('systemModal').style.display = 'none';
+            getDom().systemModal.style.display = 'none';
         }
         
         // Theme Manager Functions
+        // Aborted when the modal closes so a late theme list is never rendered
+        let themeModalRequests = null;
+        
         function openThemeModal() {
-            document.getElementById('themeModal').style.display = 'flex';
+            getDom().themeModal.style.display = 'flex';
+            themeModalRequests = new AbortController();
             loadThemes();
         }
         
         function closeThemeModal() {
-            document.getElementById('themeModal').style.display = 'none';
+            getDom().themeModal.style.display = 'none';
+            if (themeModalRequests) {
+                themeModalRequests.abort();
+                themeModalRequests = null;
+            }
+        }
+        
+        // One parsed theme card, cloned per theme; themes bring their own HTML, so it lives here
+        let themeCardTemplate = null;
+        
+        function getThemeCardTemplate() {
+            if (!themeCardTemplate) {
+                themeCardTemplate = document.createElement('template');
+                themeCardTemplate.innerHTML = `
+                    <div class="theme-card">
+                        <div class="theme-badge">Aktiv</div>
+                        <div class="theme-card-image">
+                            <img loading="lazy" decoding="async" style="width:100%;height:100%;object-fit:cover;">
+                            <i class="fas fa-palette"></i>
+                        </div>
+                        <div class="theme-card-body">
+                            <div class="theme-card-title"><span class="theme-card-name"></span> <i class="fas fa-star" style="color:#f59e0b;"></i></div>
+                            <div class="theme-card-meta">
+                                <span class="theme-card-description"></span><br>
+                                <small></small>
+                            </div>
+                            <div class="theme-card-actions">
+                                <button class="btn btn-danger btn-sm">
+                                    <i class="fas fa-trash"></i>
+                                </button>
+                            </div>
+                        </div>
+                    </div>`;
+            }
+            return themeCardTemplate;
+        }
+        
+        function createThemeCard(template, theme) {
+            const card = template.content.firstElementChild.cloneNode(true);
+            const isDefault = theme.name === 'default';
+            
+            card.classList.toggle('active', !!theme.is_active);
+            card.addEventListener('click', () => activateTheme(theme.name));
+            if (!theme.is_active) {
+                card.querySelector('.theme-badge').remove();
+            }
+            
+            const image = card.querySelector('.theme-card-image img');
+            if (theme.has_screenshot) {
+                image.src = `/api/themes/screenshot/${encodeURIComponent(theme.name)}`;
+                card.querySelector('.theme-card-image i').remove();
+            } else {
+                image.remove();
+            }
+            
+            card.querySelector('.theme-card-name').textContent = theme.display_name;
+            if (!isDefault) {
+                card.querySelector('.theme-card-title i').remove();
+            }
+            card.querySelector('.theme-card-description').textContent = theme.description;
+            card.querySelector('.theme-card-meta small').textContent = `Version ${theme.version} • ${theme.author}`;
+            
+            const actions = card.querySelector('.theme-card-actions');
+            if (isDefault) {
+                actions.remove();
+            } else {
+                actions.addEventListener('click', event => event.stopPropagation());
+                actions.querySelector('button').addEventListener('click', () => deleteTheme(theme.name));
+            }
+            return card;
         }
         
+        // Last theme list and its ETag; reopening the modal revalidates instead of downloading again
+        let themesEtag = null;
+        let themesData = null;
+        
         async function loadThemes() {
+            const signal = themeModalRequests ? themeModalRequests.signal : undefined;
             try {
-                const response = await fetch('/api/themes/list');
-                const themes = await response.json();
+                const headers = themesEtag ? { 'If-None-Match': themesEtag } : {};
+                const response = await fetch('/api/themes/list', { signal, headers });
+                let themes = themesData;
+                if (response.status !== 304 || !themes) {
+                    themes = await response.json();
+                    themesEtag = response.headers.get('ETag');
+                    themesData = themes;
+                }
+                if (signal && signal.aborted) {
+                    return;
+                }
                 
-                const grid = document.getElementById('themesGrid');
+                const grid = getDom().themesGrid;
                 if (themes.length === 0) {
                     grid.innerHTML = `
                         <div style="text-align: center; padding: 40px; color: #999; grid-column: 1/-1;">
@@ -2209,35 +3170,16 @@ SYSTEM_JAVASCRIPT = """
                     return;
                 }
                 
-                grid.innerHTML = themes.map(theme => `
-                    <div class="theme-card ${theme.is_active ? 'active' : ''}" onclick="activateTheme('${theme.name}')">
-                        ${theme.is_active ? '<div class="theme-badge">Aktiv</div>' : ''}
-                        <div class="theme-card-image">
-                            ${theme.has_screenshot ? 
-                                `<img src="/api/themes/screenshot/${theme.name}" style="width:100%;height:100%;object-fit:cover;">` : 
-                                `<i class="fas fa-palette"></i>`
-                            }
-                        </div>
-                        <div class="theme-card-body">
-                            <div class="theme-card-title">
-                                ${theme.display_name}
-                                ${theme.name === 'default' ? '<i class="fas fa-star" style="color:#f59e0b;"></i>' : ''}
-                            </div>
-                            <div class="theme-card-meta">
-                                ${theme.description}<br>
-                                <small>Version ${theme.version} • ${theme.author}</small>
-                            </div>
-                            ${theme.name !== 'default' ? `
-                            <div class="theme-card-actions" onclick="event.stopPropagation();">
-                                <button class="btn btn-danger btn-sm" onclick="deleteTheme('${theme.name}')">
-                                    <i class="fas fa-trash"></i>
-                                </button>
-                            </div>
-                            ` : ''}
-                        </div>
-                    </div>
-                `).join('');
+                const template = getThemeCardTemplate();
+                const fragment = document.createDocumentFragment();
+                for (const theme of themes) {
+                    fragment.appendChild(createThemeCard(template, theme));
+                }
+                grid.replaceChildren(fragment);
             } catch (error) {
+                if (error.name === 'AbortError') {
+                    return;
+                }
                 console.error('Error loading themes:', error);
                 showToast('Fehler beim Laden der Themes', 'error');
             }
@@ -2245,7 +3187,7 @@ SYSTEM_JAVASCRIPT = """
         
         async function activateTheme(themeName) {
             // Hide theme modal IMMEDIATELY (synchronously)
-            const themeModal = document.getElementById('themeModal');
+            const themeModal = getDom().themeModal;
             themeModal.style.visibility = 'hidden';
             themeModal.style.opacity = '0';
             themeModal.style.pointerEvents = 'none';
@@ -2268,17 +3210,11 @@ SYSTEM_JAVASCRIPT = """
                     return;
                 }
                 
-                const response = await fetch('/api/themes/activate', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({theme_name: themeName})
-                });
-                
-                const data = await response.json();
+                const data = await apiPost('/api/themes/activate', {theme_name: themeName});
                 
                 if (data.success) {
                     showToast('Theme aktiviert! Lade neu...', 'success');
-                    setTimeout(() => location.reload(), 1500);
+                    scheduleReload(1500);
                 } else {
                     showToast(data.error || 'Fehler beim Aktivieren', 'error');
                     themeModal.style.visibility = 'visible';
@@ -2288,7 +3224,7 @@ SYSTEM_JAVASCRIPT = """
             } catch (error) {
                 console.error('Error activating theme:', error);
                 showToast('Fehler beim Aktivieren des Themes', 'error');
-                const themeModal = document.getElementById('themeModal');
+                const themeModal = getDom().themeModal;
                 themeModal.style.visibility = 'visible';
                 themeModal.style.opacity = '1';
                 themeModal.style.pointerEvents = 'auto';
@@ -2331,13 +3267,7 @@ SYSTEM_JAVASCRIPT = """
             try {
                 showToast('Lade Theme hoch...', 'info');
                 
-                const formData = new FormData();
-                formData.append('theme', file);
-                
-                const response = await fetch('/api/themes/upload', {
-                    method: 'POST',
-                    body: formData
-                });
+                const response = await fetch('/api/themes/upload', uploadOptions(file, 'theme'));
                 
                 const data = await response.json();
                 
@@ -2357,7 +3287,7 @@ SYSTEM_JAVASCRIPT = """
         
         async function deleteTheme(themeName) {
             // Hide theme modal IMMEDIATELY (synchronously)
-            const themeModal = document.getElementById('themeModal');
+            const themeModal = getDom().themeModal;
             themeModal.style.visibility = 'hidden';
             themeModal.style.opacity = '0';
             themeModal.style.pointerEvents = 'none';
@@ -2381,13 +3311,7 @@ SYSTEM_JAVASCRIPT = """
                     return;
                 }
                 
-                const response = await fetch('/api/themes/delete', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({theme_name: themeName})
-                });
-                
-                const data = await response.json();
+                const data = await apiPost('/api/themes/delete', {theme_name: themeName});
                 
                 if (data.success) {
                     showToast('Theme gelöscht', 'success');
@@ -2404,7 +3328,7 @@ SYSTEM_JAVASCRIPT = """
             } catch (error) {
                 console.error('Error deleting theme:', error);
                 showToast('Fehler beim Löschen des Themes', 'error');
-                const themeModal = document.getElementById('themeModal');
+                const themeModal = getDom().themeModal;
                 themeModal.style.visibility = 'visible';
                 themeModal.style.opacity = '1';
                 themeModal.style.pointerEvents = 'auto';
@@ -2413,8 +3337,8 @@ SYSTEM_JAVASCRIPT = """
         
         // Close modal when clicking outside
         window.onclick = function(event) {
-            const systemModal = document.getElementById('systemModal');
-            const themeModal = document.getElementById('themeModal');
+            const systemModal = getDom().systemModal;
+            const themeModal = getDom().themeModal;
             if (event.target == systemModal) {
                 closeSystemModal();
             }
@@ -2436,8 +3360,7 @@ SYSTEM_JAVASCRIPT = """
                 cancelButtonText: 'Abbrechen'
             }).then((result) => {
                 if (result.isConfirmed) {
-                    fetch('/api/reboot', {method: 'POST'})
-                        .then(response => response.json())
+                    apiPost('/api/reboot')
                         .then(data => {
                             showToast('System wird neu gestartet...', 'success');
                         });
@@ -2460,17 +3383,12 @@ SYSTEM_JAVASCRIPT = """
         function importConfig() {
             const file = document.getElementById('config_file').files[0];
             if (file) {
-                const formData = new FormData();
-                formData.append('file', file);
-                
-                fetch('/api/import_config', {
-                    method: 'POST',
-                    body: formData
-                }).then(response => response.json())
+                fetch('/api/import_config', uploadOptions(file, 'file'))
+                  .then(response => response.json())
                   .then(data => {
                       if (data.success) {
                           showToast('Konfiguration importiert!', 'success');
-                          setTimeout(() => location.reload(), 2000);
+                          scheduleReload(2000);
                       } else {
                           showToast('Import fehlgeschlagen', 'error');
                       }
@@ -2478,7 +3396,76 @@ SYSTEM_JAVASCRIPT = """
             }
         }
 
+        // Uploads go out as the raw file body; FormData only where Blob bodies are missing
+        function uploadOptions(file, field) {
+            if (typeof Blob !== 'undefined' && file instanceof Blob) {
+                return {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/octet-stream', 'X-Filename': encodeURIComponent(file.name)},
+                    body: file
+                };
+            }
+            const formData = new FormData();
+            formData.append(field, file);
+            return {method: 'POST', body: formData};
+        }
+
+        // POST helper for the action endpoints, resolves with the parsed JSON response
+        const JSON_HEADERS = {'Content-Type': 'application/json'};
+        function apiPost(url, body) {
+            const options = {method: 'POST'};
+            if (body !== undefined) {
+                options.headers = JSON_HEADERS;
+                options.body = JSON.stringify(body);
+            }
+            return fetch(url, options).then(response => response.json());
+        }
+        
+        // SSIDs, passwords and server messages are inserted into HTML templates escaped
+        const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+        }
+        
+        function escapeWifiField(value) {
+            return String(value).replace(/[\\\\;,:"]/g, '\\\\$&');
+        }
+        
+        // One pending reload for all actions: a later action postpones it instead of racing it
+        let pendingReload = null;
+        function scheduleReload(delay = 2000) {
+            clearTimeout(pendingReload);
+            pendingReload = setTimeout(() => location.reload(), delay);
+        }
+        
+        // Toasts raised in the same frame are merged into one, a burst of toggles shows a single summary
+        const toastQueue = [];
+        let toastFlushScheduled = false;
+        
         function showToast(message, type = 'info') {
+            toastQueue.push({ message, type });
+            if (!toastFlushScheduled) {
+                toastFlushScheduled = true;
+                requestAnimationFrame(flushToasts);
+            }
+        }
+        
+        function flushToasts() {
+            toastFlushScheduled = false;
+            const toasts = toastQueue.splice(0);
+            if (toasts.length === 1) {
+                renderToast(toasts[0].message, toasts[0].type);
+                return;
+            }
+            const errors = toasts.filter(toast => toast.type === 'error');
+            if (errors.length) {
+                renderToast(errors.length === 1 ? errors[0].message : `${errors.length} Aktionen fehlgeschlagen`, 'error');
+            } else if (toasts.length) {
+                renderToast(`${toasts.length} Aktionen ausgeführt`, 'success');
+            }
+        }
+        
+        function renderToast(message, type) {
             const color = type === 'success' ? '#4CAF50' : type === 'error' ? '#f44336' : '#2196F3';
             
             Swal.fire({
@@ -2504,8 +3491,8 @@ SYSTEM_JAVASCRIPT = """
                 const response = await fetch('/api/get_public_ip');
                 const data = await response.json();
                 
-                const ipElement = document.getElementById('public-ip');
-                const statusElement = document.getElementById('public-ip-status');
+                const ipElement = getDom().publicIp;
+                const statusElement = getDom().publicIpStatus;
                 
                 if (data.success && data.ip) {
                     ipElement.textContent = data.ip;
@@ -2518,12 +3505,12 @@ SYSTEM_JAVASCRIPT = """
                 }
             } catch (error) {
                 console.error('Error loading public IP:', error);
-                document.getElementById('public-ip').textContent = 'Fehler';
+                getDom().publicIp.textContent = 'Fehler';
             }
         }
         
         function copyPublicIP() {
-            const ipText = document.getElementById('public-ip').textContent;
+            const ipText = getDom().publicIp.textContent;
             
             if (ipText === 'Lade...' || ipText === 'Nicht verfügbar' || ipText === 'Fehler') {
                 showToast('Keine IP zum Kopieren verfügbar', 'warning');
@@ -2558,7 +3545,7 @@ SYSTEM_JAVASCRIPT = """
         // Load internet speed
         
         // Initialize dashboard with WebSocket
-        console.log('🚀 OpenPiRouter Dashboard initialized');
+        if (window.__DBG) console.log('🚀 OpenPiRouter Dashboard initialized');
         
         // Load Public IP once on startup
         loadPublicIP();
@@ -2568,72 +3555,208 @@ SYSTEM_JAVASCRIPT = """
         
         // Legacy function kept for compatibility (not used)
         function loadInitialData() {
-            // Load WiFi status
-            fetch('/api/get_current_wifi')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success && data.connected) {
-                        document.getElementById('current_ssid').value = data.ssid;
-                        document.getElementById('signal-value').textContent = data.signal + '%';
-                        document.getElementById('current-wifi-section').style.display = 'block';
-                        
-                        const quality = getSignalQuality(data.signal);
-                        const statusElement = document.getElementById('signal-status-text');
-                        statusElement.textContent = quality.text;
-                        statusElement.className = quality.class;
-                    } else {
-                        document.getElementById('current-wifi-section').style.display = 'none';
-                        const statusElement = document.getElementById('signal-status-text');
-                        statusElement.textContent = 'Keine WLAN-Verbindung';
-                        statusElement.className = 'signal-none';
-                    }
-                })
-                .catch(error => console.error('Error loading WiFi data:', error));
-            
-            // Load system status
-            fetch('/api/status')
+            // All panels in one request
+            fetch('/api/bootstrap')
                 .then(response => response.json())
                 .then(data => {
-                    updateSystemStatus(data);
+                    updateWiFiStatus(data.wifi);
+                    updateSystemStatus(data.status);
+                    updateSystemStats(data.stats);
+                    updateSpeedData(data.speed);
                 })
-                .catch(error => console.error('Error loading status:', error));
-            
-            // Load system stats
-            fetch('/api/stats')
-                .then(response => response.json())
-                .then(data => {
-                    updateSystemStats(data);
-                })
-                .catch(error => console.error('Error loading stats:', error));
-            
-            // Load speed data
-            fetch('/api/get_internet_speed')
-                .then(response => response.json())
-                .then(data => {
-                    updateSpeedData(data);
-                })
-                .catch(error => console.error('Error loading speed data:', error));
+                .catch(error => console.error('Error loading dashboard data:', error));
         }
-    </script>
 """
 
+# Inline CSS is swapped for a content-hashed stylesheet link so browsers can cache it
+DASHBOARD_CSS_BYTES = DASHBOARD_CSS.encode('utf-8')
+DASHBOARD_CSS_HASH = hashlib.sha256(DASHBOARD_CSS_BYTES).hexdigest()[:16]
+DASHBOARD_CSS_URL = f'/assets/dashboard-{DASHBOARD_CSS_HASH}.css'
+DASHBOARD_CSS_SRI = 'sha384-' + base64.b64encode(hashlib.sha384(DASHBOARD_CSS_BYTES).digest()).decode()
+DASHBOARD_CSS_BLOCK = "    <style>\n" + DASHBOARD_CSS + "    </style>\n"
+DASHBOARD_CSS_LINK = f'    <link rel="stylesheet" href="{DASHBOARD_CSS_URL}" integrity="{DASHBOARD_CSS_SRI}">\n'
+
+# Same for the system JavaScript; only the per-page state is rendered inline
+DASHBOARD_JS_BYTES = DASHBOARD_JS.encode('utf-8')
+DASHBOARD_JS_HASH = hashlib.sha256(DASHBOARD_JS_BYTES).hexdigest()[:16]
+DASHBOARD_JS_URL = f'/assets/dashboard-{DASHBOARD_JS_HASH}.js'
+DASHBOARD_JS_SRI = 'sha384-' + base64.b64encode(hashlib.sha384(DASHBOARD_JS_BYTES).digest()).decode()
+SYSTEM_JAVASCRIPT = (
+    "    <script>window.OPENPIROUTER_STATE = {"
+    "apHidden: {{ 'false' if ap.ssid_visible else 'true' }}, "
+    "apBand: {{ ap.band | tojson }}};</script>\n"
+    f'    <script src="{DASHBOARD_JS_URL}" integrity="{DASHBOARD_JS_SRI}" defer></script>\n'
+)
+
 # Combined template for backward compatibility
 DASHBOARD_TEMPLATE = THEME_BASE_HTML.replace(
     "    <!-- SYSTEM_JAVASCRIPT_PLACEHOLDER -->",
     SYSTEM_JAVASCRIPT
-)
+).replace(DASHBOARD_CSS_BLOCK, DASHBOARD_CSS_LINK)
+
+
+def load_template_source(name):
+    """Resolve template names for Jinja so templates are compiled once and cached"""
+    if name == 'dashboard.html':
+        return DASHBOARD_TEMPLATE, None, lambda: True
+    
+    if name == 'login.html':
+        return LOGIN_TEMPLATE, None, lambda: True
+    
+    if name.startswith('themes/') and theme_manager:
+        theme_name = name[len('themes/'):]
+        template_file = os.path.join(theme_manager.THEMES_DIR, theme_name, 'template.html')
+        try:
+            mtime = os.path.getmtime(template_file)
+        except OSError:
+            return None
+        # Get theme HTML and inject system JavaScript
+        source = theme_manager.get_theme_template(theme_name, SYSTEM_JAVASCRIPT)
+        if source is None:
+            return None
+        # Themes that keep the stock CSS get the cached stylesheet too
+        source = source.replace(DASHBOARD_CSS_BLOCK, DASHBOARD_CSS_LINK)
+        
+        def uptodate():
+            try:
+                return os.path.getmtime(template_file) == mtime
+            except OSError:
+                return False
+        
+        return source, template_file, uptodate
+    
+    return None
+
+app.jinja_loader = FunctionLoader(load_template_source)
+
+# Compiled template bytecode survives restarts, so a cold start skips parsing
+JINJA_CACHE_DIR = '/var/cache/openpirouter/jinja'
+
+
+def asset_response(content, mimetype, etag):
+    """Serve an in-memory asset with long-lived caching and ETag revalidation"""
+    response = app.response_class(content, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+
+def conditional_json(payload):
+    """JSON response tagged with a hash of its body, answered with 304 when the client already has it"""
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.no_cache = True
+    response.cache_control.must_revalidate = True
+    return response.make_conditional(request)
 
 
+# Last rendered page per template name: (template, context, html)
+rendered_pages = {}
+
+def render_cached(template, **context):
+    """Render a template, reusing the previous HTML while template and context are unchanged"""
+    template = app.jinja_env.get_or_select_template(template)
+    cached = rendered_pages.get(template.name)
+    if cached and cached[0] is template and cached[1] == context:
+        return cached[2]
+    html = render_template(template, **context)
+    rendered_pages[template.name] = (template, context, html)
+    return html
+
+
+# Commands with pipes, redirects, chaining or variables still go through /bin/sh
+SHELL_SYNTAX_RE = re.compile(r'[|&;<>$`]')
+
 def sh(cmd, timeout=5):
-    """Execute shell command with timeout"""
+    """Execute a command with timeout, spawning a shell only for shell syntax"""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, shell=True)
+        if SHELL_SYNTAX_RE.search(cmd):
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, shell=True)
+        else:
+            result = run_cmd(shlex.split(cmd), timeout=timeout, text=True)
         return result.stdout.strip()
     except subprocess.TimeoutExpired:
         return ""
     except Exception:
         return ""
 
+@functools.lru_cache(maxsize=32)
+def _sh_bucket(cmd, ttl, bucket):
+    return sh(cmd)
+
+def sh_cached(cmd, ttl=10):
+    """Run a read-only command, sharing its output with other callers for ttl seconds"""
+    return _sh_bucket(cmd, ttl, int(time.monotonic() // ttl))
+
+@functools.lru_cache(maxsize=None)
+def which(program):
+    """Resolve a program to its absolute path once (skips the PATH search on every run)"""
+    return shutil.which(program) or program
+
+def run_cmd(args, timeout=5, text=False, input=None):
+    """Run a command without a shell, capturing its output (input is fed to stdin)"""
+    # Python's descriptors are non-inheritable, so close_fds=False is safe and lets
+    # subprocess use posix_spawn instead of fork + closing every descriptor
+    return subprocess.run([which(args[0])] + list(args[1:]), capture_output=True, text=text,
+                          timeout=timeout, close_fds=False, input=input,
+                          stdin=subprocess.DEVNULL if input is None else None)
+
+# Independent probes of one status/stats/AP snapshot run side by side (green threads under eventlet)
+probe_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='probe')
+
+def run_probes(probes):
+    """Run independent probes concurrently; failed probes are left out of the result"""
+    futures = {probe_pool.submit(probe): key for key, probe in probes.items()}
+    results = {}
+    for future in concurrent.futures.as_completed(futures):
+        try:
+            results[futures[future]] = future.result()
+        except Exception:
+            pass
+    return results
+
+def wlan0_connected():
+    """Check if wlan0 is connected"""
+    # First check active connections (more reliable)
+    result = run_cmd(["nmcli", "-t", "-f", "name,device,state", "con", "show", "--active"])
+    if result.returncode == 0:
+        for match in WLAN0_CONNECTION_RE.finditer(result.stdout):
+            if match.group(2) in WLAN0_CONNECTED_STATES:
+                return True
+    
+    # Fallback: check device status
+    result = run_cmd(["nmcli", "-t", "-f", "device,state", "dev", "status"], timeout=3)
+    if result.returncode == 0:
+        for line in result.stdout.splitlines():
+            device, _, state = line.partition(b':')
+            if device == b'wlan0' and state in WLAN0_DEVICE_CONNECTED_STATES:
+                return True
+    return False
+
+# Status and WAN panels share one reachability result for this many seconds
+INTERNET_CHECK_TTL = 5
+
+@functools.lru_cache(maxsize=2)
+def _internet_check(bucket):
+    try:
+        # A TCP connect to Cloudflare DNS needs no raw socket and no ping process
+        socket.create_connection(('1.1.1.1', 53), timeout=2).close()
+        return True
+    except OSError:
+        return False
+
+def internet_reachable():
+    """Check internet connectivity (shared by all callers for INTERNET_CHECK_TTL seconds)"""
+    return _internet_check(int(time.monotonic() // INTERNET_CHECK_TTL))
+
+def services_active(*services):
+    """Check which systemd services are active as {service: bool}, with one systemctl call"""
+    # One state line per unit, in the order given (the exit code only tells if all are active)
+    states = run_cmd(["systemctl", "is-active", *services]).stdout.decode().split()
+    return {service: state == "active" for service, state in zip(services, states)}
+
 @cached_function
 def get_system_status():
     """Get system status information"""
@@ -2642,58 +3765,114 @@ def get_system_status():
         'internet': False,
         'ap': False,
         'pihole': False,
-        'uptime': sh("uptime -p") or "Unbekannt"
+        'uptime': "Unbekannt"
     }
     
-    # Check WiFi connection - check if wlan0 is connected
-    try:
-        # First check active connections (more reliable)
-        result = subprocess.run(["nmcli", "-t", "-f", "name,device,state", "con", "show", "--active"], 
-                              capture_output=True, timeout=5)
-        if result.returncode == 0:
-            for line in result.stdout.decode().splitlines():
-                if "wlan0" in line and ("activated" in line or "connected" in line):
-                    status['wifi'] = True
-                    break
-        
-        # Fallback: check device status
-        if not status['wifi']:
-            result = subprocess.run(["nmcli", "-t", "-f", "device,state", "dev", "status"], 
-                                  capture_output=True, timeout=3)
-            if result.returncode == 0:
-                for line in result.stdout.decode().splitlines():
-                    if line.startswith("wlan0:") and ("connected" in line or "activated" in line):
-                        status['wifi'] = True
-                        break
-    except:
-        pass
-    
-    # Check internet
-    try:
-        result = subprocess.run(["ping", "-c", "1", "-W", "2", "1.1.1.1"], 
-                              capture_output=True, timeout=5)
-        status['internet'] = result.returncode == 0
-    except:
-        pass
-    
-    # Check Access Point
-    try:
-        result = subprocess.run(["systemctl", "is-active", "hostapd"], 
-                              capture_output=True, timeout=5)
-        status['ap'] = result.stdout.decode().strip() == "active"
-    except:
-        pass
-    
-    # Check Pi-hole
-    try:
-        result = subprocess.run(["systemctl", "is-active", "pihole-FTL"], 
-                              capture_output=True, timeout=5)
-        status['pihole'] = result.stdout.decode().strip() == "active"
-    except:
-        pass
+    probes = run_probes({
+        'wifi': wlan0_connected,
+        'internet': internet_reachable,
+        'services': functools.partial(services_active, "hostapd", "pihole-FTL"),
+        'uptime': lambda: sh("uptime -p") or "Unbekannt",
+    })
+    services = probes.pop('services', {})
+    status.update(probes)
+    status['ap'] = services.get("hostapd", False)
+    status['pihole'] = services.get("pihole-FTL", False)
     
     return status
 
+# Thermal zones psutil reports for the Raspberry Pi SoC
+PI_THERMAL_SENSORS = ('cpu_thermal', 'cpu-thermal', 'soc_thermal')
+
+VCGENCMD_TEMP_RE = re.compile(r'temp=([\d.]+)')
+
+def read_temperature():
+    """Read the SoC temperature (Raspberry Pi), from sysfs if possible, else via vcgencmd"""
+    sensors = psutil.sensors_temperatures() if hasattr(psutil, 'sensors_temperatures') else {}
+    for name in PI_THERMAL_SENSORS:
+        if sensors.get(name):
+            return round(sensors[name][0].current)
+    
+    temp_match = VCGENCMD_TEMP_RE.search(sh("vcgencmd measure_temp"))
+    return round(float(temp_match.group(1))) if temp_match else 0
+
+# Cached nl80211 handle (IW socket, wlan1 ifindex), opened on first use
+_nl80211 = None
+_nl80211_lock = threading.Lock()  # Guards creating, using and closing the shared socket
+
+def read_stations_netlink():
+    """Read the AP stations as {mac: signal} from nl80211 (call with _nl80211_lock held)"""
+    global _nl80211
+    if _nl80211 is None:
+        with IPRoute() as ipr:
+            index = ipr.link_lookup(ifname='wlan1')[0]
+        _nl80211 = (IW(), index)
+    iw, index = _nl80211
+    stations = {}
+    for msg in iw.get_stations(index):
+        info = msg.get_attr('NL80211_ATTR_STA_INFO')
+        signal = info.get_attr('NL80211_STA_INFO_SIGNAL') if info else None
+        stations[msg.get_attr('NL80211_ATTR_MAC').lower()] = f"{signal} dBm" if signal is not None else ''
+    return stations
+
+IW_SIGNAL_RE = re.compile(r'^\s*signal:\s*(.*?)\s*$', re.M)
+
+def read_stations_iw():
+    """Read the AP stations as {mac: signal} from 'iw station dump'"""
+    stations = {}
+    # One block per station, each starting with 'Station <mac> (on wlan1)'
+    for block in ('\n' + sh("iw dev wlan1 station dump")).split('\nStation ')[1:]:
+        mac, _, details = block.partition(' ')
+        signal = IW_SIGNAL_RE.search(details)
+        stations[mac.lower()] = signal.group(1) if signal else ''
+    return stations
+
+@functools.lru_cache(maxsize=2)
+def _stations_bucket(bucket):
+    global _nl80211
+    if IW:
+        with _nl80211_lock:
+            try:
+                return read_stations_netlink()
+            except Exception:
+                # Drop the (possibly stale) handle and fall back to iw
+                if _nl80211:
+                    _nl80211[0].close()
+                _nl80211 = None
+    return read_stations_iw()
+
+def read_stations():
+    """Get the clients associated with the AP as {mac (lowercase): signal}, shared for two seconds"""
+    return _stations_bucket(int(time.monotonic() // 2))
+
+def count_ap_stations():
+    """Count the clients associated with the access point"""
+    return len(read_stations())
+
+# Read-only connection to the Pi-hole FTL database, opened on first use and kept
+# (sqlite3 reuses the prepared counters statement from its statement cache)
+PIHOLE_DB = '/etc/pihole/pihole-FTL.db'
+_pihole_db = None
+_pihole_db_lock = threading.Lock()
+
+def get_pihole_counters():
+    """Get (total, blocked) query counts from the Pi-hole FTL database counters table"""
+    global _pihole_db
+    with _pihole_db_lock:
+        if _pihole_db is None:
+            if not os.path.exists(PIHOLE_DB):
+                return 0, 0
+            _pihole_db = sqlite3.connect(f'file:{PIHOLE_DB}?mode=ro', uri=True, check_same_thread=False)
+        try:
+            # ID 0 = total queries, ID 1 = blocked
+            counters = dict(_pihole_db.execute("SELECT id, value FROM counters WHERE id IN (0, 1)").fetchall())
+        except sqlite3.Error:
+            # FTL may have replaced the database file, reopen on the next call
+            _pihole_db.close()
+            _pihole_db = None
+            raise
+    return counters.get(0, 0), counters.get(1, 0)
+
 @cached_function
 def get_system_stats():
     """Get system statistics"""
@@ -2705,27 +3884,18 @@ def get_system_stats():
         'disk_used': 0,
         'disk_free': 0,
         'disk_total': 0,
+        'disk_percent': 0,
         'pihole_queries': 0,
         'pihole_blocked': 0,
         'pihole_blocked_percent': 0
     }
     
     try:
-        # CPU usage (faster, no interval)
-        stats['cpu'] = round(psutil.cpu_percent())
-        
-        # Memory usage
-        memory = psutil.virtual_memory()
-        stats['memory'] = round(memory.percent)
-        
-        # Temperature (Raspberry Pi)
-        try:
-            temp_str = sh("vcgencmd measure_temp")
-            temp_match = re.search(r'temp=([\d.]+)', temp_str)
-            if temp_match:
-                stats['temperature'] = round(float(temp_match.group(1)))
-        except:
-            pass
+        # CPU usage (last background sample)
+        stats['cpu'] = round(cpu_percent)
+        
+        # Memory usage
+        stats['memory'] = round(get_memory_percent())
         
         # Disk usage (SD card)
         try:
@@ -2733,65 +3903,53 @@ def get_system_stats():
             stats['disk_total'] = round(disk.total / (1024**3), 1)  # GB
             stats['disk_used'] = round(disk.used / (1024**3), 1)    # GB
             stats['disk_free'] = round(disk.free / (1024**3), 1)    # GB
-        except:
-            stats['disk_total'] = 0
-            stats['disk_used'] = 0
-            stats['disk_free'] = 0
-        
-        # Connected clients
-        try:
-            stations = sh("iw dev wlan1 station dump")
-            stats['clients'] = len([line for line in stations.splitlines() 
-                                  if line.startswith("Station ")])
-        except:
+            stats['disk_percent'] = round(disk.used * 100 / disk.total) if disk.total else 0
+        except Exception:
             pass
         
-        # Pi-hole statistics (using FTL database counters)
-        try:
-            # Get Pi-hole stats from FTL database counters table
-            import sqlite3
-            db_path = '/etc/pihole/pihole-FTL.db'
-            if os.path.exists(db_path):
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                # Get stats from counters table (ID 0 = total queries, ID 1 = blocked)
-                cursor.execute("SELECT id, value FROM counters WHERE id IN (0, 1)")
-                results = cursor.fetchall()
-                
-                total_queries = 0
-                blocked_queries = 0
-                
-                for row in results:
-                    if row[0] == 0:  # Total queries
-                        total_queries = row[1]
-                    elif row[0] == 1:  # Blocked queries
-                        blocked_queries = row[1]
-                
-                stats['pihole_queries'] = total_queries
-                stats['pihole_blocked'] = blocked_queries
-                if total_queries > 0:
-                    stats['pihole_blocked_percent'] = round((blocked_queries / total_queries) * 100, 1)
-                else:
-                    stats['pihole_blocked_percent'] = 0
-                
-                conn.close()
-            else:
-                # Fallback: set default values
-                stats['pihole_queries'] = 0
-                stats['pihole_blocked'] = 0
-                stats['pihole_blocked_percent'] = 0
-        except:
-            # Fallback: set default values
-            stats['pihole_queries'] = 0
-            stats['pihole_blocked'] = 0
-            stats['pihole_blocked_percent'] = 0
+        # Temperature, connected clients and Pi-hole statistics wait on other processes
+        probes = run_probes({
+            'temperature': read_temperature,
+            'clients': count_ap_stations,
+            'pihole': get_pihole_counters,
+        })
+        stats['temperature'] = probes.get('temperature', 0)
+        stats['clients'] = probes.get('clients', 0)
+        
+        total_queries, blocked_queries = probes.get('pihole', (0, 0))
+        stats['pihole_queries'] = total_queries
+        stats['pihole_blocked'] = blocked_queries
+        if total_queries > 0:
+            stats['pihole_blocked_percent'] = round((blocked_queries / total_queries) * 100, 1)
             
     except Exception:
         pass
     
     return stats
 
+PI_CONFIG_DIR = '/etc/pi-config'
+
+# Contents of the /etc/pi-config state files; they only change through the
+# handlers below, which update this dict via _write_cfg
+_pi_cfg = {}
+
+def _read_cfg(name, default=None):
+    """Stripped contents of /etc/pi-config/<name>, read once and cached"""
+    if name not in _pi_cfg:
+        try:
+            with open(os.path.join(PI_CONFIG_DIR, name), 'r') as f:
+                _pi_cfg[name] = f.read().strip()
+        except OSError:
+            return default
+    return _pi_cfg[name]
+
+def _write_cfg(name, value):
+    """Write /etc/pi-config/<name> and keep the cached copy in sync"""
+    os.makedirs(PI_CONFIG_DIR, exist_ok=True)
+    with open(os.path.join(PI_CONFIG_DIR, name), 'w') as f:
+        f.write(value)
+    _pi_cfg[name] = value.strip()
+
 def get_internet_config():
     """Get current internet configuration with smart LAN/WLAN detection"""
     config = {
@@ -2801,14 +3959,12 @@ def get_internet_config():
     
     try:
         # Read wlan0 internet config
-        if os.path.exists('/etc/pi-config/wlan0-internet-enabled'):
-            with open('/etc/pi-config/wlan0-internet-enabled', 'r') as f:
-                config['wlan0_internet_enabled'] = f.read().strip() == '1'
+        wlan0_enabled = _read_cfg('wlan0-internet-enabled')
+        if wlan0_enabled is not None:
+            config['wlan0_internet_enabled'] = wlan0_enabled == '1'
         
         # Read eth0 mode config  
-        if os.path.exists('/etc/pi-config/eth0-mode'):
-            with open('/etc/pi-config/eth0-mode', 'r') as f:
-                config['eth0_mode'] = f.read().strip()
+        config['eth0_mode'] = _read_cfg('eth0-mode', config['eth0_mode'])
         
         # Auto-detect eth0 mode based on current network state
         if config['eth0_mode'] == 'auto':
@@ -2828,6 +3984,10 @@ def get_internet_config():
     
     return config
 
+# 'iw dev wlan0 link' lines reported in the WAN info
+IW_LINK_RE = re.compile(r'^\s*(signal|tx bitrate):\s*(.*?)\s*$', re.M)
+IW_LINK_FIELDS = {'signal': 'signal', 'tx bitrate': 'bitrate'}
+
 def get_wan_info():
     """Get WAN connection information"""
     info = {
@@ -2847,30 +4007,117 @@ def get_wan_info():
                 break
         
         # Get signal strength and bitrate
-        link_info = sh("iw dev wlan0 link")
-        for line in link_info.splitlines():
-            if "signal:" in line:
-                info['signal'] = line.split("signal:")[-1].strip()
-            elif "tx bitrate:" in line:
-                info['bitrate'] = line.split("tx bitrate:")[-1].strip()
+        for field, value in IW_LINK_RE.findall(sh("iw dev wlan0 link")):
+            info[IW_LINK_FIELDS[field]] = value
         
         # Get IP address
-        ip_info = sh("ip addr show wlan0 | grep 'inet '")
-        if ip_info:
-            ip_match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', ip_info)
-            if ip_match:
-                info['ip'] = ip_match.group(1)
+        addresses = psutil.net_if_addrs().get('wlan0', [])
+        info['ip'] = next((addr.address for addr in addresses if addr.family == socket.AF_INET), '-')
         
         # Test internet
-        result = subprocess.run(["ping", "-c", "1", "-W", "2", "1.1.1.1"], 
-                              capture_output=True, timeout=5)
-        info['ping'] = "OK" if result.returncode == 0 else "Fail"
+        info['ping'] = "OK" if internet_reachable() else "Fail"
         
     except Exception:
         pass
     
     return info
 
+def file_version(path):
+    """Cache key for a file's current contents: (path, mtime_ns, size)"""
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+@functools.lru_cache(maxsize=4)
+def parse_hostapd(path, mtime_ns, size):
+    """Parse a hostapd config into {key: value} (cached per file version, do not modify)"""
+    config = {}
+    with open(path, 'r') as f:
+        for line in f:
+            key, sep, value = line.strip().partition('=')
+            if sep and not key.startswith('#'):
+                config[key] = value
+    return config
+
+def hostapd_config():
+    """Get the parsed hostapd config, re-read only after the file changed"""
+    return parse_hostapd(*file_version(HOSTAPD))
+
+def update_hostapd(updates, remove=()):
+    """Set hostapd config keys (missing ones are appended) and drop the keys in remove, in one atomic rewrite"""
+    updates = {key: str(value) for key, value in updates.items()}
+    if any('\n' in value or '\r' in value for value in updates.values()):
+        raise ValueError("Zeilenumbrüche sind in der AP-Konfiguration nicht erlaubt")
+    pending = dict(updates)
+    lines = []
+    try:
+        with open(HOSTAPD, 'r') as f:
+            original = f.readlines()
+    except FileNotFoundError:
+        original = None  # Written from scratch with just these keys
+    for line in original or ():
+        key, sep, _ = line.partition('=')
+        if sep and key in remove:
+            continue
+        if sep and key in updates:
+            line = f"{key}={updates[key]}\n"
+            pending.pop(key, None)
+        lines.append(line)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    lines += [f"{key}={value}\n" for key, value in pending.items()]
+    
+    tmp_path = HOSTAPD + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.writelines(lines)
+    if original is not None:
+        shutil.copymode(HOSTAPD, tmp_path)
+    os.replace(tmp_path, HOSTAPD)
+
+@functools.lru_cache(maxsize=2)
+def parse_leases(path, mtime_ns, size):
+    """Parse dnsmasq leases into (lease list, {mac (lowercase): {'ip', 'hostname'}}) (cached per file version)"""
+    leases = []
+    dhcp_clients = {}
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 4:
+                # Format: timestamp MAC IP hostname client-id
+                hostname = parts[3] if parts[3] != '*' else ''
+                leases.append({'exp': parts[0], 'mac': parts[1], 'ip': parts[2], 'hostname': hostname})
+                dhcp_clients[parts[1].lower()] = {'ip': parts[2], 'hostname': hostname}
+    return leases, dhcp_clients
+
+def read_hostapd_info():
+    """Read SSID, band, channel, visibility and the masked password from the hostapd config"""
+    info = {}
+    if not os.path.exists(HOSTAPD):
+        return info
+    
+    config = hostapd_config()
+    if 'wpa_passphrase' in config:
+        # Show actual password length as stars
+        info['password'] = '*' * len(config['wpa_passphrase'].strip('"'))
+    if 'ssid' in config:
+        info['ssid'] = config['ssid']
+    if 'hw_mode' in config:
+        info['band'] = '5G' if config['hw_mode'] == 'a' else '2G'
+    if 'channel' in config:
+        info['channel'] = config['channel']
+    if 'ignore_broadcast_ssid' in config:
+        # 0 = visible, 1 = hidden, 2 = hidden (don't respond to broadcast probe requests)
+        info['ssid_visible'] = config['ignore_broadcast_ssid'] == '0'
+    return info
+
+def read_dhcp_clients():
+    """Read DHCP leases as {mac (lowercase): {'ip', 'hostname'}}"""
+    return parse_leases(*file_version(LEASES))[1]
+
+def bridge_exists():
+    """Check if the LAN bridge br0 exists"""
+    return os.path.exists('/sys/class/net/br0')
+
+@single_flight
 def get_ap_info():
     """Get Access Point information"""
     info = {
@@ -2883,99 +4130,33 @@ def get_ap_info():
     }
     
     try:
-        # Get AP password from hostapd config
-        try:
-            if os.path.exists(HOSTAPD):
-                with open(HOSTAPD, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line.startswith('wpa_passphrase='):
-                            ap_password = line.split('=', 1)[1].strip('"')
-                            # Show actual password length as stars
-                            info['password'] = '*' * len(ap_password)
-                            break
-        except:
-            info['password'] = '******'
+        # Config, leases, station dump and bridge check are independent
+        probes = run_probes({
+            'hostapd': read_hostapd_info,
+            'leases': read_dhcp_clients,
+            'signals': read_stations,
+            'bridge': bridge_exists,
+        })
+        info.update(probes.get('hostapd', {}))
+        signals = probes.get('signals', {})
         
-        # Parse hostapd config
-        if os.path.exists(HOSTAPD):
-            with open(HOSTAPD, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('ssid='):
-                        info['ssid'] = line.split('=', 1)[1]
-                    elif line.startswith('hw_mode='):
-                        info['band'] = '5G' if line.split('=', 1)[1] == 'a' else '2G'
-                    elif line.startswith('channel='):
-                        info['channel'] = line.split('=', 1)[1]
-                    elif line.startswith('ignore_broadcast_ssid='):
-                        # 0 = visible, 1 = hidden, 2 = hidden (don't respond to broadcast probe requests)
-                        visibility = line.split('=', 1)[1]
-                        info['ssid_visible'] = visibility == '0'
-        
-        # Get connected clients from DHCP leases (most reliable)
+        # Create client list from DHCP leases (most reliable)
         clients = []
-        dhcp_clients = {}
-        
-        # Read DHCP leases
-        try:
-            with open('/var/lib/misc/dnsmasq.leases', 'r') as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        # Format: timestamp MAC IP hostname client-id
-                        mac = parts[1]
-                        ip = parts[2]
-                        hostname = parts[3] if parts[3] != '*' else ''
-                        dhcp_clients[mac] = {'ip': ip, 'hostname': hostname}
-        except:
-            pass
-        
-        # Create client list from DHCP leases
-        for mac, data in dhcp_clients.items():
+        for mac, data in probes.get('leases', {}).items():
             # Determine interface based on IP range or other factors
             interface = 'wlan1'  # default
-            if data['ip'].startswith('192.168.50.'):
-                # Check if bridge exists to determine if it's LAN or WLAN
-                try:
-                    bridge_result = subprocess.run(["ip", "link", "show", "br0"], 
-                                                 capture_output=True, text=True, timeout=2)
-                    if bridge_result.returncode == 0:
-                        interface = 'br0'  # Bridge exists, client is on LAN
-                    else:
-                        interface = 'wlan1'  # No bridge, client is on WLAN
-                except:
-                    interface = 'wlan1'
+            if data['ip'].startswith('192.168.50.') and probes.get('bridge'):
+                interface = 'br0'  # Bridge exists, client is on LAN
             
             clients.append({
                 'mac': mac,
                 'ip': data['ip'],
                 'hostname': data['hostname'],
-                'signal': '',
+                # Enrich with WiFi signal strength from wlan1 (both keyed by lowercase MAC)
+                'signal': signals.get(mac, ''),
                 'interface': interface
             })
         
-        # Enrich with WiFi signal strength from wlan1
-        try:
-            stations = sh("iw dev wlan1 station dump")
-            current_mac = None
-            current_signal = ''
-            
-            for line in stations.splitlines():
-                line = line.strip()
-                if line.startswith("Station "):
-                    current_mac = line.split()[1]
-                    current_signal = ''
-                elif line.startswith("signal:"):
-                    current_signal = line.split("signal:")[-1].strip()
-                    # Find matching client and update signal
-                    for client in clients:
-                        if client['mac'].lower() == current_mac.lower():
-                            client['signal'] = current_signal
-                            break
-        except:
-            pass
-        
         info['clients'] = clients
         
     except Exception:
@@ -2985,22 +4166,12 @@ def get_ap_info():
 
 def get_dhcp_leases():
     """Get DHCP lease information"""
-    leases = []
     try:
         if os.path.exists(LEASES):
-            with open(LEASES, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) >= 4:
-                        leases.append({
-                            'exp': parts[0],
-                            'mac': parts[1],
-                            'ip': parts[2],
-                            'hostname': parts[3] if parts[3] != '*' else ''
-                        })
+            return list(parse_leases(*file_version(LEASES))[0])
     except Exception:
         pass
-    return leases
+    return []
 
 def get_pihole_info():
     """Get Pi-hole information"""
@@ -3010,12 +4181,17 @@ def get_pihole_info():
     except Exception:
         return None
 
+@functools.lru_cache(maxsize=2)
+def parse_config(path, mtime_ns, size):
+    """Parse the YAML config (cached per file version, do not modify)"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
 def load_config():
-    """Load configuration"""
+    """Load configuration (a copy, parsed again only after the file changed)"""
     try:
         if os.path.exists(CONF_FILE):
-            with open(CONF_FILE, 'r') as f:
-                return yaml.safe_load(f) or {}
+            return dict(parse_config(*file_version(CONF_FILE)))
     except Exception:
         pass
     return {}
@@ -3024,11 +4200,30 @@ def save_config(config):
     """Save configuration"""
     try:
         with open(CONF_FILE, 'w') as f:
-            yaml.safe_dump(config, f)
+            yaml.dump(config, f, Dumper=YamlDumper)
         return True
     except Exception:
         return False
 
+# Everything the dashboard shows on load, keyed as returned by /api/bootstrap
+DASHBOARD_SOURCES = {
+    'status': get_system_status,
+    'stats': get_system_stats,
+    'wan': get_wan_info,
+    'ap': get_ap_info,
+    'internet': get_internet_config,
+    'pihole': get_pihole_info,
+    'config': load_config,
+    'wifi': get_current_wifi_data,
+    'speed': get_internet_speed_data,
+}
+dashboard_pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(DASHBOARD_SOURCES), thread_name_prefix='dashboard')
+
+def get_dashboard_data(keys=DASHBOARD_SOURCES):
+    """Gather the dashboard panels concurrently so their subprocess waits overlap"""
+    futures = {key: dashboard_pool.submit(DASHBOARD_SOURCES[key]) for key in keys}
+    return {key: future.result() for key, future in futures.items()}
+
 # Login template
 LOGIN_TEMPLATE = '''
 <!DOCTYPE html>
@@ -3129,22 +4324,43 @@ LOGIN_TEMPLATE = '''
 </html>
 '''
 
+def is_authenticated():
+    """Check the signed session cookie, decoded at most once per request"""
+    if 'authenticated' not in g:
+        g.authenticated = bool(session.get('authenticated'))
+    return g.authenticated
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     """Login page"""
     if request.method == 'POST':
-        password = request.form.get('password')
-        if password == DASHBOARD_PASSWORD:
+        password = request.form.get('password', '')
+        if password_matches(password, DASHBOARD_PASSWORD_DIGEST):
+            session.permanent = True
             session['authenticated'] = True
             return redirect('/')
         else:
-            return render_template_string(LOGIN_TEMPLATE, error='❌ Falsches Passwort!')
+            return render_template('login.html', error='❌ Falsches Passwort!')
     
     # Check if already authenticated
-    if session.get('authenticated'):
+    if is_authenticated():
         return redirect('/')
     
-    return render_template_string(LOGIN_TEMPLATE)
+    return render_template('login.html')
+
+@app.route('/assets/dashboard-<css_hash>.css')
+def dashboard_css(css_hash):
+    """Dashboard stylesheet (content-hashed URL, cached by the browser)"""
+    if css_hash != DASHBOARD_CSS_HASH:
+        return 'Not found', 404
+    return asset_response(DASHBOARD_CSS_BYTES, 'text/css', DASHBOARD_CSS_HASH)
+
+@app.route('/assets/dashboard-<js_hash>.js')
+def dashboard_js(js_hash):
+    """Dashboard JavaScript (content-hashed URL, cached by the browser)"""
+    if js_hash != DASHBOARD_JS_HASH:
+        return 'Not found', 404
+    return asset_response(DASHBOARD_JS_BYTES, 'application/javascript', DASHBOARD_JS_HASH)
 
 @app.route('/logout')
 def logout():
@@ -3152,42 +4368,55 @@ def logout():
     session.pop('authenticated', None)
     return redirect('/login')
 
+# Channels offered in the dashboard per AP band
+AP_CHANNELS = {
+    '2G': ("1", "6", "11"),
+    '5G': ("36", "40", "44", "48"),
+}
+
+@functools.lru_cache(maxsize=32)
+def channel_options_html(band, selected):
+    """Pre-rendered <option> list for the channel select"""
+    return Markup(''.join(
+        f'<option value="{escape(ch)}"{" selected" if ch == selected else ""}>{escape(ch)}</option>'
+        for ch in AP_CHANNELS['2G' if band == '2G' else '5G']
+    ))
+
 @app.route('/')
 def dashboard():
     """Main dashboard"""
     # Check authentication
-    if not session.get('authenticated'):
+    if not is_authenticated():
         return redirect('/login')
-    system_status = get_system_status()
-    system_stats = get_system_stats()
-    wan_info = get_wan_info()
-    ap_info = get_ap_info()
-    internet_config = get_internet_config()
-    pihole_info = get_pihole_info()
-    config = load_config()
+    data = get_dashboard_data(('status', 'stats', 'wan', 'ap', 'internet', 'pihole', 'config'))
+    system_status = data['status']
+    system_stats = data['stats']
+    wan_info = data['wan']
+    ap_info = data['ap']
+    internet_config = data['internet']
+    pihole_info = data['pihole']
+    config = data['config']
     
     # Available channels based on band
     band = config.get('ap_band', ap_info.get('band', '5G'))
-    available_channels = ["1", "6", "11"] if band == "2G" else ["36", "40", "44", "48"]
+    available_channels = list(AP_CHANNELS['2G' if band == '2G' else '5G'])
     
-    # Load active theme template with JavaScript injection
-    template_content = DASHBOARD_TEMPLATE
+    # Load active theme template with JavaScript injection (compiled once per file change)
+    template = 'dashboard.html'
     if theme_manager:
         active_theme = theme_manager.get_active_theme()
         if active_theme:
-            # Get theme HTML and inject system JavaScript
-            theme_template = theme_manager.get_theme_template(active_theme, SYSTEM_JAVASCRIPT)
-            if theme_template:
-                template_content = theme_template
+            try:
+                template = app.jinja_env.get_template(f'themes/{active_theme}')
                 print(f"Loading active theme: {active_theme} (with injected JavaScript)")
-            else:
+            except TemplateNotFound:
                 print(f"Failed to load theme {active_theme}, using default")
         else:
             print("Using default theme")
     else:
         print("Theme manager not available, using default template")
     
-    return render_template_string(template_content,
+    return render_cached(template,
         system_status=system_status,
         system_stats=system_stats,
         wan=wan_info,
@@ -3195,68 +4424,27 @@ def dashboard():
         **internet_config,
         pihole=pihole_info,
         available_channels=available_channels,
+        channel_options_html=channel_options_html(band, str(ap_info.get('channel'))),
         clients=ap_info.get('clients', []),
         scan_results=None,
         messages=[])
 
-
-    try:
-        scan_output = sh("nmcli -t -f ssid,signal,frequency,security dev wifi list")
-        seen = {}
-        
-        for line in scan_output.splitlines():
-            parts = line.split(":")
-            if len(parts) >= 4:
-                ssid, signal, freq, sec = parts[0], parts[1] or "0", parts[2], parts[3]
-                key = (ssid, freq, sec)
-                
-                if key not in seen or int(signal) > int(seen[key]["signal"]):
-                    seen[key] = {
-                        "ssid": ssid,
-                        "signal": signal,
-                        "frequency": freq,
-                        "security": sec
-                    }
-        
-        scan_results = list(seen.values())
-        
-    except Exception:
-        pass
-    
-    system_status = get_system_status()
-    system_stats = get_system_stats()
-    wan_info = get_wan_info()
-    ap_info = get_ap_info()
-    internet_config = get_internet_config()
-    pihole_info = get_pihole_info()
-    config = load_config()
-    
-    band = config.get('ap_band', ap_info.get('band', '5G'))
-    available_channels = ["1", "6", "11"] if band == "2G" else ["36", "40", "44", "48"]
-    
-    return render_template_string(DASHBOARD_TEMPLATE,
-        system_status=system_status,
-        system_stats=system_stats,
-        wan=wan_info,
-        ap=ap_info,
-        **internet_config,
-        pihole=pihole_info,
-        available_channels=available_channels,
-        clients=ap_info.get('clients', []),
-        scan_results=scan_results,
-        messages=[])
-
 # API Routes
 @app.route('/api/disconnect_wifi', methods=['POST'])
 def api_disconnect_wifi():
     """API: Disconnect from WiFi"""
     try:
         # Get current connection
-        result = sh("nmcli -t -f name,device con show --active | grep wlan0 | cut -d: -f1", timeout=10)
-        connection_name = result.strip()
+        result = run_cmd(["nmcli", "-t", "-f", "name,device", "con", "show", "--active"], timeout=10, text=True)
+        connection_name = ''
+        for line in result.stdout.splitlines():
+            name, _, device = line.rpartition(':')
+            if device == 'wlan0':
+                connection_name = NMCLI_TEXT_ESCAPE_RE.sub(r'\1', name)
+                break
         
         if connection_name:
-            sh(f'nmcli con down "{connection_name}"', timeout=10)
+            run_cmd(["nmcli", "con", "down", connection_name], timeout=10)
             return jsonify({'success': True})
         else:
             return jsonify({'success': False, 'error': 'Keine aktive Verbindung'})
@@ -3296,11 +4484,13 @@ def api_connect_wifi():
 @app.route('/api/scan_wifi', methods=['GET'])
 def api_scan_wifi():
     """API: Scan for WiFi networks"""
+    global _wifi_list
     try:
         # Force rescan
         result = subprocess.run(["nmcli", "dev", "wifi", "rescan"], 
                               capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
+            _wifi_list = (0.0, None)  # Next listing reads the new results
             return jsonify({'success': True})
         else:
             return jsonify({'success': False, 'error': result.stderr})
@@ -3325,7 +4515,7 @@ def api_get_current_wifi():
                     name = parts[0]
                     device = parts[1]
                     state = parts[2]
-                    if device == "wlan0" and ("activated" in state or "connected" in state):
+                    if device == "wlan0" and state.encode() in WLAN0_CONNECTED_STATES:
                         # Get signal strength from wifi list
                         signal_result = subprocess.run(["nmcli", "-t", "-f", "ssid,signal", "dev", "wifi", "list", "ifname", "wlan0"], 
                                                      capture_output=True, text=True, timeout=10)
@@ -3345,97 +4535,155 @@ def api_get_current_wifi():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+# (monotonic time, rx_bytes, tx_bytes) of wlan0 at the last polls of /api/get_internet_speed
+# (older polls are dropped so a rate never averages over a long idle gap)
+wlan0_counter_history = collections.deque(maxlen=8)
+WLAN0_RATE_WINDOW = 30  # seconds
+
 @app.route('/api/get_internet_speed', methods=['GET'])
 def api_get_internet_speed():
     """API: Get internet speed (download/upload)"""
     try:
-        # Get network interface statistics
-        result = subprocess.run(["cat", "/proc/net/dev"], capture_output=True, text=True, timeout=5)
-        
-        if result.returncode != 0:
-            return jsonify({'success': False, 'error': result.stderr})
-        
-        lines = result.stdout.splitlines()
-        wlan0_stats = None
-        
-        for line in lines:
-            if "wlan0" in line:
-                parts = line.split()
-                if len(parts) >= 10:
-                    # Format: interface | bytes | packets | errs | drop | fifo | frame | compressed | multicast | bytes | packets | errs | drop | fifo | colls | carrier | compressed
-                    rx_bytes = int(parts[1])  # Received bytes
-                    tx_bytes = int(parts[9])  # Transmitted bytes
-                    wlan0_stats = {'rx_bytes': rx_bytes, 'tx_bytes': tx_bytes}
-                break
+        # Get network interface statistics (persistent /proc/net/dev handle, no subprocess)
+        wlan0_stats = next(({'rx_bytes': int(rx_bytes), 'tx_bytes': int(tx_bytes)}
+                            for interface, rx_bytes, tx_bytes in PROC_NET_DEV_RE.findall(read_proc_net_dev())
+                            if interface == b'wlan0'), None)
         
         if not wlan0_stats:
             return jsonify({'success': False, 'error': 'wlan0 interface not found'})
         
-        # Calculate speed (bytes per second over last 5 seconds)
-        # This is a simple approximation - in production you'd want to store previous values
-        # For now, we'll return the current byte counts and let frontend calculate rates
+        # Calculate speed (bytes per second since the oldest of the last polls)
+        now = time.monotonic()
+        while wlan0_counter_history and now - wlan0_counter_history[0][0] > WLAN0_RATE_WINDOW:
+            wlan0_counter_history.popleft()
+        wlan0_counter_history.append((now, wlan0_stats['rx_bytes'], wlan0_stats['tx_bytes']))
+        since, rx_then, tx_then = wlan0_counter_history[0]
+        elapsed = now - since
+        
         return jsonify({
             'success': True, 
             'rx_bytes': wlan0_stats['rx_bytes'],
             'tx_bytes': wlan0_stats['tx_bytes'],
-            'timestamp': int(time.time() * 1000)  # milliseconds
+            # Counters reset when the interface goes down, a negative delta reads as 0
+            'rx_bps': round(max(wlan0_stats['rx_bytes'] - rx_then, 0) / elapsed) if elapsed else 0,
+            'tx_bps': round(max(wlan0_stats['tx_bytes'] - tx_then, 0) / elapsed) if elapsed else 0,
+            'timestamp': now_ms()  # milliseconds
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/bootstrap')
+def api_bootstrap():
+    """API: All dashboard panels in one response"""
+    return conditional_json(get_dashboard_data())
+
 @app.route('/api/status')
 def api_status():
     """API: Get system status"""
-    return jsonify(get_system_status())
+    return conditional_json(get_system_status())
 
 @app.route('/api/stats')
 def api_stats():
     """API: Get system statistics"""
-    return jsonify(get_system_stats())
+    return conditional_json(get_system_stats())
+
+# One 'nmcli -t -f ssid,signal,freq,security' row; only the SSID can contain (escaped) colons
+NMCLI_WIFI_RE = re.compile(rb'^(.*):([^:\n]*):([^:\n]*):([^:\n]*)$', re.M)
+
+def read_wifi_networks(rescan=False):
+    """List the WiFi networks seen by wlan0, one entry per SSID with its best signal"""
+    # Only scan with wlan0 to avoid duplicates from wlan1 (AP)
+    args = ["nmcli", "-t", "-f", "ssid,signal,freq,security", "dev", "wifi", "list", "ifname", "wlan0"]
+    if rescan:
+        # Rescan and list in one call, nmcli waits for the scan to finish
+        args += ["--rescan", "yes"]
+    result = run_cmd(args, timeout=30)
+    
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode(errors='replace'))
+    
+    # Group by SSID only, keep the best signal strength; only the survivors are decoded
+    best = {}
+    for ssid, signal, freq, security in NMCLI_WIFI_RE.findall(result.stdout):
+        ssid = NMCLI_ESCAPE_RE.sub(rb'\1', ssid).strip()
+        # Skip if SSID is empty or is our own AP
+        if not ssid or ssid == b"PiRepeater":
+            continue
+        signal = int(signal.strip() or b"0")
+        if signal > best.get(ssid, (-1,))[0]:
+            best[ssid] = (signal, freq, security)
+    
+    return [{
+        "ssid": ssid.decode('utf-8', 'replace'),
+        "signal": str(signal),
+        "frequency": freq.decode().strip(),
+        "security": security.decode().strip() or "Offen"
+    } for ssid, (signal, freq, security) in best.items()]
+
+# Last WiFi list as (monotonic time, networks); NetworkManager refreshes its own
+# scan results about every 30 s, so listing more often only costs nmcli runs
+WIFI_LIST_TTL = 30
+_wifi_list = (0.0, None)
+_wifi_list_lock = threading.Lock()
+
+def scan_wifi_networks(rescan=False):
+    """WiFi networks seen by wlan0, served from the last listing for WIFI_LIST_TTL seconds unless rescanning"""
+    global _wifi_list
+    if rescan:
+        networks = read_wifi_networks(True)
+        _wifi_list = (time.monotonic(), networks)
+        return networks
+    # Concurrent requests wait for one nmcli listing instead of each starting their own
+    with _wifi_list_lock:
+        listed_at, networks = _wifi_list
+        if networks is None or time.monotonic() - listed_at >= WIFI_LIST_TTL:
+            networks = read_wifi_networks()
+            _wifi_list = (time.monotonic(), networks)
+        return networks
+
+# Refresh the WiFi list in the background a bit more often than WIFI_LIST_TTL, so requests
+# find a fresh list and never wait on nmcli (WIFI_PRESCAN=0 turns this off)
+WIFI_PRESCAN = os.getenv('WIFI_PRESCAN', '1') == '1'
+WIFI_PRESCAN_INTERVAL = 25
+
+def wifi_prescan_task():
+    """Background task keeping the cached WiFi list fresh"""
+    global _wifi_list
+    while True:
+        try:
+            _wifi_list = (time.monotonic(), read_wifi_networks())
+        except Exception as e:
+            logger.debug("WiFi prescan failed: %s", e)
+        socketio.sleep(WIFI_PRESCAN_INTERVAL)
 
 @app.route('/api/get_wifi_networks', methods=['GET'])
 def api_get_wifi_networks():
     """API: Get available WiFi networks"""
     try:
-        # Use direct subprocess call instead of sh() function
-        # Only scan with wlan0 to avoid duplicates from wlan1 (AP)
-        result = subprocess.run(["nmcli", "-t", "-f", "ssid,signal,freq,security", "dev", "wifi", "list", "ifname", "wlan0"], 
-                              capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            return jsonify({'success': False, 'error': result.stderr})
-        
-        scan_output = result.stdout
-        networks = []
-        seen = {}
-        
-        for line in scan_output.splitlines():
-            if not line.strip():
-                continue
-            parts = line.split(":")
-            if len(parts) >= 4:
-                ssid, signal, freq, sec = parts[0], parts[1] or "0", parts[2], parts[3]
-                # Skip if SSID is empty or is our own AP
-                if not ssid.strip() or ssid.strip() == "PiRepeater":
-                    continue
-                # Group by SSID only, keep the best signal strength
-                key = ssid.strip()
-                
-                if key not in seen or int(signal) > int(seen[key]["signal"]):
-                    seen[key] = {
-                        "ssid": ssid.strip(),
-                        "signal": signal.strip(),
-                        "frequency": freq.strip(),
-                        "security": sec.strip() if sec.strip() else "Offen"
-                    }
-        
-        networks = list(seen.values())
-        return jsonify({'success': True, 'networks': networks})
-        
+        networks = scan_wifi_networks(request.args.get('rescan') == '1')
+        return conditional_json({'success': True, 'networks': networks})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/scan_wifi_stream')
+def api_scan_wifi_stream():
+    """API: Server-sent events with the networks already known, then the result of a fresh scan"""
+    # Clients that already show a cached list pass cached=1 and only wait for the scan
+    passes = (True,) if request.args.get('cached') == '1' else (False, True)
+    
+    def events():
+        for rescan in passes:
+            try:
+                payload = {'success': True, 'networks': scan_wifi_networks(rescan), 'final': rescan}
+            except Exception as e:
+                payload = {'success': False, 'error': str(e), 'final': True}
+            yield f"data: {json.dumps(payload)}\n\n"
+            if payload['final']:
+                break
+    
+    return app.response_class(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 @app.route('/api/get_ap_info')
 def api_get_ap_info():
     """API: Get Access Point information"""
@@ -3449,22 +4697,37 @@ def api_get_ap_info():
 def api_get_ap_qr_info():
     """API: Get Access Point information with real password for QR code generation"""
     try:
-        info = get_ap_info()
+        # Copy, the AP info may be shared with concurrent callers
+        info = dict(get_ap_info())
         # Get real password from hostapd config
         try:
             if os.path.exists(HOSTAPD):
-                with open(HOSTAPD, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line.startswith('wpa_passphrase='):
-                            info['password'] = line.split('=', 1)[1].strip('"')
-                            break
-        except:
+                passphrase = hostapd_config().get('wpa_passphrase')
+                if passphrase is not None:
+                    info['password'] = passphrase.strip('"')
+        except Exception:
             pass
         return jsonify(info)
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@functools.lru_cache(maxsize=8)
+def render_qr_svg(data):
+    """Render a QR code as inline SVG scaled to its container"""
+    svg = segno.make(data, error='m').svg_inline(omitsize=True, svgclass=None, lineclass=None, light='#fff')
+    return svg.replace('<svg ', '<svg style="width: 100%; height: 100%; display: block;" ', 1)
+
+@app.route('/api/qr_code', methods=['POST'])
+def api_qr_code():
+    """API: Render a QR code on the router so the WiFi password stays local"""
+    if not segno:
+        return jsonify({'success': False, 'error': 'segno not installed'})
+    try:
+        data = request.get_json()
+        return jsonify({'success': True, 'svg': render_qr_svg(data['data'])})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/update_ap', methods=['POST'])
 def api_update_ap():
     """API: Update Access Point settings"""
@@ -3472,20 +4735,19 @@ def api_update_ap():
         data = request.get_json()
         
         # Update hostapd config
-        updates = []
+        updates = {}
         if 'ssid' in data:
-            updates.append(('ssid', data['ssid']))
+            updates['ssid'] = data['ssid']
         if 'password' in data and data['password'] and not data['password'].startswith('*'):
             # Only update password if it's not masked (starts with *)
-            updates.append(('wpa_passphrase', data['password']))
+            updates['wpa_passphrase'] = data['password']
         if 'band' in data:
-            hw_mode = 'a' if data['band'] == '5G' else 'g'
-            updates.append(('hw_mode', hw_mode))
+            updates['hw_mode'] = 'a' if data['band'] == '5G' else 'g'
         if 'channel' in data:
-            updates.append(('channel', data['channel']))
+            updates['channel'] = data['channel']
         
-        for key, value in updates:
-            sh(f'sed -i "s/^{key}=.*/{key}={value}/" {HOSTAPD}')
+        if updates:
+            update_hostapd(updates)
         
         # Restart hostapd
         sh("systemctl restart hostapd")
@@ -3516,53 +4778,13 @@ def api_toggle_ap_visibility():
         data = request.get_json()
         visible = data.get('visible', True)
         
-        # Read current hostapd config
-        config_lines = []
-        if os.path.exists(HOSTAPD):
-            with open(HOSTAPD, 'r') as f:
-                config_lines = f.readlines()
-        
-        # Update or add ignore_broadcast_ssid setting
-        updated = False
-        for i, line in enumerate(config_lines):
-            if line.startswith('ignore_broadcast_ssid='):
-                config_lines[i] = f'ignore_broadcast_ssid={"0" if visible else "1"}\n'
-                updated = True
-                break
-        
-        # If not found, add it
-        if not updated:
-            config_lines.append(f'ignore_broadcast_ssid={"0" if visible else "1"}\n')
-        
-        # For hidden SSIDs, switch to 2.4GHz for better compatibility
-        # Many devices have problems with hidden SSIDs on 5GHz
         if not visible:
-            # Switch to 2.4GHz (hw_mode=g, channel 6)
-            for i, line in enumerate(config_lines):
-                if line.startswith('hw_mode='):
-                    config_lines[i] = 'hw_mode=g\n'
-                elif line.startswith('channel='):
-                    config_lines[i] = 'channel=6\n'
-                elif line.startswith('ieee80211w='):
-                    config_lines[i] = 'ieee80211w=0\n'
-            
-            # Add ieee80211w if not present
-            if not any(line.startswith('ieee80211w=') for line in config_lines):
-                config_lines.append('ieee80211w=0\n')
+            # For hidden SSIDs, switch to 2.4GHz (hw_mode=g, channel 6) for better compatibility
+            # Many devices have problems with hidden SSIDs on 5GHz
+            update_hostapd({'ignore_broadcast_ssid': '1', 'hw_mode': 'g', 'channel': '6', 'ieee80211w': '0'})
         else:
-            # For visible SSIDs, switch back to 5GHz (hw_mode=a, channel 36)
-            for i, line in enumerate(config_lines):
-                if line.startswith('hw_mode='):
-                    config_lines[i] = 'hw_mode=a\n'
-                elif line.startswith('channel='):
-                    config_lines[i] = 'channel=36\n'
-            
-            # Remove ieee80211w setting
-            config_lines = [line for line in config_lines if not line.startswith('ieee80211w=')]
-        
-        # Write back to file
-        with open(HOSTAPD, 'w') as f:
-            f.writelines(config_lines)
+            # For visible SSIDs, switch back to 5GHz (hw_mode=a, channel 36) and drop ieee80211w
+            update_hostapd({'ignore_broadcast_ssid': '0', 'hw_mode': 'a', 'channel': '36'}, remove=('ieee80211w',))
         
         # Restart hostapd
         sh("systemctl restart hostapd")
@@ -3571,6 +4793,91 @@ def api_toggle_ap_visibility():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+# Persistent rtnetlink socket for link and address changes, opened on first use
+_ipr = None
+_ipr_lock = threading.Lock()
+
+def netlink_command(ipr, command):
+    """Apply one 'ip' batch command (the link/addr forms used in this file) over rtnetlink"""
+    words = command.split()
+    index = lambda ifname: ipr.link_lookup(ifname=ifname)[0]
+    if words[:2] == ['link', 'set'] and words[3:] in (['up'], ['down']):
+        ipr.link('set', index=index(words[2]), state=words[3])
+    elif words[:2] == ['link', 'set'] and words[3:4] == ['master']:
+        ipr.link('set', index=index(words[2]), master=index(words[4]))
+    elif words[:2] == ['link', 'delete']:
+        ipr.link('del', index=index(words[2]))
+    elif words[:3] == ['link', 'add', 'name'] and words[4:5] == ['type']:
+        ipr.link('add', ifname=words[3], kind=words[5])
+    elif words[:1] == ['addr'] and words[1] in ('add', 'del') and words[3:4] == ['dev']:
+        address, prefixlen = words[2].split('/')
+        ipr.addr(words[1], index=index(words[4]), address=address, prefixlen=int(prefixlen))
+    elif words[:3] == ['addr', 'flush', 'dev']:
+        ipr.flush_addr(index=index(words[3]))
+    else:
+        raise ValueError(f"Unsupported ip command: {command}")
+
+def ip_batch(commands):
+    """Run several 'ip' commands, carrying on past expected failures (like deleting a missing br0)"""
+    global _ipr
+    if IPRoute:
+        # In-process netlink requests, no ip process at all
+        with _ipr_lock:
+            try:
+                if _ipr is None:
+                    _ipr = IPRoute()
+            except Exception as e:
+                logger.warning("Could not open netlink socket, using ip: %s", e)
+            else:
+                for command in commands:
+                    try:
+                        netlink_command(_ipr, command)
+                    except Exception as e:
+                        logger.debug("ip %s failed: %s", command, e)
+                return
+    # One ip process for the whole batch (-force keeps going after a failed command)
+    result = run_cmd(["ip", "-force", "-batch", "-"], text=True, input=''.join(f"{command}\n" for command in commands))
+    if result.returncode != 0:
+        logger.debug("ip batch reported errors: %s", result.stderr.strip())
+
+def iptables_rule_key(table, rule):
+    """Key of a rule independent of option order, so our rule specs match iptables-save's lines"""
+    chain, *tokens = rule.split()
+    # Each option keeps its own values (and a preceding '!'), only the options are reordered
+    options = []
+    negate = False
+    for token in tokens:
+        if token == '!':
+            negate = True
+        elif token.startswith('-') or not options:
+            options.append(['!', token] if negate else [token])
+            negate = False
+        else:
+            options[-1].append(token)
+    return table, chain, tuple(sorted(tuple(option) for option in options))
+
+def iptables_apply(add=(), delete=()):
+    """Delete every copy of the given (table, rule) pairs, then append the new ones, in one iptables-restore run"""
+    tables = collections.defaultdict(list)
+    if delete:
+        # Only rules that exist may be deleted, a missing one would fail the whole batch
+        wanted = {iptables_rule_key(table, rule) for table, rule in delete}
+        table = None
+        for line in run_cmd(["iptables-save"], text=True).stdout.splitlines():
+            if line.startswith('*'):
+                table = line[1:]
+            elif line.startswith('-A ') and iptables_rule_key(table, line[3:]) in wanted:
+                tables[table].append('-D ' + line[3:])
+    for table, rule in add:
+        tables[table].append('-A ' + rule)
+    if not tables:
+        return
+    script = ''.join(f"*{table}\n" + ''.join(f"{line}\n" for line in lines) + "COMMIT\n"
+                     for table, lines in tables.items())
+    result = run_cmd(["iptables-restore", "--noflush"], text=True, input=script)
+    if result.returncode != 0:
+        logger.warning("iptables-restore failed: %s", result.stderr.strip())
+
 @app.route('/api/toggle_wlan0_internet', methods=['POST'])
 def api_toggle_wlan0_internet():
     """API: Toggle wlan0 Internet-Eingang with smart routing"""
@@ -3579,49 +4886,40 @@ def api_toggle_wlan0_internet():
         enabled = data.get('enabled', True)
         
         # Save config
-        with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-            f.write('1' if enabled else '0')
+        _write_cfg('wlan0-internet-enabled', '1' if enabled else '0')
         
         # Smart routing: if wlan0 is enabled, check if eth0 should be disabled
         if enabled:
             # Check current eth0 mode
-            eth0_mode = 'output'  # default
-            try:
-                if os.path.exists('/etc/pi-config/eth0-mode'):
-                    with open('/etc/pi-config/eth0-mode', 'r') as f:
-                        eth0_mode = f.read().strip()
-            except:
-                pass
+            eth0_mode = _read_cfg('eth0-mode', 'output')
             
             # If eth0 is in receive mode and wlan0 is enabled, switch eth0 to output
             if eth0_mode == 'receive':
-                with open('/etc/pi-config/eth0-mode', 'w') as f:
-                    f.write('output')
+                _write_cfg('eth0-mode', 'output')
                 print("🔧 wlan0 enabled, eth0 switched to output mode to prevent conflicts")
         
         if enabled:
             # Enable wlan0 internet routing
-            sh("iptables -t nat -A POSTROUTING -o wlan0 -j MASQUERADE")
+            rules = [('nat', "POSTROUTING -o wlan0 -j MASQUERADE")]
             # Check if bridge exists and route accordingly
-            bridge_result = subprocess.run(["ip", "link", "show", "br0"], capture_output=True, text=True, timeout=5)
-            if bridge_result.returncode == 0:
+            if bridge_exists():
                 # Bridge exists, route bridge to wlan0
-                sh("iptables -A FORWARD -i br0 -o wlan0 -j ACCEPT")
-                sh("iptables -A FORWARD -i wlan0 -o br0 -j ACCEPT")
+                rules += [('filter', "FORWARD -i br0 -o wlan0 -j ACCEPT"),
+                          ('filter', "FORWARD -i wlan0 -o br0 -j ACCEPT")]
             else:
                 # No bridge, route wlan1 to wlan0
-                sh("iptables -A FORWARD -i wlan1 -o wlan0 -j ACCEPT")
-                sh("iptables -A FORWARD -i wlan0 -o wlan1 -j ACCEPT")
+                rules += [('filter', "FORWARD -i wlan1 -o wlan0 -j ACCEPT"),
+                          ('filter', "FORWARD -i wlan0 -o wlan1 -j ACCEPT")]
+            iptables_apply(add=rules)
         else:
             # Disable wlan0 internet routing
-            try:
-                sh("iptables -t nat -D POSTROUTING -o wlan0 -j MASQUERADE")
-                sh("iptables -D FORWARD -i br0 -o wlan0 -j ACCEPT")
-                sh("iptables -D FORWARD -i wlan0 -o br0 -j ACCEPT")
-                sh("iptables -D FORWARD -i wlan1 -o wlan0 -j ACCEPT")
-                sh("iptables -D FORWARD -i wlan0 -o wlan1 -j ACCEPT")
-            except:
-                pass
+            iptables_apply(delete=[
+                ('nat', "POSTROUTING -o wlan0 -j MASQUERADE"),
+                ('filter', "FORWARD -i br0 -o wlan0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan0 -o br0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan1 -o wlan0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan0 -o wlan1 -j ACCEPT"),
+            ])
         
         return jsonify({'success': True})
     except Exception as e:
@@ -3635,14 +4933,12 @@ def api_update_eth0_mode():
         mode = data.get('mode', 'auto')
         
         # Save config
-        with open('/etc/pi-config/eth0-mode', 'w') as f:
-            f.write(mode)
+        _write_cfg('eth0-mode', mode)
         
         # Smart routing logic to prevent conflicts
         if mode == 'receive':
             # If eth0 is set to receive, disable wlan0 internet to prevent conflicts
-            with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-                f.write('0')
+            _write_cfg('wlan0-internet-enabled', '0')
             print("🔧 eth0 set to receive mode, wlan0 internet disabled to prevent conflicts")
         elif mode == 'auto':
             # Auto-detect: if eth0 has internet, use it; otherwise use wlan0
@@ -3651,89 +4947,59 @@ def api_update_eth0_mode():
                                       capture_output=True, timeout=3)
                 if result.returncode == 0:
                     # eth0 has internet, disable wlan0
-                    with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-                        f.write('0')
+                    _write_cfg('wlan0-internet-enabled', '0')
                     print("🔧 Auto-detect: eth0 has internet, wlan0 disabled")
                 else:
                     # eth0 no internet, enable wlan0
-                    with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-                        f.write('1')
+                    _write_cfg('wlan0-internet-enabled', '1')
                     print("🔧 Auto-detect: eth0 no internet, wlan0 enabled")
             except:
                 # Fallback to wlan0
-                with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-                    f.write('1')
+                _write_cfg('wlan0-internet-enabled', '1')
                 print("🔧 Auto-detect failed, fallback to wlan0")
         
         if mode == 'receive':
             # eth0 = Internet-Empfang (wie wlan0)
-            # Remove bridge and restore original wlan1 configuration
-            try:
-                sh("ip link set br0 down")
-                sh("ip link delete br0")
-            except:
-                pass
-            
             # Stop and disable eth0 AP mode service
-            try:
-                sh("systemctl stop eth0-ap-mode.service")
-                sh("systemctl disable eth0-ap-mode.service")
-            except:
-                pass
-            
-            # Restore wlan1 original configuration
-            sh("ip addr add 192.168.50.1/24 dev wlan1")
-            sh("ip link set wlan1 up")
-            
-            # Remove secondary IP from eth0 if it exists
-            try:
-                sh("ip addr del 192.168.50.254/24 dev eth0")
-            except:
-                pass
-            
-            # Configure eth0 as WAN interface (let NetworkManager handle it)
-            sh("ip link set eth0 up")
+            sh("systemctl stop eth0-ap-mode.service")
+            sh("systemctl disable eth0-ap-mode.service")
             
-            # Clean up bridge-related iptables rules
-            try:
-                sh("iptables -t nat -D POSTROUTING -o br0 -j MASQUERADE")
-                sh("iptables -D FORWARD -i br0 -o wlan0 -j ACCEPT")
-                sh("iptables -D FORWARD -i wlan0 -o br0 -j ACCEPT")
-            except:
-                pass
+            ip_batch([
+                # Remove bridge and restore original wlan1 configuration
+                "link set br0 down",
+                "link delete br0",
+                "addr add 192.168.50.1/24 dev wlan1",
+                "link set wlan1 up",
+                # Remove secondary IP from eth0 if it exists
+                "addr del 192.168.50.254/24 dev eth0",
+                # Configure eth0 as WAN interface (let NetworkManager handle it)
+                "link set eth0 up",
+            ])
             
-            # Clean up eth0 AP mode rules (both old eth0/wlan1 and br0 rules)
-            for i in range(5):
-                try:
-                    sh("iptables -t nat -D POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE")
-                    sh("iptables -D FORWARD -i eth0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan0 -o eth0 -d 192.168.50.0/24 -j ACCEPT")
-                    sh("iptables -D FORWARD -i eth0 -o wlan1 -s 192.168.50.0/24 -d 192.168.50.0/24 -j ACCEPT")
-                    sh("iptables -D FORWARD -i br0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan0 -o br0 -d 192.168.50.0/24 -j ACCEPT")
-                    sh("iptables -D FORWARD -i br0 -o br0 -s 192.168.50.0/24 -d 192.168.50.0/24 -j ACCEPT")
-                except:
-                    break
+            # Clean up bridge-related iptables rules and the eth0 AP mode rules
+            # (both old eth0/wlan1 and br0 rules, every duplicate)
+            iptables_apply(delete=[
+                ('nat', "POSTROUTING -o br0 -j MASQUERADE"),
+                ('filter', "FORWARD -i br0 -o wlan0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan0 -o br0 -j ACCEPT"),
+                ('nat', "POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE"),
+                ('filter', "FORWARD -i eth0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan0 -o eth0 -d 192.168.50.0/24 -j ACCEPT"),
+                ('filter', "FORWARD -i eth0 -o wlan1 -s 192.168.50.0/24 -d 192.168.50.0/24 -j ACCEPT"),
+                ('filter', "FORWARD -i br0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT"),
+                ('filter', "FORWARD -i wlan0 -o br0 -d 192.168.50.0/24 -j ACCEPT"),
+                ('filter', "FORWARD -i br0 -o br0 -s 192.168.50.0/24 -d 192.168.50.0/24 -j ACCEPT"),
+            ])
             
             # Save iptables rules
             sh("netfilter-persistent save")
             
-            # Restore original dnsmasq configuration (only wlan1)
-            with open('/etc/dnsmasq.d/pi-repeater.conf', 'w') as f:
-                f.write('''interface=wlan1
-bind-interfaces
-dhcp-range=192.168.50.10,192.168.50.200,12h
-dhcp-option=3,192.168.50.1
-dhcp-option=6,8.8.8.8,8.8.4.4
-port=0
-domain=lan
-expand-hosts
-''')
-            sh("systemctl restart dnsmasq")
+            # Restore original dnsmasq configuration (only wlan1), restarting dnsmasq only if it changed
+            if write_if_changed(DNSMASQ_CONF, DNSMASQ_TEMPLATE.format(interface='wlan1')):
+                sh("systemctl restart dnsmasq")
             
             # Remove bridge from hostapd
-            sh("sed -i 's/^interface=.*/interface=wlan1/' /etc/hostapd/hostapd.conf")
-            sh("sed -i '/^bridge=/d' /etc/hostapd/hostapd.conf")
+            update_hostapd({'interface': 'wlan1'}, remove=('bridge',))
             sh("systemctl restart hostapd")
             
         elif mode == 'output':
@@ -3741,64 +5007,36 @@ expand-hosts
             # Configure eth0 to give internet to clients
             # Create persistent configuration via systemd service
             
-            # Clean up any old bridge
-            try:
-                sh("ip link set br0 down")
-                sh("ip link delete br0")
-            except:
-                pass
-            
-            # Ensure wlan1 has its IP
-            try:
-                sh("ip addr add 192.168.50.1/24 dev wlan1")
-            except:
-                pass
-            sh("ip link set wlan1 up")
-            
             # Create bridge with BOTH wlan1 and eth0 for WiFi and LAN clients
-            try:
+            ip_batch([
                 # Remove any existing bridge first
-                sh("ip link set br0 down 2>/dev/null || true")
-                sh("ip link delete br0 2>/dev/null || true")
-                
+                "link set br0 down",
+                "link delete br0",
                 # Create bridge
-                sh("ip link add name br0 type bridge")
-                sh("ip link set br0 up")
-                sh("ip addr add 192.168.50.1/24 dev br0")
-                
+                "link add name br0 type bridge",
+                "link set br0 up",
+                "addr add 192.168.50.1/24 dev br0",
                 # Add wlan1 to bridge (remove its IP first)
-                sh("ip addr flush dev wlan1 2>/dev/null || true")
-                sh("ip link set wlan1 master br0")
-                sh("ip link set wlan1 up")
-                
+                "addr flush dev wlan1",
+                "link set wlan1 master br0",
+                "link set wlan1 up",
                 # Add eth0 to bridge (remove its IP first)
-                sh("ip addr flush dev eth0 2>/dev/null || true")
-                sh("ip link set eth0 master br0")
-                sh("ip link set eth0 up")
-                
+                "addr flush dev eth0",
+                "link set eth0 master br0",
+                "link set eth0 up",
+            ])
+            if bridge_exists():
                 print("🔧 Bridge br0 created with both wlan1 and eth0")
-            except Exception as e:
-                print(f"❌ Bridge creation failed: {e}")
+            else:
+                print("❌ Bridge creation failed")
                 # Fallback: just use wlan1 without bridge
-                sh("ip addr add 192.168.50.1/24 dev wlan1 2>/dev/null || true")
-                sh("ip link set wlan1 up")
+                ip_batch(["addr add 192.168.50.1/24 dev wlan1", "link set wlan1 up"])
             
             # Configure dnsmasq to listen on bridge br0
             # This allows DHCP to work for both WiFi and Ethernet clients
-            dnsmasq_config = """interface=br0
-bind-interfaces
-dhcp-range=192.168.50.10,192.168.50.200,12h
-dhcp-option=3,192.168.50.1
-dhcp-option=6,8.8.8.8,8.8.4.4
-port=0
-domain=lan
-expand-hosts
-"""
-            with open('/etc/dnsmasq.d/pi-repeater.conf', 'w') as f:
-                f.write(dnsmasq_config)
-            
-            # Restart dnsmasq to apply new configuration
-            sh("systemctl restart dnsmasq")
+            if write_if_changed(DNSMASQ_CONF, DNSMASQ_TEMPLATE.format(interface='br0')):
+                # Restart dnsmasq to apply new configuration (skipped when it already was, no DHCP outage)
+                sh("systemctl restart dnsmasq")
             
             # Create a systemd service to maintain bridge on boot
             service_content = '''[Unit]
@@ -3823,53 +5061,42 @@ WantedBy=multi-user.target
             sh("systemctl restart eth0-ap-mode.service")
             
             # Configure routing: eth0 can now also give internet to 192.168.50.0/24 clients
-            # Remove old bridge rules if any
-            try:
-                sh("iptables -t nat -D POSTROUTING -o br0 -j MASQUERADE")
-                sh("iptables -D FORWARD -i br0 -o wlan0 -j ACCEPT")
-                sh("iptables -D FORWARD -i wlan0 -o br0 -j ACCEPT")
-            except:
-                pass
-            
-            # Clean up any duplicate rules first (old eth0/wlan1 and br0 rules)
-            for i in range(5):  # Remove up to 5 duplicates
-                try:
-                    sh("iptables -t nat -D POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE")
-                    sh("iptables -D FORWARD -i eth0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan0 -o eth0 -d 192.168.50.0/24 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan1 -s 192.168.50.0/24 -o wlan0 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan0 -o wlan1 -d 192.168.50.0/24 -j ACCEPT")
-                    sh("iptables -D FORWARD -i br0 -o wlan0 -j ACCEPT")
-                    sh("iptables -D FORWARD -i wlan0 -o br0 -m state --state RELATED,ESTABLISHED -j ACCEPT")
-                    sh("iptables -D FORWARD -i br0 -o br0 -j ACCEPT")
-                except:
-                    break
-            
-            # Add rules for bridge br0 (both WiFi and LAN clients)
-            sh("iptables -t nat -A POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE")
-            
-            # Bridge clients (both WiFi and LAN via br0)
-            sh("iptables -A FORWARD -i br0 -o wlan0 -j ACCEPT")
-            sh("iptables -A FORWARD -i wlan0 -o br0 -m state --state RELATED,ESTABLISHED -j ACCEPT")
-            
-            # Allow local communication within bridge
-            sh("iptables -A FORWARD -i br0 -o br0 -j ACCEPT")
+            # Remove old bridge rules and every duplicate of the old eth0/wlan1 and br0 rules,
+            # then add the rules for bridge br0 (both WiFi and LAN clients), all in one batch
+            iptables_apply(
+                delete=[
+                    ('nat', "POSTROUTING -o br0 -j MASQUERADE"),
+                    ('nat', "POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE"),
+                    ('filter', "FORWARD -i eth0 -s 192.168.50.0/24 -o wlan0 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan0 -o eth0 -d 192.168.50.0/24 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan1 -s 192.168.50.0/24 -o wlan0 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan0 -o wlan1 -d 192.168.50.0/24 -j ACCEPT"),
+                    ('filter', "FORWARD -i br0 -o wlan0 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan0 -o br0 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan0 -o br0 -m state --state RELATED,ESTABLISHED -j ACCEPT"),
+                    ('filter', "FORWARD -i br0 -o br0 -j ACCEPT"),
+                ],
+                add=[
+                    ('nat', "POSTROUTING -s 192.168.50.0/24 -o wlan0 -j MASQUERADE"),
+                    # Bridge clients (both WiFi and LAN via br0)
+                    ('filter', "FORWARD -i br0 -o wlan0 -j ACCEPT"),
+                    ('filter', "FORWARD -i wlan0 -o br0 -m state --state RELATED,ESTABLISHED -j ACCEPT"),
+                    # Allow local communication within bridge
+                    ('filter', "FORWARD -i br0 -o br0 -j ACCEPT"),
+                ])
             
             # Save iptables rules
             sh("netfilter-persistent save")
             
             # Update hostapd to use bridge
             try:
-                sh("sed -i 's/^interface=.*/interface=wlan1/' /etc/hostapd/hostapd.conf")
-                sh("grep -q '^bridge=' /etc/hostapd/hostapd.conf || echo 'bridge=br0' >> /etc/hostapd/hostapd.conf")
-                sh("sed -i 's/^bridge=.*/bridge=br0/' /etc/hostapd/hostapd.conf")
+                update_hostapd({'interface': 'wlan1', 'bridge': 'br0'})
                 sh("systemctl restart hostapd")
                 print("🔧 hostapd configured to use bridge br0")
             except Exception as e:
                 print(f"❌ hostapd configuration failed: {e}")
                 # Fallback: use wlan1 without bridge
-                sh("sed -i 's/^interface=.*/interface=wlan1/' /etc/hostapd/hostapd.conf")
-                sh("sed -i '/^bridge=/d' /etc/hostapd/hostapd.conf")
+                update_hostapd({'interface': 'wlan1'}, remove=('bridge',))
                 sh("systemctl restart hostapd")
         
         return jsonify({'success': True})
@@ -3879,16 +5106,9 @@ WantedBy=multi-user.target
 @app.route('/api/verify_pihole_password', methods=['POST'])
 def api_verify_pihole_password():
     """API: Verify Pi-hole admin password"""
-    try:
-        data = request.get_json()
-        password = data.get('password', '')
-        
-        if password == PIHOLE_PASSWORD:
-            return jsonify({'success': True})
-        else:
-            return jsonify({'success': False})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+    data = request.get_json(silent=True)
+    password = data.get('password', '') if isinstance(data, dict) else ''
+    return jsonify({'success': password_matches(password, PIHOLE_PASSWORD_DIGEST)})
 
 @app.route('/api/toggle_pihole', methods=['POST'])
 def api_toggle_pihole():
@@ -3910,28 +5130,24 @@ def api_toggle_pihole():
 def api_cleanup_clients():
     """API: Remove old/expired DHCP leases"""
     try:
-        import time
-        current_time = int(time.time())
         removed_count = 0
-        active_leases = []
         
         # Read current leases
-        lease_file = '/var/lib/misc/dnsmasq.leases'
-        if os.path.exists(lease_file):
-            with open(lease_file, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) >= 4:
-                        lease_time = int(parts[0])
-                        # Keep only leases that haven't expired (future timestamp)
-                        if lease_time > current_time:
-                            active_leases.append(line)
-                        else:
-                            removed_count += 1
+        if os.path.exists(LEASES):
+            current_time = int(time.time())
+            with open(LEASES, 'rb') as f:
+                leases = [line for line in f if len(line.split(None, 4)) >= 4]
+            # Keep only leases that haven't expired (future timestamp, 0 = infinite lease)
+            expiries = [int(line.split(None, 1)[0]) for line in leases]
+            active_leases = [line for line, expiry in zip(leases, expiries) if expiry > current_time or expiry == 0]
+            removed_count = len(leases) - len(active_leases)
             
-            # Write back only active leases
-            with open(lease_file, 'w') as f:
+            # Write back only active leases, swapped in atomically
+            tmp_path = LEASES + '.tmp'
+            with open(tmp_path, 'wb') as f:
                 f.writelines(active_leases)
+            shutil.copymode(LEASES, tmp_path)
+            os.replace(tmp_path, LEASES)
             
             # Restart dnsmasq to reload leases
             sh("systemctl restart dnsmasq")
@@ -3963,6 +5179,17 @@ def api_reboot():
     except Exception:
         return jsonify({'success': False})
 
+# Commands whose output goes into the exported configuration
+EXPORT_COMMANDS = {
+    'connections': "nmcli -t -f name,device connection show --active",
+    'pihole_active': "systemctl is-active pihole-FTL",
+    'hostname': "hostname",
+    'timezone': "timedatectl show --property=Timezone --value",
+    'hostapd_enabled': "systemctl is-enabled hostapd",
+    'dnsmasq_enabled': "systemctl is-enabled dnsmasq",
+    'network_manager_enabled': "systemctl is-enabled NetworkManager",
+}
+
 @app.route('/api/export_config')
 def api_export_config():
     """API: Export complete configuration"""
@@ -3975,40 +5202,26 @@ def api_export_config():
         ap_visible = True
         
         try:
-            with open('/etc/hostapd/hostapd.conf', 'r') as f:
-                hostapd_conf = f.read()
-                
-                # Extract SSID
-                ssid_match = re.search(r'ssid=(.+)', hostapd_conf)
-                if ssid_match:
-                    ap_ssid = ssid_match.group(1).strip()
-                
-                # Extract password
-                pass_match = re.search(r'wpa_passphrase=(.+)', hostapd_conf)
-                if pass_match:
-                    ap_pass = pass_match.group(1).strip()
-                
-                # Extract band (hw_mode)
-                band_match = re.search(r'hw_mode=(.+)', hostapd_conf)
-                if band_match:
-                    hw_mode = band_match.group(1).strip()
-                    ap_band = "5G" if hw_mode == "a" else "2.4G"
-                
-                # Extract channel
-                channel_match = re.search(r'channel=(.+)', hostapd_conf)
-                if channel_match:
-                    ap_channel = channel_match.group(1).strip()
-                
-                # Check if SSID is hidden
-                if 'ignore_broadcast_ssid=1' in hostapd_conf:
-                    ap_visible = False
+            hostapd_conf = hostapd_config()
+            ap_ssid = hostapd_conf.get('ssid', ap_ssid).strip()
+            ap_pass = hostapd_conf.get('wpa_passphrase', ap_pass).strip()
+            if 'hw_mode' in hostapd_conf:
+                ap_band = "5G" if hostapd_conf['hw_mode'].strip() == "a" else "2.4G"
+            ap_channel = hostapd_conf.get('channel', ap_channel).strip()
+            
+            # Check if SSID is hidden
+            if hostapd_conf.get('ignore_broadcast_ssid') == '1':
+                ap_visible = False
         except Exception as e:
             print(f"Error reading hostapd.conf: {e}")
         
+        # The command lookups are independent, run them side by side (repeated exports reuse them for 10 s)
+        outputs = run_probes({key: functools.partial(sh_cached, cmd) for key, cmd in EXPORT_COMMANDS.items()})
+        
         # Get WAN SSID
         wan_ssid = "Nicht verbunden"
         try:
-            result = sh("nmcli -t -f name,device connection show --active")
+            result = outputs.get('connections', '')
             for line in result.split('\n'):
                 if 'wlan0' in line:
                     wan_ssid = line.split(':')[0]
@@ -4019,7 +5232,7 @@ def api_export_config():
         # Get DHCP range from dnsmasq
         dhcp_range = "192.168.50.100,192.168.50.200"
         try:
-            with open('/etc/dnsmasq.d/pi-repeater.conf', 'r') as f:
+            with open(DNSMASQ_CONF, 'r') as f:
                 for line in f:
                     if line.startswith('dhcp-range='):
                         dhcp_range = line.split('=')[1].split(',')[0] + ',' + line.split(',')[1]
@@ -4028,24 +5241,9 @@ def api_export_config():
             pass
         
         # Get Internet configuration (wlan0/eth0)
-        wlan0_internet_enabled = True  # Default to true
-        eth0_mode = "receive"
-        
-        try:
-            if os.path.exists('/etc/pi-config/wlan0-internet-enabled'):
-                with open('/etc/pi-config/wlan0-internet-enabled', 'r') as f:
-                    content = f.read().strip()
-                    # Handle both 'true'/'false' and '1'/'0' formats
-                    wlan0_internet_enabled = content in ['true', '1']
-        except:
-            pass
-        
-        try:
-            if os.path.exists('/etc/pi-config/eth0-mode'):
-                with open('/etc/pi-config/eth0-mode', 'r') as f:
-                    eth0_mode = f.read().strip()
-        except:
-            pass
+        # Handle both 'true'/'false' and '1'/'0' formats
+        wlan0_internet_enabled = _read_cfg('wlan0-internet-enabled', 'true') in ['true', '1']
+        eth0_mode = _read_cfg('eth0-mode', 'receive')
         
         # Get all current settings
         config = {
@@ -4065,13 +5263,13 @@ def api_export_config():
             'eth0_mode': eth0_mode,
             
             # Pi-hole Settings
-            'pihole_enabled': sh("systemctl is-active pihole-FTL") == "active",
+            'pihole_enabled': outputs.get('pihole_active') == "active",
             'pihole_password': PIHOLE_PASSWORD,  # Pi-hole admin password
             
             # System Settings
             'web_port': WEB_PORT,
-            'hostname': sh("hostname"),
-            'timezone': sh("timedatectl show --property=Timezone --value"),
+            'hostname': outputs.get('hostname', ''),
+            'timezone': outputs.get('timezone', ''),
             'dashboard_password': DASHBOARD_PASSWORD,  # Dashboard login password
             
             # Network Settings
@@ -4080,9 +5278,9 @@ def api_export_config():
             'dhcp_range': dhcp_range,
             
             # Services Status
-            'hostapd_enabled': sh("systemctl is-enabled hostapd") == "enabled",
-            'dnsmasq_enabled': sh("systemctl is-enabled dnsmasq") == "enabled",
-            'network_manager_enabled': sh("systemctl is-enabled NetworkManager") == "enabled",
+            'hostapd_enabled': outputs.get('hostapd_enabled') == "enabled",
+            'dnsmasq_enabled': outputs.get('dnsmasq_enabled') == "enabled",
+            'network_manager_enabled': outputs.get('network_manager_enabled') == "enabled",
             
             # Export Info
             'export_timestamp': datetime.now().isoformat(),
@@ -4090,22 +5288,38 @@ def api_export_config():
             'pi_repeater_version': "modern_dashboard"
         }
         
-        data = yaml.safe_dump(config, default_flow_style=False, sort_keys=False).encode()
+        data = yaml.dump(config, Dumper=YamlDumper, default_flow_style=False, sort_keys=False).encode()
         return send_file(io.BytesIO(data), as_attachment=True, 
                         download_name="pi-repeater-config.yaml", 
                         mimetype="text/yaml")
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def upload_source(field):
+    """Return (stream, filename) of a raw octet-stream body or the multipart field"""
+    if request.mimetype == 'application/octet-stream':
+        return request.stream, urllib.parse.unquote(request.headers.get('X-Filename', ''))
+    file = request.files.get(field)
+    if not file:
+        return None, ''
+    return file.stream, file.filename
+
+# Imported enable flags and the systemd units they control
+IMPORT_SERVICE_SETTINGS = (
+    ('hostapd_enabled', 'hostapd'),
+    ('dnsmasq_enabled', 'dnsmasq'),
+    ('pihole_enabled', 'pihole-FTL'),
+)
+
 @app.route('/api/import_config', methods=['POST'])
 def api_import_config():
     """API: Import complete configuration"""
     try:
-        file = request.files.get('file')
-        if not file:
+        stream, _ = upload_source('file')
+        if stream is None:
             return jsonify({'success': False, 'error': 'Keine Datei hochgeladen'})
             
-        config = yaml.safe_load(file.read().decode())
+        config = yaml.load(stream, Loader=YamlLoader)
         if not isinstance(config, dict):
             return jsonify({'success': False, 'error': 'Ungültige Konfigurationsdatei'})
         
@@ -4139,26 +5353,22 @@ def api_import_config():
             hostapd_updates.append(('ignore_broadcast_ssid', visibility))
         
         # Apply hostapd updates
-        for key, value in hostapd_updates:
-            sh(f'sed -i "s/^{key}=.*/{key}={value}/" /etc/hostapd/hostapd.conf')
+        if hostapd_updates:
+            update_hostapd(dict(hostapd_updates))
         
         # ===== Internet Configuration =====
         if 'wlan0_internet_enabled' in config:
-            os.makedirs('/etc/pi-config', exist_ok=True)
-            with open('/etc/pi-config/wlan0-internet-enabled', 'w') as f:
-                f.write('true' if config['wlan0_internet_enabled'] else 'false')
+            _write_cfg('wlan0-internet-enabled', 'true' if config['wlan0_internet_enabled'] else 'false')
         
         if 'eth0_mode' in config:
-            os.makedirs('/etc/pi-config', exist_ok=True)
-            with open('/etc/pi-config/eth0-mode', 'w') as f:
-                f.write(config['eth0_mode'])
+            _write_cfg('eth0-mode', config['eth0_mode'])
         
         # ===== DHCP Settings (dnsmasq) =====
         if 'dhcp_range' in config and config['dhcp_range']:
             # Update dnsmasq dhcp-range
             dhcp_parts = config['dhcp_range'].split(',')
             if len(dhcp_parts) >= 2:
-                sh(f"sed -i 's/^dhcp-range=.*/dhcp-range={dhcp_parts[0]},{dhcp_parts[1]},24h/' /etc/dnsmasq.d/pi-repeater.conf")
+                sh(f"sed -i 's/^dhcp-range=.*/dhcp-range={dhcp_parts[0]},{dhcp_parts[1]},24h/' {DNSMASQ_CONF}")
         
         # ===== System Settings =====
         if 'hostname' in config and config['hostname']:
@@ -4176,30 +5386,23 @@ def api_import_config():
         # For now, password remains hardcoded in the Python script
             
         # ===== Service Settings =====
-        if 'hostapd_enabled' in config:
-            if config['hostapd_enabled']:
-                sh("systemctl enable hostapd")
-            else:
-                sh("systemctl disable hostapd")
-                
-        if 'dnsmasq_enabled' in config:
-            if config['dnsmasq_enabled']:
-                sh("systemctl enable dnsmasq")
-            else:
-                sh("systemctl disable dnsmasq")
-        
+        # One systemctl call per action instead of one per service
+        enable, disable = [], []
+        for key, unit in IMPORT_SERVICE_SETTINGS:
+            if key in config:
+                (enable if config[key] else disable).append(unit)
+        if enable:
+            sh(f"systemctl enable {' '.join(enable)}")
+        if disable:
+            sh(f"systemctl disable {' '.join(disable)}")
+        
+        # Pi-hole is started or stopped right away
         if 'pihole_enabled' in config:
-            if config['pihole_enabled']:
-                sh("systemctl enable pihole-FTL")
-                sh("systemctl start pihole-FTL")
-            else:
-                sh("systemctl disable pihole-FTL")
-                sh("systemctl stop pihole-FTL")
+            sh(f"systemctl {'start' if config['pihole_enabled'] else 'stop'} --no-block pihole-FTL")
                 
         # ===== Restart affected services =====
-        sh("systemctl restart hostapd")
-        sh("systemctl restart dnsmasq")
-        sh("systemctl restart NetworkManager")
+        # --no-block only queues the restarts, the response doesn't wait for them
+        sh("systemctl restart --no-block hostapd dnsmasq NetworkManager")
         
         return jsonify({'success': True, 'message': 'Konfiguration erfolgreich importiert. System wird in 5 Sekunden neu gestartet...'})
         
@@ -4215,7 +5418,7 @@ def api_themes_list():
             return jsonify([])
         
         themes = theme_manager.list_themes()
-        return jsonify(themes)
+        return conditional_json(themes)
     except Exception as e:
         print(f"Error listing themes: {e}")
         return jsonify([])
@@ -4251,12 +5454,14 @@ def api_themes_export():
         # Get active theme name
         active_theme = theme_manager.get_active_theme()
         
-        # Export theme
-        zip_data = theme_manager.export_theme(active_theme, current_template)
+        # Export theme, the archive is built directly in the response buffer
+        zip_buf = io.BytesIO()
+        theme_manager.export_theme(active_theme, current_template, zip_buf)
+        zip_buf.seek(0)
         
         # Send as download
         return send_file(
-            io.BytesIO(zip_data),
+            zip_buf,
             mimetype='application/zip',
             as_attachment=True,
             download_name=f'openpirouter_{active_theme}_{datetime.now().strftime("%Y%m%d")}.zip'
@@ -4272,22 +5477,18 @@ def api_themes_upload():
         if not theme_manager:
             return jsonify({'success': False, 'error': 'Theme manager not available'})
         
-        if 'theme' not in request.files:
+        stream, filename = upload_source('theme')
+        if stream is None:
             return jsonify({'success': False, 'error': 'No file uploaded'})
         
-        file = request.files['theme']
-        
-        if file.filename == '':
+        if filename == '':
             return jsonify({'success': False, 'error': 'No file selected'})
         
-        if not file.filename.endswith('.zip'):
+        if not filename.endswith('.zip'):
             return jsonify({'success': False, 'error': 'File must be a ZIP archive'})
         
-        # Read file data
-        zip_data = file.read()
-        
-        # Upload theme
-        theme_name = theme_manager.upload_theme(zip_data)
+        # Upload theme, copied to disk in chunks straight from the request
+        theme_name = theme_manager.upload_theme(stream)
         
         return jsonify({'success': True, 'theme_name': theme_name})
     except Exception as e:
@@ -4319,10 +5520,11 @@ def api_themes_screenshot(theme_name):
         if not theme_manager:
             return '', 404
         
-        screenshot_path = os.path.join('/opt/pi-config/themes', theme_name, 'screenshot.png')
+        screenshot_path = safe_join(theme_manager.THEMES_DIR, theme_name, 'screenshot.png')
         
-        if os.path.exists(screenshot_path):
-            return send_file(screenshot_path, mimetype='image/png')
+        if screenshot_path and os.path.isfile(screenshot_path):
+            # Browsers keep it for an hour, then revalidate via ETag/Last-Modified (304)
+            return send_file(screenshot_path, mimetype='image/png', max_age=3600)
         else:
             return '', 404
     except Exception as e:
@@ -4367,10 +5569,7 @@ if __name__ == "__main__":
         try:
             theme_manager.ensure_themes_dir()
             # Save current template as default theme
-            default_template_path = '/opt/pi-config/themes/default/template.html'
-            os.makedirs(os.path.dirname(default_template_path), exist_ok=True)
-            with open(default_template_path, 'w', encoding='utf-8') as f:
-                f.write(THEME_BASE_HTML)
+            default_dir = os.path.join(theme_manager.THEMES_DIR, theme_manager.DEFAULT_THEME)
             # Create default meta.json
             default_meta = {
                 'name': 'default',
@@ -4379,16 +5578,47 @@ if __name__ == "__main__":
                 'author': 'OpenPiRouter',
                 'version': '1.0'
             }
-            with open('/opt/pi-config/themes/default/meta.json', 'w') as f:
-                json.dump(default_meta, f, indent=2)
+            # Files newer than this script were checked against it on an earlier start;
+            # otherwise compare, write on change, and mark them as checked
+            source_mtime = os.stat(__file__).st_mtime_ns
+            for name, content in (('template.html', THEME_BASE_HTML),
+                                  ('meta.json', json.dumps(default_meta, indent=2))):
+                path = os.path.join(default_dir, name)
+                try:
+                    checked = os.stat(path).st_mtime_ns >= source_mtime
+                except OSError:
+                    checked = False
+                if not checked and not write_if_changed(path, content):
+                    os.utime(path)
             print("Theme system initialized")
         except Exception as e:
             print(f"Warning: Could not initialize theme system: {e}")
     
-    # Start background update thread
-    update_thread = threading.Thread(target=background_update_task, daemon=True)
-    update_thread.start()
-    print("Background update thread started")
+    # Enable the on-disk template bytecode cache
+    try:
+        os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+    except OSError as e:
+        print(f"Warning: Could not enable template bytecode cache: {e}")
+    
+    # Compile the templates now instead of on the first page load
+    templates = ['login.html', 'dashboard.html']
+    if theme_manager and theme_manager.get_active_theme():
+        templates.append(f'themes/{theme_manager.get_active_theme()}')
+    for name in templates:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            print(f"Warning: Could not precompile template {name}: {e}")
+    
+    # Start background update task in the SocketIO async context
+    socketio.start_background_task(cpu_sampler_task)
+    socketio.start_background_task(background_update_task)
+    socketio.start_background_task(wifi_signal_task)
+    socketio.start_background_task(ap_files_watch_task)
+    if WIFI_PRESCAN:
+        socketio.start_background_task(wifi_prescan_task)
+    print("Background update task started")
     
     print(f"Starting OpenPiRouter Dashboard with WebSocket support on port {WEB_PORT}")
     socketio.run(app, host="0.0.0.0", port=WEB_PORT, debug=False, allow_unsafe_werkzeug=True)
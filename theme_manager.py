@@ -4,32 +4,91 @@ OpenPiRouter Theme Manager V2
 Handles theme uploads, exports, activation and management
 NEW: Themes contain only HTML+CSS, JavaScript is injected from system
 """
+import functools
+import io
 import os
+import re
 import json
 import shutil
+import stat
 import zipfile
 import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
 
+# Faster JSON for theme metadata (optional, the dashboard already warns when it is missing)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _load_json(f):
+    """Parse JSON from a file opened in binary mode"""
+    return orjson.loads(f.read()) if orjson else json.load(f)
+
+def _dump_json(obj):
+    """Serialize to indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
 THEMES_DIR = '/opt/pi-config/themes'
 ACTIVE_THEME_LINK = os.path.join(THEMES_DIR, 'active_theme')
 DEFAULT_THEME = 'default'
+UPLOAD_CHUNK_SIZE = 64 * 1024
+ZIP_MAGIC = b'PK\x03\x04'  # Local file header signature of a ZIP archive
+
+# Characters not allowed in theme directory names (letters, digits, '_' and '-' are kept)
+THEME_NAME_UNSAFE_RE = re.compile(r'[^\w-]')
+
+# Files a theme archive may contain and their maximum uncompressed size
+THEME_FILES = {
+    'template.html': 4 * 1024 * 1024,
+    'meta.json': 64 * 1024,
+    'screenshot.png': 16 * 1024 * 1024,
+    'README.md': 64 * 1024,
+}
+
+# Themes directories already created by this process
+_ensured_dirs = set()
 
 def ensure_themes_dir():
-    """Ensure themes directory structure exists"""
-    os.makedirs(THEMES_DIR, exist_ok=True)
+    """Ensure themes directory structure exists (checked once per process)"""
+    if THEMES_DIR in _ensured_dirs:
+        return
     
-    # Create default theme directory if it doesn't exist
-    default_dir = os.path.join(THEMES_DIR, DEFAULT_THEME)
-    if not os.path.exists(default_dir):
-        os.makedirs(default_dir, exist_ok=True)
+    # Create the themes and default theme directories if they don't exist
+    os.makedirs(os.path.join(THEMES_DIR, DEFAULT_THEME), exist_ok=True)
+    _ensured_dirs.add(THEMES_DIR)
+
+# Last resolved active theme, keyed by the symlink's inode and mtime
+_active_theme_cache = {'key': None, 'name': DEFAULT_THEME}
 
 def get_active_theme():
-    """Get the currently active theme name"""
-    if os.path.islink(ACTIVE_THEME_LINK):
-        return os.path.basename(os.readlink(ACTIVE_THEME_LINK))
-    return DEFAULT_THEME
+    """Get the currently active theme name (readlink only after the symlink changed)"""
+    try:
+        st = os.lstat(ACTIVE_THEME_LINK)
+    except OSError:
+        return DEFAULT_THEME
+    if not stat.S_ISLNK(st.st_mode):
+        return DEFAULT_THEME
+    key = (st.st_ino, st.st_mtime_ns)
+    if _active_theme_cache['key'] != key:
+        _active_theme_cache['name'] = os.path.basename(os.readlink(ACTIVE_THEME_LINK))
+        _active_theme_cache['key'] = key
+    return _active_theme_cache['name']
+
+def _theme_entries(theme_path):
+    """Files of a theme directory as {name: DirEntry}, read with a single scandir"""
+    with os.scandir(theme_path) as entries:
+        return {entry.name: entry for entry in entries}
+
+@functools.lru_cache(maxsize=32)
+def _parse_meta(path, mtime_ns, size):
+    """Parse a theme's meta.json (cached per file version, do not modify)"""
+    with open(path, 'rb') as f:
+        return _load_json(f)
 
 def list_themes():
     """List all available themes with metadata"""
@@ -39,19 +98,24 @@ def list_themes():
     if not os.path.exists(THEMES_DIR):
         return themes
     
-    for theme_name in os.listdir(THEMES_DIR):
-        theme_path = os.path.join(THEMES_DIR, theme_name)
+    active_theme = get_active_theme()
+    
+    with os.scandir(THEMES_DIR) as entries:
+        theme_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    
+    for entry in theme_dirs:
+        theme_name = entry.name
+        theme_path = entry.path
         
-        # Skip if not a directory, if it's the symlink, or if it's a backup
-        if not os.path.isdir(theme_path) or theme_name == 'active_theme' or theme_name.endswith('_backup') or 'backup_' in theme_name:
+        # Skip the symlink, backups and unfinished uploads
+        if theme_name == 'active_theme' or theme_name.endswith('_backup') or 'backup_' in theme_name or theme_name.startswith('.'):
             continue
         
-        meta_file = os.path.join(theme_path, 'meta.json')
-        screenshot_file = os.path.join(theme_path, 'screenshot.png')
-        template_file = os.path.join(theme_path, 'template.html')
+        # One directory read instead of an exists() call per file
+        file_names = _theme_entries(theme_path)
         
         # Check if theme is valid (has required files)
-        if not os.path.exists(template_file):
+        if 'template.html' not in file_names:
             continue
         
         # Read metadata
@@ -61,16 +125,16 @@ def list_themes():
             'description': 'Custom theme',
             'author': 'Unknown',
             'version': '1.0',
-            'created': datetime.fromtimestamp(os.path.getctime(theme_path)).strftime('%Y-%m-%d'),
-            'has_screenshot': os.path.exists(screenshot_file),
-            'is_active': theme_name == get_active_theme()
+            'created': '{:04d}-{:02d}-{:02d}'.format(*time.localtime(entry.stat().st_ctime)[:3]),
+            'has_screenshot': 'screenshot.png' in file_names,
+            'is_active': theme_name == active_theme
         }
         
-        if os.path.exists(meta_file):
+        if 'meta.json' in file_names:
             try:
-                with open(meta_file, 'r') as f:
-                    custom_meta = json.load(f)
-                    meta.update(custom_meta)
+                meta_entry = file_names['meta.json']
+                st = meta_entry.stat()
+                meta.update(_parse_meta(meta_entry.path, st.st_mtime_ns, st.st_size))
             except:
                 pass
         
@@ -84,61 +148,71 @@ def activate_theme(theme_name):
     
     theme_path = os.path.join(THEMES_DIR, theme_name)
     
-    if not os.path.exists(theme_path):
+    try:
+        file_names = _theme_entries(theme_path)
+    except OSError:
         raise ValueError(f"Theme '{theme_name}' does not exist")
     
-    template_file = os.path.join(theme_path, 'template.html')
-    if not os.path.exists(template_file):
+    if 'template.html' not in file_names:
         raise ValueError(f"Theme '{theme_name}' is missing template.html")
     
-    # Remove old symlink if exists
-    if os.path.islink(ACTIVE_THEME_LINK):
-        os.unlink(ACTIVE_THEME_LINK)
-    elif os.path.exists(ACTIVE_THEME_LINK):
+    # Create the new symlink next to the old one and rename it over it, so
+    # there is never a moment without an active theme
+    tmp_link = ACTIVE_THEME_LINK + '.tmp'
+    try:
+        os.symlink(theme_path, tmp_link)
+    except FileExistsError:
+        os.unlink(tmp_link)
+        os.symlink(theme_path, tmp_link)
+    try:
+        os.replace(tmp_link, ACTIVE_THEME_LINK)
+    except IsADirectoryError:
+        # A real directory from an old install, not a symlink
         shutil.rmtree(ACTIVE_THEME_LINK)
-    
-    # Create new symlink
-    os.symlink(theme_path, ACTIVE_THEME_LINK)
+        os.replace(tmp_link, ACTIVE_THEME_LINK)
+    _active_theme_cache['key'] = None
     
     return True
 
-def export_theme(theme_name, theme_html_only):
+def export_theme(theme_name, theme_html_only, fileobj=None):
     """
     Export a theme as a ZIP file
     NEW: Only exports the HTML+CSS part (no JavaScript)
+    Writes the archive into fileobj if given, otherwise returns it as bytes
     """
     ensure_themes_dir()
     
     theme_path = os.path.join(THEMES_DIR, theme_name)
     
-    # Create temporary directory for export
-    with tempfile.TemporaryDirectory() as temp_dir:
-        export_path = os.path.join(temp_dir, f'openpirouter_{theme_name}_theme.zip')
+    if fileobj is None:
+        buf = io.BytesIO()
+        export_theme(theme_name, theme_html_only, buf)
+        return buf.getvalue()
+    
+    # Fastest deflate level: the text members are small and barely shrink further at 6
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        # Add template.html (only HTML+CSS, no JavaScript)
+        zipf.writestr('template.html', theme_html_only)
+        
+        # Add metadata
+        meta = {
+            'name': theme_name,
+            'display_name': theme_name.replace('_', ' ').title(),
+            'description': f'Exported theme from OpenPiRouter',
+            'author': 'OpenPiRouter',
+            'version': '2.0',  # V2: Themes without JavaScript
+            'exported': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'system_version': '2.0'  # Indicates V2 theme system
+        }
+        zipf.writestr('meta.json', _dump_json(meta))
         
-        with zipfile.ZipFile(export_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add template.html (only HTML+CSS, no JavaScript)
-            zipf.writestr('template.html', theme_html_only)
-            
-            # Add metadata
-            meta = {
-                'name': theme_name,
-                'display_name': theme_name.replace('_', ' ').title(),
-                'description': f'Exported theme from OpenPiRouter',
-                'author': 'OpenPiRouter',
-                'version': '2.0',  # V2: Themes without JavaScript
-                'exported': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'system_version': '2.0'  # Indicates V2 theme system
-            }
-            zipf.writestr('meta.json', json.dumps(meta, indent=2))
-            
-            # Add screenshot if exists
-            if os.path.exists(theme_path):
-                screenshot = os.path.join(theme_path, 'screenshot.png')
-                if os.path.exists(screenshot):
-                    zipf.write(screenshot, 'screenshot.png')
-            
-            # Add README
-            readme = """# OpenPiRouter Theme V2
+        # Add screenshot if exists (stored as is, PNG data does not deflate)
+        screenshot = os.path.join(theme_path, 'screenshot.png')
+        if os.path.exists(screenshot):
+            zipf.write(screenshot, 'screenshot.png', compress_type=zipfile.ZIP_STORED)
+        
+        # Add README
+        readme = """# OpenPiRouter Theme V2
 
 ## What's New in V2?
 - Themes now contain ONLY HTML structure and CSS styling
@@ -166,31 +240,45 @@ Edit template.html to customize:
 - Keep all class names for functionality (e.g., class="btn", class="card")
 - The placeholder <!-- SYSTEM_JAVASCRIPT_PLACEHOLDER --> will be replaced with system logic
 """
-            zipf.writestr('README.md', readme)
-        
-        # Read the ZIP file
-        with open(export_path, 'rb') as f:
-            return f.read()
+        zipf.writestr('README.md', readme)
 
 def upload_theme(zip_file_bytes, theme_name=None):
     """
-    Upload and install a new theme from ZIP file
+    Upload and install a new theme from ZIP file (bytes or a readable stream)
     NEW: Validates that theme doesn't contain <script> tags (only HTML+CSS)
     """
     ensure_themes_dir()
     
-    # Create temporary directory for extraction
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Stage the upload inside THEMES_DIR so the finished theme is moved in with a rename
+    with tempfile.TemporaryDirectory(prefix='.upload_', dir=THEMES_DIR) as temp_dir:
         zip_path = os.path.join(temp_dir, 'theme.zip')
         
+        # Check the ZIP signature before writing anything to disk
+        if hasattr(zip_file_bytes, 'read'):
+            head = zip_file_bytes.read(len(ZIP_MAGIC))
+        else:
+            head = zip_file_bytes[:len(ZIP_MAGIC)]
+        if head != ZIP_MAGIC:
+            raise ValueError("Theme must be a ZIP archive")
+        
         # Write uploaded file
         with open(zip_path, 'wb') as f:
-            f.write(zip_file_bytes)
+            if hasattr(zip_file_bytes, 'read'):
+                f.write(head)
+                shutil.copyfileobj(zip_file_bytes, f, UPLOAD_CHUNK_SIZE)
+            else:
+                f.write(zip_file_bytes)
         
-        # Extract ZIP
+        # Extract only the known theme files, anything else (and any path) is skipped
         extract_dir = os.path.join(temp_dir, 'extracted')
         with zipfile.ZipFile(zip_path, 'r') as zipf:
-            zipf.extractall(extract_dir)
+            for info in zipf.infolist():
+                max_size = THEME_FILES.get(info.filename)
+                if max_size is None:
+                    continue
+                if info.file_size > max_size:
+                    raise ValueError(f"{info.filename} is too large (max {max_size // 1024} KB)")
+                zipf.extract(info, extract_dir)
         
         # Validate theme structure
         template_file = os.path.join(extract_dir, 'template.html')
@@ -209,8 +297,8 @@ def upload_theme(zip_file_bytes, theme_name=None):
         # Read metadata
         meta_file = os.path.join(extract_dir, 'meta.json')
         if os.path.exists(meta_file):
-            with open(meta_file, 'r') as f:
-                meta = json.load(f)
+            with open(meta_file, 'rb') as f:
+                meta = _load_json(f)
                 if not theme_name:
                     theme_name = meta.get('name', 'custom_theme')
         
@@ -218,7 +306,7 @@ def upload_theme(zip_file_bytes, theme_name=None):
             theme_name = f'custom_theme_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
         
         # Sanitize theme name
-        theme_name = ''.join(c if c.isalnum() or c in '_-' else '_' for c in theme_name)
+        theme_name = THEME_NAME_UNSAFE_RE.sub('_', theme_name)
         
         # Create theme directory
         theme_path = os.path.join(THEMES_DIR, theme_name)
@@ -228,8 +316,8 @@ def upload_theme(zip_file_bytes, theme_name=None):
             backup_path = f"{theme_path}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             shutil.move(theme_path, backup_path)
         
-        # Copy theme files
-        shutil.copytree(extract_dir, theme_path)
+        # Move theme files into place (a rename, copied only across filesystems)
+        shutil.move(extract_dir, theme_path)
         
         return theme_name
 
@@ -267,12 +355,12 @@ def get_theme_template(theme_name=None, system_javascript=None):
     theme_path = os.path.join(THEMES_DIR, theme_name)
     template_file = os.path.join(theme_path, 'template.html')
     
-    if not os.path.exists(template_file):
+    try:
+        with open(template_file, 'r', encoding='utf-8') as f:
+            theme_html = f.read()
+    except FileNotFoundError:
         return None
     
-    with open(template_file, 'r', encoding='utf-8') as f:
-        theme_html = f.read()
-    
     # If system JavaScript is provided, inject it
     if system_javascript:
         # Check if theme has placeholder